@@ -0,0 +1,165 @@
+from collections import Counter
+from urllib.parse import urljoin
+from lxml import html
+from selenium.common.exceptions import NoSuchElementException
+from linkedin_scraper import waits, extractor, parser, selectors
+
+def _xpath(by, value):
+    if by == "id":
+        return "//*[@id='{}']".format(value)
+    if by == "class name":
+        return "//*[contains(concat(' ', normalize-space(@class), ' '), ' {} ')]".format(value.strip())
+    if by == "tag name":
+        return "//{}".format(value)
+    if by == "xpath":
+        return value
+    raise NotImplementedError("FakeDriver does not support locating by {!r}".format(by))
+
+class _Locator(object):
+
+    def find_element(self, by="id", value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException("no element for {} {!r}".format(by, value))
+        return elements[0]
+
+    def find_elements(self, by="id", value=None):
+        self._driver.count("find_elements")
+        path = _xpath(by, value)
+        # selenium treats relative lookups from an element as descendant lookups
+        if self._root is not None and not path.startswith("/"):
+            path = ".//" + path
+        elif self._root is not None and by != "xpath":
+            path = "." + path
+        root = self._root if self._root is not None else self._driver.tree
+        return [FakeElement(self._driver, element) for element in root.xpath(path)]
+
+    def find_element_by_id(self, value):
+        return self.find_element("id", value)
+
+    def find_elements_by_id(self, value):
+        return self.find_elements("id", value)
+
+    def find_element_by_class_name(self, value):
+        return self.find_element("class name", value)
+
+    def find_elements_by_class_name(self, value):
+        return self.find_elements("class name", value)
+
+    def find_element_by_tag_name(self, value):
+        return self.find_element("tag name", value)
+
+    def find_elements_by_tag_name(self, value):
+        return self.find_elements("tag name", value)
+
+    def find_element_by_xpath(self, value):
+        return self.find_element("xpath", value)
+
+    def find_elements_by_xpath(self, value):
+        return self.find_elements("xpath", value)
+
+class FakeElement(_Locator):
+
+    def __init__(self, driver, element):
+        self._driver = driver
+        self._root = element
+
+    @property
+    def text(self):
+        self._driver.count("text")
+        return " ".join(self._root.text_content().split())
+
+    def get_attribute(self, name):
+        self._driver.count("get_attribute")
+        value = self._root.get(name)
+        if name == "href" and value is not None:
+            return urljoin(self._driver.current_url, value)
+        return value
+
+    def is_enabled(self):
+        self._driver.count("is_enabled")
+        return self._root.get("disabled") is None
+
+    def is_displayed(self):
+        self._driver.count("is_displayed")
+        return True
+
+    def click(self):
+        self._driver.count("click")
+        target = self._root.get("href") or self._root.get("data-href")
+        if target is not None and self.is_enabled():
+            self._driver.navigate(target)
+
+class FakeDriver(_Locator):
+    """A WebDriver stand-in that serves pages from a dict and counts every command."""
+
+    def __init__(self, pages, base_url="http://fixtures.local"):
+        self._driver = self
+        self._root = None
+        self.pages = pages
+        self.base_url = base_url
+        self.commands = Counter()
+        self.current_url = None
+        self.tree = html.document_fromstring("<html></html>")
+        self.page_source = "<html></html>"
+
+    def count(self, command):
+        self.execute(command)
+
+    def execute(self, command, params=None):
+        # the single entry point every command goes through, like RemoteWebDriver.execute
+        self.commands[command] += 1
+
+    def navigate(self, url):
+        url = urljoin(self.current_url or self.base_url, url)
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        source = self.pages.get(path, "<html><body></body></html>")
+        self.current_url = url
+        self.page_source = source
+        self.tree = html.document_fromstring(source)
+
+    def get(self, url):
+        self.count("get")
+        self.navigate(url)
+
+    def __getattribute__(self, name):
+        if name == "page_source":
+            object.__getattribute__(self, "count")("page_source")
+        return object.__getattribute__(self, name)
+
+    def execute_script(self, script, *args):
+        self.count("execute_script")
+        if script == waits._SCROLL_STEP:
+            lists = self.tree.xpath(_xpath("class name", args[0]))
+            return [len(lists[0].xpath(".//li")) if lists else 0, 1000, True]
+        if script == extractor.EXTRACT_SCRIPT:
+            return extractor.run_plan(self.tree, args[0], self.current_url)
+        if script == extractor.FINGERPRINT_SCRIPT:
+            return dict(parser.section_fingerprints(self.tree, args[0]))
+        if script == waits._SECTION_PROBE:
+            # a static page is fully rendered, so every section is either there or absent
+            found = dict((name, bool(self.tree.xpath(path))) for name, path in args[0].items())
+            return {"found": found, "settled": True}
+        if script == selectors.DETECT_SCRIPT:
+            for name, detect in args[0]:
+                if self.tree.xpath("boolean({})".format(detect)):
+                    return name
+            return None
+        if "document.readyState" in script:
+            return "complete"
+        if script.strip() == "return 1;":
+            return 1
+        return None
+
+    def execute_async_script(self, script, *args):
+        self.count("execute_async_script")
+        return True
+
+    def set_script_timeout(self, timeout):
+        self.count("set_script_timeout")
+
+    def close(self):
+        self.count("close")
+
+    def quit(self):
+        self.count("quit")
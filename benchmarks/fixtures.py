@@ -0,0 +1,172 @@
+from collections import namedtuple
+
+Case = namedtuple("Case", ["name", "positions", "educations", "interests", "accomplishments", "employee_pages", "employees_per_page"])
+
+CASES = {
+    "small": Case("small", 2, 1, 0, 0, 1, 5),
+    "typical": Case("typical", 8, 2, 6, 4, 10, 10),
+    "pathological": Case("pathological", 50, 10, 40, 30, 200, 10),
+}
+
+def _page(body, title="LinkedIn"):
+    return """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body><div id="profile-nav-item"></div>
+{body}
+</body></html>""".format(title=title, body=body)
+
+def _also_viewed(case):
+    return "".join('<li><a href="/in/{}-viewed-{}/">Viewed {}</a></li>'.format(case.name, i, i) for i in range(5))
+
+def person_logged_in(case):
+    positions = "".join("""
+      <li class="pv-position-entity pv-profile-section__card-item">
+        <a href="/company/company-{i}/"><h3>Position {i}</h3></a>
+        <p>Company Name</p><p>Company {i}</p>
+        <h4><span>Dates Employed</span><span>Jan {start} – Dec {end}</span></h4>
+        <h4><span>Employment Duration</span><span>{years} yrs {months} mos</span></h4>
+        <h4><span>Location</span><span>City {i}</span></h4>
+      </li>""".format(i=i, start=1990 + i, end=1991 + i, years=i % 7 + 1, months=i % 12) for i in range(case.positions))
+    schools = "".join("""
+      <li class="pv-profile-section__list-item">
+        <h3 class="pv-entity__school-name">School {i}</h3>
+        <p class="pv-entity__degree-name"><span>Degree Name</span><span>Degree {i}</span></p>
+        <p class="pv-entity__dates"><span>Dates attended</span><span>{start} – {end}</span></p>
+      </li>""".format(i=i, start=1980 + i, end=1984 + i) for i in range(case.educations))
+
+    sections = ["""
+    <section class="pv-top-card"><div><div><div>
+      <ul><li>Person {name}</li></ul>
+      <ul class="pv-top-card--list-bullet"><li>Toronto</li></ul>
+    </div></div></div></section>
+    <section id="experience-section"><ul>{positions}</ul></section>
+    <section id="education-section"><ul>{schools}</ul></section>
+    <section class="pv-browsemap-section"><ul>{viewed}</ul></section>""".format(
+        name=case.name, positions=positions, schools=schools, viewed=_also_viewed(case))]
+
+    if case.interests:
+        sections.append("""
+    <section class="pv-profile-section pv-interests-section artdeco-container-card ember-view">{}</section>""".format(
+            "".join('<div class="pv-entity__summary-info ember-view"><h3>Interest {}</h3></div>'.format(i) for i in range(case.interests))))
+    if case.accomplishments:
+        sections.append("""
+    <section class="pv-profile-section pv-accomplishments-section artdeco-container-card ember-view">
+      <div class="pv-accomplishments-block__content break-words"><h3>Languages</h3><ul>{}</ul></div>
+    </section>""".format("".join("<li>Language {}</li>".format(i) for i in range(case.accomplishments))))
+
+    return _page("".join(sections))
+
+def person_not_logged_in(case):
+    positions = "".join("""
+      <li class="experience-item"><div class="experience-item__contents">
+        <h3 class="experience-item__title">Position {i}</h3>
+        <h4 class="experience-item__subtitle"><a href="https://www.linkedin.com/company/company-{i}?trk=public_profile">Company {i}</a></h4>
+        <p class="experience-item__duration">
+          <span class="date-range__start-date">Jan {start}</span>
+          <span class="date-range__end-date">Dec {end}</span>
+          <span class="date-range__duration">{years} yrs</span>
+        </p>
+        <p class="experience-item__location">City {i}</p>
+      </div></li>""".format(i=i, start=1990 + i, end=1991 + i, years=i % 7 + 1) for i in range(case.positions))
+    schools = "".join("""
+      <li class="result-card">
+        <h3 class="result-card__title">School {i}</h3>
+        <h4 class="education__item--degree-info">Degree {i}</h4>
+        <p class="date-range"><span class="date-range__start-date">{start}</span><span class="date-range__end-date">{end}</span></p>
+      </li>""".format(i=i, start=1980 + i, end=1984 + i) for i in range(case.educations))
+    body = """
+    <h1 class="top-card-layout__title">Person {name}</h1>
+    <section class="experience"><ul>{positions}</ul></section>
+    <section class="education"><ul class="education__list">{schools}</ul></section>
+    <section class="browsemap"><ul>{viewed}</ul></section>""".format(
+        name=case.name, positions=positions, schools=schools, viewed=_also_viewed(case))
+    # the public page is not signed in
+    return _page(body).replace('<div id="profile-nav-item"></div>', "")
+
+def _company_nav(case):
+    return """
+    <div class="nav-main__content"></div>
+    <span dir="ltr">Company {name}</span>
+    <ul class="org-page-navigation__items">
+      <li><a data-control-name="page_member_main_nav_about_tab" href="/company/{name}/about/">About</a></li>
+    </ul>
+    <a data-control-name="topcard_see_all_employees" href="/search/results/people/?company={name}">See all employees</a>""".format(name=case.name)
+
+def company_home(case):
+    return _page(_company_nav(case) + "<section></section>")
+
+def company_about(case):
+    cards = "".join("""
+      <li class="org-company-card"><a class="company-name-link" href="/company/related-{i}/">Related {i}</a>
+      <span class="company-followers-count">{i} followers</span></li>""".format(i=i) for i in range(3))
+    body = _company_nav(case) + """
+    <section></section><section></section><section></section>
+    <section>
+      <p>About company {name}</p>
+      <dl>
+        <dt>Website</dt><dd>https://example.com/{name}</dd>
+        <dt>Phone</dt><dd>555-0100</dd>
+        <dt>Industry</dt><dd>Internet</dd>
+        <dt>Company size</dt><dd>10,001+ employees</dd>
+        <dt>On LinkedIn</dt><dd>250,000 on LinkedIn</dd>
+        <dt>Headquarters</dt><dd>Mountain View, CA</dd>
+        <dt>Specialties</dt><dd>search, ads, cloud</dd>
+      </dl>
+    </section>
+    <ul class="company-list">{cards}</ul>
+    <ul class="company-list">{cards}</ul>
+    <button id="org-related-companies-module__show-more-btn">Show more</button>""".format(name=case.name, cards=cards)
+    return _page(body)
+
+def company_not_logged_in(case):
+    showcase = "".join("""
+      <li><a class="name" href="/company/showcase-{i}/">Showcase {i}</a><span>{i} followers</span></li>""".format(i=i)
+                       for i in range(3))
+    affiliated = "".join('<a class="affiliated-company-name" href="/company/affiliate-{i}/">Affiliate {i}</a>'.format(i=i)
+                         for i in range(2))
+    body = """
+    <h1 class="name">Company {name}</h1>
+    <p class="basic-info-description">About company {name}</p>
+    <div class="specialties"><h3>Specialties</h3><p>search</p><p>ads</p></div>
+    <div class="website"><h3>Website</h3><a href="https://example.com/{name}">https://example.com/{name}</a></div>
+    <span class="adr">Mountain View, CA</span>
+    <span class="industry">Internet</span>
+    <span class="company-size">10,001+ employees</span>
+    <div class="type"><h3>Type</h3><p>Public Company</p></div>
+    <div class="founded"><h3>Founded</h3><p>1998</p></div>
+    <ul class="company-showcase-pages"></ul>
+    <ul class="company-showcase-pages">{showcase}</ul>
+    <div class="affiliated-companies">{affiliated}</div>""".format(name=case.name, showcase=showcase, affiliated=affiliated)
+    return _page(body)
+
+def employee_page(case, page):
+    results = "".join("""
+      <li class="search-result">
+        <a class="search-result__result-link" href="/in/{name}-{page}-{i}/"></a>
+        <a class="search-result__result-link" href="/in/{name}-{page}-{i}/">Employee {page}-{i}</a>
+      </li>""".format(name=case.name, page=page, i=i) for i in range(case.employees_per_page))
+    pagination = "".join('<li class="artdeco-pagination__indicator"><button>{}</button></li>'.format(i)
+                         for i in sorted(set([1, page, case.employee_pages])))
+    next_page = "/search/results/people/?company={}&page={}".format(case.name, page + 1)
+    body = """
+    <ul class="search-results">{results}</ul>
+    <ul>{pagination}</ul>
+    <button aria-label="Next" data-href="{next_page}" onclick="location.href=this.dataset.href" {disabled}>Next</button>""".format(
+        results=results, pagination=pagination, next_page=next_page,
+        disabled="disabled" if page >= case.employee_pages else "")
+    return _page(body)
+
+def site(case):
+    pages = {
+        "/in/{}/".format(case.name): person_logged_in(case),
+        "/public/in/{}/".format(case.name): person_not_logged_in(case),
+        "/company/{}/".format(case.name): company_home(case),
+        "/company/{}/about/".format(case.name): company_about(case),
+        "/public/company/{}/".format(case.name): company_not_logged_in(case),
+    }
+    for page in range(1, case.employee_pages + 1):
+        html = employee_page(case, page)
+        pages["/search/results/people/?company={}&page={}".format(case.name, page)] = html
+        if page == 1:
+            pages["/search/results/people/?company={}".format(case.name)] = html
+    return pages
@@ -0,0 +1,32 @@
+"""Memory used by scraped records.
+
+    python -m benchmarks.records --rows 1000000
+"""
+import argparse
+import time
+import tracemalloc
+from linkedin_scraper.objects import Experience
+
+def build(rows):
+    experiences = []
+    for i in range(rows):
+        experiences.append(Experience(from_date="Jan {}".format(1990 + i % 30), to_date="Present",
+                                      duration="{} yrs {} mos".format(i % 7, i % 12), position_title="Engineer",
+                                      location="Toronto", institution_name="Company {}".format(i % 1000)))
+    return experiences
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    args.add_argument("--rows", type=int, default=1000000)
+    args = args.parse_args()
+
+    tracemalloc.start()
+    start = time.time()
+    experiences = build(args.rows)
+    elapsed = time.time() - start
+    current, peak = tracemalloc.get_traced_memory()
+    print("{} experiences in {:.2f}s: {:.1f} MB, {:.0f} bytes per record".format(
+        len(experiences), elapsed, current / 1e6, current / float(len(experiences))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Scraper benchmarks against local HTML fixtures.
+
+    python -m benchmarks.run                                  # recorded fake driver
+    python -m benchmarks.run --driver chrome                  # headless Chrome on a local HTTP server
+    python -m benchmarks.run --cases small typical --json
+"""
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import os
+import threading
+import time
+from linkedin_scraper import Person, Company, browser, public
+from . import fixtures
+from .fake_driver import FakeDriver
+
+def person_logged_in(driver, base_url, case):
+    person = Person(base_url + "/in/{}/".format(case.name), driver=driver, scrape=False)
+    person.scrape_logged_in(close_on_complete=False)
+    return len(person.experiences)
+
+def person_refresh_unchanged(driver, base_url, case):
+    url = base_url + "/in/{}/".format(case.name)
+    # what an earlier scrape of the same page would have stored
+    previous = Person.from_html(fixtures.person_logged_in(case), linkedin_url=url).to_dict()
+    person = Person(url, driver=driver, close_on_complete=False, previous=previous)
+    return len(person.diff.changed_sections)
+
+def person_not_logged_in(driver, base_url, case):
+    person = Person(base_url + "/public/in/{}/".format(case.name), driver=driver, scrape=False)
+    person.scrape_not_logged_in(close_on_complete=False)
+    return len(person.experiences)
+
+def company_logged_in(driver, base_url, case):
+    company = Company(base_url + "/company/{}/".format(case.name), driver=driver, scrape=False)
+    company.scrape_logged_in(get_employees=False, close_on_complete=False)
+    return len(company.showcase_pages)
+
+def company_employees(driver, base_url, case):
+    company = Company(base_url + "/company/{}/".format(case.name), driver=driver, scrape=False)
+    return len(company.get_employees())
+
+SCENARIOS = [person_logged_in, person_refresh_unchanged, person_not_logged_in, company_logged_in, company_employees]
+
+def person_public_http(session, base_url, case):
+    person = public.fetch_person(base_url + "/public/in/{}/".format(case.name), session=session)
+    return len(person.experiences)
+
+def people_public_http_x100(session, base_url, case):
+    urls = [base_url + "/public/in/{}/".format(case.name)] * 100
+    return sum(result.error is None for result in public.fetch_many(urls, session=session))
+
+HTTP_SCENARIOS = [person_public_http, people_public_http_x100]
+
+def serve(pages):
+    class Handler(BaseHTTPRequestHandler):
+        # keep-alive, like the real site
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = (pages.get(self.path) or "").encode("utf-8")
+            self.send_response(200 if self.path in pages else 404)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, "http://127.0.0.1:{}".format(server.server_address[1])
+
+def count_commands(driver):
+    commands = Counter()
+    execute = driver.execute
+
+    def counted(command, params=None):
+        commands[command] += 1
+        return execute(command, params)
+
+    driver.execute = counted
+    return commands
+
+class RssSampler(object):
+    # the peak resident memory of each process tree while a scenario runs. ru_maxrss is
+    # the peak over the whole run, so every scenario after the largest would report the same
+
+    def __init__(self, pids, interval=0.005):
+        self.pids = pids
+        self.interval = interval
+        self.start = dict((pid, browser.tree_rss(pid)) for pid in pids)
+        self.peak = dict(self.start)
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self.__sample, daemon=True)
+
+    def __sample(self):
+        while True:
+            for pid in self.pids:
+                self.peak[pid] = max(self.peak[pid], browser.tree_rss(pid))
+            if self._done.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self._thread.join()
+
+def measure(name, driver_kind, scenario, driver, base_url, case, commands, browser_pid=None):
+    commands.clear()
+    pids = [os.getpid()] + ([browser_pid] if browser_pid is not None else [])
+    with RssSampler(pids) as rss:
+        start = time.time()
+        items = scenario(driver, base_url, case)
+        elapsed = time.time() - start
+    result = {
+        "case": name,
+        "scenario": scenario.__name__,
+        "driver": driver_kind,
+        "items": items,
+        "wall_s": round(elapsed, 4),
+        "commands": sum(commands.values()),
+        "peak_rss_kb": rss.peak[os.getpid()],
+        "rss_growth_kb": rss.peak[os.getpid()] - rss.start[os.getpid()],
+    }
+    if browser_pid is not None:
+        result["browser_rss_kb"] = rss.peak[browser_pid]
+    return result
+
+def run(driver_kind, case_names, scenarios=SCENARIOS, http_scenarios=HTTP_SCENARIOS):
+    results = []
+    for name in case_names:
+        case = fixtures.CASES[name]
+        pages = fixtures.site(case)
+        server = None
+        if driver_kind == "fake":
+            driver = FakeDriver(pages)
+            base_url, commands = driver.base_url, driver.commands
+        else:
+            server, base_url = serve(pages)
+            driver = browser.new_driver(headless=True)
+            commands = count_commands(driver)
+
+        try:
+            for scenario in scenarios:
+                browser_pid = driver.service.process.pid if driver_kind == "chrome" else None
+                results.append(measure(name, driver_kind, scenario, driver, base_url, case, commands, browser_pid))
+        finally:
+            driver.quit()
+            if server is not None:
+                server.shutdown()
+
+        # the browserless path always runs against a real local server
+        if http_scenarios:
+            server, base_url = serve(pages)
+            session = public.new_session()
+            try:
+                for scenario in http_scenarios:
+                    results.append(measure(name, "http", scenario, session, base_url, case, Counter()))
+            finally:
+                session.close()
+                server.shutdown()
+    return results
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    args.add_argument("--driver", choices=("fake", "chrome"), default="fake")
+    args.add_argument("--cases", nargs="+", choices=sorted(fixtures.CASES), default=["small", "typical", "pathological"])
+    args.add_argument("--json", action="store_true", help="print one JSON result per line")
+    args = args.parse_args()
+
+    columns = ["case", "scenario", "items", "wall_s", "commands", "peak_rss_kb", "rss_growth_kb", "browser_rss_kb"]
+    if not args.json:
+        print("{:<14}{:<24}{:>7}{:>10}{:>10}{:>13}{:>15}{:>16}".format(*columns))
+    for result in run(args.driver, args.cases):
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print("{:<14}{:<24}{:>7}{:>10.3f}{:>10}{:>13}{:>15}{:>16}".format(*[result.get(column, "-") for column in columns]))
+
+if __name__ == "__main__":
+    main()
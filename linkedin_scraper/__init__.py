@@ -2,6 +2,16 @@ from os.path import dirname, basename, isfile
 from .person import Person
 from .objects import Institution, Experience, Education
 from .company import Company
+from .pool import DriverPool
+from .batch import scrape_many, ScrapeResult
+from .public import fetch_person, fetch_company, fetch_many
+from .cache import ProfileCache
+from .urls import canonical_url, DedupIndex
+from .entities import EntityIndex
+from .sessions import AccountPool
+from .frontier import Frontier, crawl
+from .snapshots import SnapshotStore, replay
+from .instrumentation import LoggingSink, PrometheusSink
 
 __version__ = "2.4.6"
 
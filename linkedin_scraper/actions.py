@@ -2,6 +2,7 @@ import getpass
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
+from . import browser, sessions
 
 def __prompt_email_password():
   u = input("Email: ")
@@ -12,10 +13,19 @@ def page_has_loaded(driver):
     page_state = driver.execute_script('return document.readyState;')
     return page_state == 'complete'
 
-def login(driver, email=None, password=None):
+def login(driver=None, email=None, password=None, session_file=None):
+  if driver is None:
+    driver = browser.new_driver()
+
+  # a saved session skips the login form altogether
+  if session_file is not None and sessions.restore_session(driver, session_file):
+    return driver
+
   if not email or not password:
     email, password = __prompt_email_password()
 
+  # a driver still signed in as another account would be sent from /login straight to the feed
+  sessions.clear_session(driver)
   driver.get("https://www.linkedin.com/login")
   element = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "username")))
 
@@ -27,3 +37,6 @@ def login(driver, email=None, password=None):
   driver.find_element_by_tag_name("button").click()
 
   element = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "profile-nav-item")))
+  if session_file is not None:
+    sessions.save_session(driver, session_file)
+  return driver
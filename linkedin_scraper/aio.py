@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import itertools
+import time
+import traceback
+from . import actions, browser
+from .batch import ScrapeResult, KINDS
+from .person import Person
+from .company import Company
+from .pool import DriverPool
+
+class TokenBucket(object):
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self, tokens=1):
+        # the lock queues waiters in order, so a burst of callers is paced fairly
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+class AsyncScraper(object):
+
+    def __init__(self, pool=None, size=4, rate=None, session_rate=None, account_rate=None, accounts=None, headless=True):
+        self.accounts = accounts
+        self.headless = headless
+        self._owns_pool = pool is None
+        self._next_account = itertools.count()
+        self.pool = pool if pool is not None else DriverPool(size=size, factory=self.__new_driver)
+        # one thread per browser session, created once and reused by every call
+        self.executor = ThreadPoolExecutor(max_workers=self.pool.size)
+        self.rate = TokenBucket(rate) if rate else None
+        self.session_rate = session_rate
+        self.account_rate = account_rate
+        self._account_buckets = {}
+        self._slots = None
+
+    def __new_driver(self):
+        driver = browser.new_driver(headless=self.headless)
+        if self.accounts is not None:
+            # sessions are spread over the accounts in turn
+            account = self.accounts.accounts[next(self._next_account) % len(self.accounts)]
+            actions.login(driver, account.email, account.password, session_file=account.session_file)
+            # kept on the browser itself, so it goes away when the pool recycles the browser
+            driver.scrape_account = account.email
+        return driver
+
+    async def __run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def __pace(self, driver):
+        if self.rate is not None:
+            await self.rate.acquire()
+        if self.session_rate:
+            if getattr(driver, "session_bucket", None) is None:
+                driver.session_bucket = TokenBucket(self.session_rate)
+            await driver.session_bucket.acquire()
+        account = getattr(driver, "scrape_account", None)
+        if self.account_rate and account is not None:
+            await self._account_buckets.setdefault(account, TokenBucket(self.account_rate)).acquire()
+
+    def __paced(self, driver, loop):
+        # every page load waits for its tokens on the event loop, from the executor thread doing the scrape
+        get = driver.get
+
+        def paced(url):
+            asyncio.run_coroutine_threadsafe(self.__pace(driver), loop).result()
+            return get(url)
+        return get, paced
+
+    async def scrape(self, url, kind="person", **kwargs):
+        if kind not in KINDS:
+            raise ValueError("kind must be one of {}, not {!r}".format(KINDS, kind))
+        # never more calls in flight than browsers, so pool.acquire never blocks an executor thread
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool.size)
+        async with self._slots:
+            driver = await self.__run(self.pool.acquire)
+            get, driver.get = self.__paced(driver, asyncio.get_running_loop())
+            try:
+                cls = Person if kind == "person" else Company
+                kwargs.setdefault("interactive", False)
+                return await self.__run(cls, url, driver=driver, close_on_complete=False, **kwargs)
+            finally:
+                driver.get = get
+                await self.__run(self.pool.release, driver)
+
+    async def scrape_person(self, url, **kwargs):
+        return await self.scrape(url, kind="person", **kwargs)
+
+    async def scrape_company(self, url, **kwargs):
+        return await self.scrape(url, kind="company", **kwargs)
+
+    async def __result(self, url, kind, kwargs):
+        try:
+            return ScrapeResult(url, (await self.scrape(url, kind=kind, **kwargs)).to_dict(), None)
+        except Exception:
+            return ScrapeResult(url, None, traceback.format_exc())
+
+    async def scrape_stream(self, urls, kind="person", backlog=2, **kwargs):
+        # yields results in completion order, with a bounded number of urls taken from the input
+        if hasattr(urls, "__aiter__"):
+            urls = urls.__aiter__()
+            next_url = lambda: urls.__anext__()
+        else:
+            urls = iter(urls)
+
+            async def next_url():
+                try:
+                    return next(urls)
+                except StopIteration:
+                    raise StopAsyncIteration
+
+        pending = set()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < self.pool.size * backlog:
+                try:
+                    url = await next_url()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(self.__result(url, kind, kwargs)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    async def close(self):
+        if self._owns_pool:
+            await self.__run(self.pool.close)
+        self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+_default = None
+
+def _scraper():
+    global _default
+    if _default is None:
+        _default = AsyncScraper()
+    return _default
+
+async def scrape_person(url, **kwargs):
+    return await _scraper().scrape_person(url, **kwargs)
+
+async def scrape_company(url, **kwargs):
+    return await _scraper().scrape_company(url, **kwargs)
+
+async def scrape_stream(urls, kind="person", **kwargs):
+    async for result in _scraper().scrape_stream(urls, kind=kind, **kwargs):
+        yield result
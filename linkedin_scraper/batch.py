@@ -0,0 +1,116 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing.util import Finalize
+import heapq
+import itertools
+import time
+import traceback
+from . import actions, browser, retry
+from .person import Person
+from .company import Company
+
+ScrapeResult = namedtuple("ScrapeResult", ["url", "record", "error"])
+
+KINDS = ("person", "company")
+
+# one browser per worker process, started by the pool initializer
+_driver = None
+# the AccountPool shared with the parent, and the account the worker's browser is bound to
+_accounts = None
+_account = None
+
+def _init_worker(email, password, headless, accounts=None):
+    global _driver, _accounts
+    _driver = browser.new_driver(headless=headless)
+    Finalize(None, _driver.quit, exitpriority=10)
+    _accounts = accounts
+    if email is not None and accounts is None:
+        actions.login(_driver, email, password)
+
+def _use_account(account):
+    global _account
+    # switching accounts only swaps the saved cookies, unless the session has expired.
+    # until the switch succeeds the browser is signed in as neither account
+    _account = None
+    actions.login(_driver, account.email, account.password, session_file=account.session_file)
+    _account = account
+
+def _charge_account():
+    # a worker stays signed in as one account and only moves on once that account's budget is spent
+    if _account is None or not _accounts.charge(_account):
+        _use_account(_accounts.acquire())
+
+def _scrape(url, kind, get_employees):
+    # returns the result and whether the url was blocked and is worth another try later
+    try:
+        if _accounts is not None:
+            _charge_account()
+        if kind == "person":
+            scraped = Person(url, driver=_driver, close_on_complete=False, interactive=False)
+        else:
+            scraped = Company(url, driver=_driver, get_employees=get_employees, close_on_complete=False, interactive=False)
+        return ScrapeResult(url, scraped.to_dict(), None), False
+    except retry.Blocked:
+        return ScrapeResult(url, None, traceback.format_exc()), True
+    except Exception:
+        return ScrapeResult(url, None, traceback.format_exc()), False
+
+def scrape_many(urls, kind="person", workers=4, email=None, password=None, headless=True, get_employees=False, backlog=4, accounts=None,
+                retries=3, backoff=None, breaker=None):
+    if kind not in KINDS:
+        raise ValueError("kind must be one of {}, not {!r}".format(KINDS, kind))
+
+    backoff = backoff or retry.Backoff()
+    breaker = breaker or retry.CircuitBreaker()
+    urls = iter(urls)
+    attempts = {}
+    # blocked urls wait here for their backoff to run out, as (ready_at, sequence, url)
+    delayed = []
+    sequence = itertools.count()
+    exhausted = False
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(email, password, headless, accounts)) as executor:
+        pending = {}
+        while True:
+            # keep a bounded number of urls in flight so huge inputs are never fully queued
+            while len(pending) < workers * backlog:
+                if delayed and delayed[0][0] <= time.time():
+                    url = heapq.heappop(delayed)[2]
+                elif not exhausted:
+                    url = next(urls, None)
+                    if url is None:
+                        exhausted = True
+                        break
+                else:
+                    break
+                if not breaker.allow(url):
+                    # the host is blocking us, so nothing is sent to it until the cooldown is over
+                    ready_at = max(breaker.retry_at(url), time.time() + backoff.base)
+                    heapq.heappush(delayed, (ready_at, next(sequence), url))
+                    break
+                pending[executor.submit(_scrape, url, kind, get_employees)] = url
+
+            if not pending and not delayed and exhausted:
+                return
+            timeout = max(0, delayed[0][0] - time.time()) if delayed else None
+            if not pending:
+                time.sleep(timeout)
+                continue
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                result, blocked = future.result()
+                if not blocked:
+                    breaker.success(url)
+                    attempts.pop(url, None)
+                    yield result
+                    continue
+                breaker.failure(url)
+                attempts[url] = attempts.get(url, 0) + 1
+                if attempts[url] > retries:
+                    del attempts[url]
+                    yield result
+                else:
+                    ready_at = max(time.time() + backoff.delay(attempts[url]), breaker.retry_at(url))
+                    heapq.heappush(delayed, (ready_at, next(sequence), url))
@@ -0,0 +1,81 @@
+from selenium import webdriver
+import os
+
+# url patterns for resources the scraper never reads: media, fonts and third-party ads and trackers
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*media.licdn.com/dms/image*", "*static.licdn.com/sc/h/*.woff*",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googletagmanager.com*", "*google-analytics.com*",
+    "*px.ads.linkedin.com*", "*snap.licdn.com*", "*bat.bing.com*", "*connect.facebook.net*",
+]
+
+# chrome content settings, 2 blocks the content type outright
+_BLOCKED_CONTENT = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.plugins": 2,
+    "profile.managed_default_content_settings.popups": 2,
+    "profile.managed_default_content_settings.geolocation": 2,
+    "profile.managed_default_content_settings.notifications": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+}
+
+def new_options(headless=False, lean=True):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless")
+    if lean:
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--mute-audio")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", _BLOCKED_CONTENT)
+        # every wait in the scraper is explicit, so there is no need to wait for subresources
+        options.set_capability("pageLoadStrategy", "eager")
+    return options
+
+def block_urls(driver, patterns=BLOCKED_URLS):
+    # requests matching the patterns fail before they leave the browser
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        return True
+    except Exception:
+        return False
+
+def tree_rss(pid):
+    # resident memory of a process and all of its descendants, in kB (Linux only)
+    try:
+        with open("/proc/{}/status".format(pid)) as f:
+            rss = [int(line.split()[1]) for line in f if line.startswith("VmRSS:")]
+        with open("/proc/{0}/task/{0}/children".format(pid)) as f:
+            children = [int(child) for child in f.read().split()]
+    except (IOError, OSError):
+        return 0
+    return sum(rss) + sum(tree_rss(child) for child in children)
+
+def browser_rss(driver):
+    # bytes held by chromedriver and the browser it started, or None for remote and stand-in drivers
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return None
+    return tree_rss(pid) * 1024 or None
+
+def new_driver(headless=False, lean=True, blocked_urls=BLOCKED_URLS):
+    options = new_options(headless=headless, lean=lean)
+
+    try:
+        if os.getenv("CHROMEDRIVER") == None:
+            driver_path = os.path.join(os.path.dirname(__file__), 'drivers/chromedriver')
+        else:
+            driver_path = os.getenv("CHROMEDRIVER")
+
+        driver = webdriver.Chrome(driver_path, options=options)
+    except:
+        driver = webdriver.Chrome(options=options)
+
+    if lean and blocked_urls:
+        block_urls(driver, blocked_urls)
+    return driver
@@ -0,0 +1,81 @@
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+from .urls import canonical_url
+
+def cache_key(url):
+    parts = urlparse(canonical_url(url))
+    return "{}{}".format(parts.netloc, parts.path.rstrip("/"))
+
+class ProfileCache(object):
+
+    def __init__(self, path="linkedin_scraper.sqlite", ttl=7 * 24 * 60 * 60, max_entries=100000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            "key TEXT PRIMARY KEY, kind TEXT, record TEXT, stored_at REAL, accessed_at REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS profiles_accessed_at ON profiles (accessed_at)")
+        self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def __contains__(self, url):
+        with self._lock:
+            row = self._db.execute("SELECT stored_at FROM profiles WHERE key = ?", (cache_key(url),)).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl
+
+    def get(self, url):
+        key = cache_key(url)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT record, stored_at FROM profiles WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                if row is not None:
+                    self._db.execute("DELETE FROM profiles WHERE key = ?", (key,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE profiles SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, url, record, kind=None):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO profiles (key, kind, record, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (cache_key(url), kind, json.dumps(record), now, now))
+            self.__evict()
+            self._db.commit()
+
+    def invalidate(self, url):
+        with self._lock:
+            self._db.execute("DELETE FROM profiles WHERE key = ?", (cache_key(url),))
+            self._db.commit()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self)}
+
+    def close(self):
+        self._db.close()
+
+    def __evict(self):
+        count = self._db.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        cursor = self._db.execute(
+            "DELETE FROM profiles WHERE key IN (SELECT key FROM profiles ORDER BY accessed_at LIMIT ?)",
+            (count - self.max_entries,))
+        self.evictions += cursor.rowcount
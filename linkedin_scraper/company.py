@@ -1,44 +1,41 @@
-import requests
-from lxml import html
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from .objects import Scraper
+from selenium.common.exceptions import TimeoutException
+from .objects import Scraper, CompanySummary
+from . import parser, extractor, browser, waits, selectors
+from .pool import DriverPool
 from .person import Person
-import time
-import os
+from .urls import canonical_url, DedupIndex
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import queue
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 
-class CompanySummary(object):
-    linkedin_url = None
-    name = None
-    followers = None
-
-    def __init__(self, linkedin_url = None, name = None, followers = None):
-        self.linkedin_url = linkedin_url
-        self.name = name
-        self.followers = followers
+EmployeeCursor = namedtuple("EmployeeCursor", ["page", "last_url"])
 
-    def __repr__(self):
-        if self.followers == None:
-            return """ {name} """.format(name = self.name)
-        else:
-            return """ {name} {followers} """.format(name = self.name, followers = self.followers)
+def _page_url(search_url, page):
+    parts = urlparse(search_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != "page"]
+    query.append(("page", str(page)))
+    return urlunparse(parts._replace(query=urlencode(query)))
 
 class Company(Scraper):
+    __SEARCH = selectors.latest("search")
+
     linkedin_url = None
     name = None
     about_us =None
     website = None
+    industry = None
     headquarters = None
     founded = None
     company_type = None
     company_size = None
     specialties = None
-    showcase_pages =[]
-    affiliated_companies = []
+    employee_cursor = None
 
-    def __init__(self, linkedin_url = None, name = None, about_us =None, website = None, headquarters = None, founded = None, company_type = None, company_size = None, specialties = None, showcase_pages =[], affiliated_companies = [], driver = None, scrape = True, get_employees = True, close_on_complete = True):
+    def __init__(self, linkedin_url = None, name = None, about_us =None, website = None, headquarters = None, founded = None, company_type = None, company_size = None, specialties = None, showcase_pages = None, affiliated_companies = None, driver = None, scrape = True, get_employees = True, close_on_complete = True, use_js = False, cache = None, snapshots = None, metrics = None, dedup = None, interactive = True, breaker = None, backoff = None):
         self.linkedin_url = linkedin_url
         self.name = name
         self.about_us = about_us
@@ -48,214 +45,327 @@ class Company(Scraper):
         self.company_type = company_type
         self.company_size = company_size
         self.specialties = specialties
-        self.showcase_pages = showcase_pages
-        self.affiliated_companies = affiliated_companies
-
-        if driver is None:
-            try:
-                if os.getenv("CHROMEDRIVER") == None:
-                    driver_path = os.path.join(os.path.dirname(__file__), 'drivers/chromedriver')
-                else:
-                    driver_path = os.getenv("CHROMEDRIVER")
-
-                driver = webdriver.Chrome(driver_path)
-            except:
-                driver = webdriver.Chrome()
-
-        driver.get(linkedin_url)
-        self.driver = driver
-
-        if scrape:
-            self.scrape(get_employees=get_employees, close_on_complete=close_on_complete)
-
-    def __get_text_under_subtitle(self, elem):
-        return "\n".join(elem.text.split("\n")[1:])
-
-    def __get_text_under_subtitle_by_class(self, driver, class_name):
-        return self.__get_text_under_subtitle(driver.find_element_by_class_name(class_name))
-
-    def scrape(self, get_employees = True, close_on_complete = True):
+        self.showcase_pages = list(showcase_pages or [])
+        self.affiliated_companies = list(affiliated_companies or [])
+        self.wait_timings = []
+        self.cache = cache
+        self.snapshots = snapshots
+        self.duplicate = False
+
+        # a company already scraped in this run is not loaded again
+        # a record without a url has nothing to be a duplicate of
+        if dedup is not None and linkedin_url and not dedup.add(linkedin_url):
+            self.duplicate = True
+            self.driver = None if isinstance(driver, DriverPool) else driver
+            return
+
+        owned = False
+        try:
+            if cache is not None and self.from_cache():
+                self.driver = None if isinstance(driver, DriverPool) else driver
+                return
+
+            if isinstance(driver, DriverPool):
+                self.pool = driver
+                driver = self.pool.acquire()
+                self.leased = True
+            elif driver is None:
+                driver = browser.new_driver()
+                owned = True
+
+            self.driver = driver
+            self.interactive = interactive
+            self.breaker = breaker
+            if backoff is not None:
+                self.backoff = backoff
+            self.instrument(metrics, driver)
+            with self.phase("page_load"):
+                self.load_page(linkedin_url)
+
+            if scrape:
+                self.scrape(get_employees=get_employees, close_on_complete=close_on_complete, use_js=use_js)
+        except BaseException:
+            # a url that failed is not a duplicate, so a retry with the same index goes ahead
+            if dedup is not None and linkedin_url:
+                dedup.discard(linkedin_url)
+            # a failed scrape must not keep a pooled browser checked out
+            if self.pool is not None:
+                self.close_driver()
+            # nor leave behind a browser it started itself
+            elif owned:
+                self.driver.quit()
+            raise
+        finally:
+            self.detach_metrics()
+
+    @classmethod
+    def from_html(cls, page_source, linkedin_url = None, logged_in = True):
+        company = cls.from_dict({"linkedin_url": linkedin_url})
+        company.parse(page_source, logged_in = logged_in)
+        return company
+
+    @classmethod
+    def from_dict(cls, record):
+        company = cls.__new__(cls)
+        company.showcase_pages = []
+        company.affiliated_companies = []
+        company.wait_timings = []
+        company.duplicate = False
+        company.driver = None
+        company.load(record)
+        return company
+
+    def load(self, record):
+        for key, value in record.items():
+            if key == "showcase_pages":
+                self.showcase_pages.extend(CompanySummary.from_dict(summary) for summary in value)
+            elif key == "affiliated_companies":
+                self.affiliated_companies.extend(CompanySummary.from_dict(summary) for summary in value)
+            elif key == "employees":
+                self.employees = [Person.from_dict(employee) for employee in value]
+            else:
+                setattr(self, key, value)
+
+    def scrape(self, get_employees = True, close_on_complete = True, use_js = False):
         if self.is_signed_in():
-            self.scrape_logged_in(get_employees = get_employees, close_on_complete = close_on_complete)
+            self.scrape_logged_in(get_employees = get_employees, close_on_complete = close_on_complete, use_js = use_js)
         else:
-            self.scrape_not_logged_in(get_employees = get_employees, close_on_complete = close_on_complete)
-
-    def __parse_employee__(self, employee_raw):
-        try:
-            return Person(
-                linkedin_url = employee_raw.find_element_by_class_name("search-result__result-link").get_attribute("href"),
-                name = employee_raw.find_elements_by_class_name("search-result__result-link")[1].text.strip(),
-                driver = self.driver,
-                get = False,
-                scrape = False
-                )
-        except:
-            return None
-
-    def get_employees(self, wait_time=10):
+            if not self.interactive:
+                self.check_blocked()
+            self.scrape_not_logged_in(get_employees = get_employees, close_on_complete = close_on_complete, use_js = use_js)
+        self.to_cache()
+        self.emit_metrics()
+
+    def __parse_employee__(self, linkedin_url, name):
+        return Person(
+            linkedin_url = canonical_url(linkedin_url) if linkedin_url else None,
+            name = name,
+            driver = self.driver,
+            get = False,
+            scrape = False
+            )
+
+    def __load_results(self, driver, wait_time):
         list_css = "search-results"
-        next_xpath = '//button[@aria-label="Next"]'
+        _ = WebDriverWait(driver, wait_time).until(EC.presence_of_element_located((By.XPATH, self.__SEARCH.xpath("results"))))
+        # results are rendered as they scroll into view, so scroll until the list stops growing
+        timing = waits.scroll_until_stable(driver, list_css, ceiling=wait_time, name="employees")
+        page_source = driver.page_source
+        if self.snapshots is not None:
+            self.snapshots.save(driver.current_url, page_source, "employees")
+        return page_source, timing
+
+    def __search_url(self):
+        layout = self.layout or selectors.latest("company")
+        see_all_employees = self.driver.find_element_by_xpath(layout.xpath("see_all_employees"))
+        return see_all_employees.get_attribute("href")
+
+    def iter_employees(self, cursor=None, wait_time=10):
+        next_xpath = self.__SEARCH.xpath("next")
         driver = self.driver
 
-        see_all_employees = driver.find_element_by_xpath('//a[@data-control-name="topcard_see_all_employees"]')
-        driver.get(see_all_employees.get_attribute("href"))
-
-        _ = WebDriverWait(driver, wait_time).until(EC.presence_of_element_located((By.CLASS_NAME, list_css)))
+        search_url = self.__search_url()
 
-        total = []
-        driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight/2));")
-        time.sleep(1)
-        driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight*3/4));")
-        results_list = driver.find_element_by_class_name(list_css)
-        results_li = results_list.find_elements_by_tag_name("li")
-        for res in results_li:
-            total.append(self.__parse_employee__(res))
-
-        while self.__find_enabled_element_by_xpath__(next_xpath):
+        if cursor is None:
+            page, skip_to = 1, None
+            self.load_page(search_url)
+        else:
+            page, skip_to = cursor
+            self.load_page(_page_url(search_url, page))
+
+        # the same member can show up on several result pages, under different tracking urls
+        seen = DedupIndex()
+        while True:
+            page_source, timing = self.__load_results(driver, wait_time)
+            self.wait_timings.append(timing)
+            employees = parser.parse_employees(page_source)
+            urls = [linkedin_url for linkedin_url, _ in employees]
+            if skip_to in urls:
+                employees = employees[urls.index(skip_to) + 1:]
+            skip_to = None
+
+            for linkedin_url, name in employees:
+                self.employee_cursor = EmployeeCursor(page, linkedin_url)
+                if seen.add(linkedin_url):
+                    yield self.__parse_employee__(linkedin_url, name)
+
+            if not self.__find_enabled_element_by_xpath__(next_xpath):
+                break
             driver.find_element_by_xpath(next_xpath).click()
-            _ = WebDriverWait(driver, wait_time).until(EC.presence_of_element_located((By.CLASS_NAME, list_css)))
-
-            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight/4));")
-            time.sleep(1)
-            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight/3));")
-            time.sleep(1)
-            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight/2));")
-            time.sleep(1)
-            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight*2/3));")
-            time.sleep(1)
-            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight*3/4));")
-
-            results_list = driver.find_element_by_class_name(list_css)
-            results_li = results_list.find_elements_by_tag_name("li")
-            for res in results_li:
-                _ = WebDriverWait(driver, wait_time).until(EC.visibility_of(res))
-                total.append(self.__parse_employee__(res))
-        return total
-
-
-
-    def scrape_logged_in(self, get_employees = True, close_on_complete = True):
+            self.wait_timings.append(waits.wait_for_quiescence(driver, ceiling=wait_time, name="employees_next"))
+            page += 1
+            self.watch_blocked(_page_url(search_url, page))
+
+    def get_employees(self, wait_time=10, pool=None, acquire_timeout=30):
+        if pool is not None:
+            return self.get_employees_parallel(pool, wait_time=wait_time, acquire_timeout=acquire_timeout)
+        return list(self.iter_employees(wait_time=wait_time))
+
+    def __fetch_results_pages(self, driver, search_url, pages, wait_time):
+        # each worker keeps its driver and takes the next page until there are none left
+        fetched = []
+        while True:
+            try:
+                page = pages.get_nowait()
+            except queue.Empty:
+                return fetched
+            self.load_page(_page_url(search_url, page), driver)
+            page_source, timing = self.__load_results(driver, wait_time)
+            fetched.append((page, parser.parse_employees(page_source), timing))
+
+    def __fetch_with_session(self, pool, acquire_timeout, *args):
+        with pool.session(timeout=acquire_timeout) as driver:
+            return self.__fetch_results_pages(driver, *args)
+
+    def get_employees_parallel(self, pool, wait_time=10, acquire_timeout=30):
+        driver = self.driver
+        search_url = self.__search_url()
+        self.load_page(search_url)
+
+        first_page, timing = self.__load_results(driver, wait_time)
+        results = [(1, parser.parse_employees(first_page), timing)]
+        pages = queue.Queue()
+        for page in range(2, parser.parse_page_count(first_page) + 1):
+            pages.put(page)
+
+        # this company's own driver is one of the workers, so a slot it holds in the same pool is
+        # never waited for, and a pool that stays busy raises PoolTimeout instead of hanging
+        sessions = min(pool.size - (1 if self.pool is pool else 0), pages.qsize() - 1)
+        with ThreadPoolExecutor(max_workers=max(sessions, 0) + 1) as executor:
+            workers = [executor.submit(self.__fetch_results_pages, driver, search_url, pages, wait_time)]
+            workers.extend(executor.submit(self.__fetch_with_session, pool, acquire_timeout, search_url, pages, wait_time)
+                           for _ in range(sessions))
+            for worker in workers:
+                results.extend(worker.result())
+
+        # timings are collected per page and merged here, not appended from the worker threads
+        results.sort(key=lambda result: result[0])
+        self.wait_timings.extend(timing for _, _, timing in results)
+        seen = DedupIndex()
+        return [self.__parse_employee__(linkedin_url, name)
+                for _, employees, _ in results for linkedin_url, name in employees if seen.add(linkedin_url)]
+
+    def parse(self, page_source, logged_in = True, layout = None):
+        self.__apply(parser.parse_company(page_source, logged_in = logged_in, layout = layout))
+
+    def extract(self, logged_in = True):
+        self.__apply(extractor.extract_company(self.driver, logged_in = logged_in, layout = self.layout if logged_in else None))
+
+    def __apply(self, fields):
+        for key, value in fields.items():
+            if key == "showcase_pages":
+                self.showcase_pages.extend(value)
+            elif key == "affiliated_companies":
+                self.affiliated_companies.extend(value)
+            elif value is not None:
+                setattr(self, key, value)
+
+    def scrape_logged_in(self, get_employees = True, close_on_complete = True, use_js = False):
         driver = self.driver
 
-        driver.get(self.linkedin_url)
-
-        _ = WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.CLASS_NAME, 'nav-main__content')))
-        _ = WebDriverWait(driver, 3).until(EC.presence_of_all_elements_located((By.XPATH, '//span[@dir="ltr"]')))
-
-        navigation = driver.find_element_by_class_name("org-page-navigation__items ")
-
-        self.name = driver.find_element_by_xpath('//span[@dir="ltr"]').text.strip()
-        navigation.find_elements_by_xpath("//a[@data-control-name='page_member_main_nav_about_tab']")[0].click()
-
-        _ = WebDriverWait(driver, 3).until(EC.presence_of_all_elements_located((By.TAG_NAME, 'section')))
-        time.sleep(3)
-
-        grid = driver.find_elements_by_tag_name("section")[3]
-        self.about_us = grid.find_elements_by_tag_name("p")[0].text.strip()
+        with self.phase("page_load"):
+            self.load_page(self.linkedin_url)
 
-        values = grid.find_elements_by_tag_name("dd")
-        self.specialties = "\n".join(values[-1].text.strip().split(", "))
-        self.website = values[0].text.strip()
-        self.headquarters = values[5].text.strip()
-        self.industry = values[2].text.strip()
-        self.company_size = values[3].text.strip()
+        # the layout decides which selectors run from here on, and an unknown one fails fast
+        with self.phase("top_card"):
+            self.layout = layout = selectors.detect_in_page(driver, "company", wait_time = 3)
+            driver.find_element_by_xpath(layout.xpath("about_tab")).click()
 
-        driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight/2));")
+            try:
+                _ = WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.XPATH, layout.xpath("about"))))
+            except TimeoutException:
+                self.count_timeout()
+            self.wait_timings.append(waits.wait_for_quiescence(driver, ceiling=3, name="about"))
 
+        with self.phase("showcase"):
+            driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight/2));")
 
-        try:
-            _ = WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.CLASS_NAME, 'company-list')))
-            showcase, affiliated = driver.find_elements_by_class_name("company-list")
-            driver.find_element_by_id("org-related-companies-module__show-more-btn").click()
-
-            # get showcase
-            for showcase_company in showcase.find_elements_by_class_name("org-company-card"):
-                companySummary = CompanySummary(
-                        linkedin_url = showcase_company.find_element_by_class_name("company-name-link").get_attribute("href"),
-                        name = showcase_company.find_element_by_class_name("company-name-link").text.strip(),
-                        followers = showcase_company.find_element_by_class_name("company-followers-count").text.strip()
-                    )
-                self.showcase_pages.append(companySummary)
-
-            # affiliated company
-
-            for affiliated_company in showcase.find_elements_by_class_name("org-company-card"):
-                companySummary = CompanySummary(
-                         linkedin_url = affiliated_company.find_element_by_class_name("company-name-link").get_attribute("href"),
-                        name = affiliated_company.find_element_by_class_name("company-name-link").text.strip(),
-                        followers = affiliated_company.find_element_by_class_name("company-followers-count").text.strip()
-                        )
-                self.affiliated_companies.append(companySummary)
-
-        except:
-            pass
+            try:
+                _ = WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.XPATH, layout.xpath("company_list"))))
+                driver.find_element_by_xpath(layout.xpath("show_more")).click()
+            except TimeoutException:
+                self.count_timeout()
+            except:
+                pass
+
+        with self.phase("parse"):
+            if use_js:
+                self.extract(logged_in = True)
+                if self.snapshots is not None:
+                    self.snapshot("company", driver.page_source, logged_in = True)
+            else:
+                page_source = driver.page_source
+                self.snapshot("company", page_source, logged_in = True)
+                self.parse(page_source, logged_in = True, layout = layout)
 
         if get_employees:
-            self.employees = self.get_employees()
+            with self.phase("employees"):
+                self.employees = self.get_employees()
 
-        driver.get(self.linkedin_url)
+        self.load_page(self.linkedin_url)
 
         if close_on_complete:
-            driver.close()
+            self.close_driver()
 
-    def scrape_not_logged_in(self, close_on_complete = True, retry_limit = 10, get_employees = True):
+    def scrape_not_logged_in(self, close_on_complete = True, retry_limit = 10, get_employees = True, use_js = False):
         driver = self.driver
         retry_times = 0
-        while self.is_signed_in() and retry_times <= retry_limit:
-            page = driver.get(self.linkedin_url)
-            retry_times = retry_times + 1
-
-        self.name = driver.find_element_by_class_name("name").text.strip()
-
-        self.about_us = driver.find_element_by_class_name("basic-info-description").text.strip()
-        self.specialties = self.__get_text_under_subtitle_by_class(driver, "specialties")
-        self.website = self.__get_text_under_subtitle_by_class(driver, "website")
-        self.headquarters = driver.find_element_by_class_name("adr").text.strip()
-        self.industry = driver.find_element_by_class_name("industry").text.strip()
-        self.company_size = driver.find_element_by_class_name("company-size").text.strip()
-        self.company_type = self.__get_text_under_subtitle_by_class(driver, "type")
-        self.founded = self.__get_text_under_subtitle_by_class(driver, "founded")
-
-        # get showcase
-        try:
-            driver.find_element_by_id("view-other-showcase-pages-dialog").click()
-            WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.ID, 'dialog')))
-
-            showcase_pages = driver.find_elements_by_class_name("company-showcase-pages")[1]
-            for showcase_company in showcase_pages.find_elements_by_tag_name("li"):
-                name_elem = showcase_company.find_element_by_class_name("name")
-                companySummary = CompanySummary(
-                    linkedin_url = name_elem.find_element_by_tag_name("a").get_attribute("href"),
-                    name = name_elem.text.strip(),
-                    followers = showcase_company.text.strip().split("\n")[1]
-                )
-                self.showcase_pages.append(companySummary)
-            driver.find_element_by_class_name("dialog-close").click()
-        except:
-            pass
-
-        # affiliated company
-        try:
-            affiliated_pages = driver.find_element_by_class_name("affiliated-companies")
-            for i, affiliated_page in enumerate(affiliated_pages.find_elements_by_class_name("affiliated-company-name")):
-                if i % 3 == 0:
-                    affiliated_pages.find_element_by_class_name("carousel-control-next").click()
-
-                companySummary = CompanySummary(
-                    linkedin_url = affiliated_page.find_element_by_tag_name("a").get_attribute("href"),
-                    name = affiliated_page.text.strip()
-                )
-                self.affiliated_companies.append(companySummary)
-        except:
-            pass
+        with self.phase("page_load"):
+            while self.is_signed_in() and retry_times <= retry_limit:
+                self.backoff.sleep(retry_times)
+                self.load_page(self.linkedin_url)
+                retry_times = retry_times + 1
+
+        # the showcase list is only rendered once its dialog is open
+        with self.phase("showcase"):
+            try:
+                driver.find_element_by_id("view-other-showcase-pages-dialog").click()
+                WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.ID, 'dialog')))
+            except TimeoutException:
+                self.count_timeout()
+            except:
+                pass
+
+        with self.phase("parse"):
+            if use_js:
+                self.extract(logged_in = False)
+                if self.snapshots is not None:
+                    self.snapshot("company", driver.page_source, logged_in = False)
+            else:
+                page_source = driver.page_source
+                self.snapshot("company", page_source, logged_in = False)
+                self.parse(page_source, logged_in = False)
 
         if get_employees:
-            self.employees = self.get_employees()
+            with self.phase("employees"):
+                self.employees = self.get_employees()
 
-        driver.get(self.linkedin_url)
+        self.load_page(self.linkedin_url)
 
         if close_on_complete:
-            driver.close()
+            self.close_driver()
+
+    def to_dict(self):
+        record = {
+            "linkedin_url": self.linkedin_url,
+            "name": self.name,
+            "about_us": self.about_us,
+            "website": self.website,
+            "industry": self.industry,
+            "headquarters": self.headquarters,
+            "founded": self.founded,
+            "company_type": self.company_type,
+            "company_size": self.company_size,
+            "specialties": self.specialties,
+            "showcase_pages": [summary.to_dict() for summary in self.showcase_pages],
+            "affiliated_companies": [summary.to_dict() for summary in self.affiliated_companies],
+        }
+        if hasattr(self, "employees"):
+            record["employees"] = [
+                {"linkedin_url": employee.linkedin_url, "name": employee.name}
+                for employee in self.employees if employee is not None
+            ]
+        return record
 
     def __repr__(self):
         return """
@@ -0,0 +1,149 @@
+from array import array
+import sys
+import threading
+from .objects import Institution
+from .urls import canonical_url
+
+def _get(entry, field):
+    if isinstance(entry, dict):
+        return entry.get(field)
+    return getattr(entry, field, None)
+
+def _set(entry, field, value):
+    if isinstance(entry, dict):
+        entry[field] = value
+    else:
+        setattr(entry, field, value)
+
+class InternTable(object):
+
+    def __init__(self):
+        # each distinct string is held once, and rows refer to it by its index
+        self._ids = {}
+        self._values = []
+        self._lock = threading.Lock()
+
+    def id(self, value):
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        found = self._ids.get(value)
+        if found is None:
+            with self._lock:
+                found = self._ids.get(value)
+                if found is None:
+                    value = sys.intern(value)
+                    found = self._ids[value] = len(self._values)
+                    self._values.append(value)
+        return found
+
+    def get(self, value):
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return self._ids.get(value)
+
+    def value(self, id):
+        return self._values[id] if id is not None else None
+
+    def __contains__(self, value):
+        return self.get(value) is not None
+
+    def __len__(self):
+        return len(self._values)
+
+class EntityIndex(object):
+
+    def __init__(self):
+        self.names = InternTable()
+        self.urls = InternTable()
+        # company records by url id, so each company is scraped once and joined to every position there
+        self.companies = {}
+        self._name_url = {}
+        self._url_names = {}
+        # person url ids by the company they worked at, or by name for positions without a company url
+        self._by_url = {}
+        self._by_name = {}
+        self._lock = threading.Lock()
+
+    def __url_id(self, url):
+        return self.urls.id(canonical_url(url)) if url else None
+
+    def __link(self, name_id, url_id):
+        if name_id is not None and url_id is not None and name_id not in self._name_url:
+            self._name_url[name_id] = url_id
+            self._url_names.setdefault(url_id, set()).add(name_id)
+
+    def add_person(self, person):
+        # interns the institutions of a Person or a person record, and files it under each of them
+        person_id = self.__url_id(_get(person, "linkedin_url"))
+        with self._lock:
+            for experience in _get(person, "experiences") or []:
+                name_id = self.names.id(_get(experience, "institution_name"))
+                if name_id is not None:
+                    _set(experience, "institution_name", self.names.value(name_id))
+                url_id = self.__url_id(_get(experience, "institution_url"))
+                self.__link(name_id, url_id)
+                if url_id is None:
+                    url_id = self._name_url.get(name_id)
+                _set(experience, "institution_id", url_id)
+
+                if person_id is None:
+                    continue
+                if url_id is not None:
+                    self._by_url.setdefault(url_id, array("I")).append(person_id)
+                elif name_id is not None:
+                    self._by_name.setdefault(name_id, array("I")).append(person_id)
+            for education in _get(person, "educations") or []:
+                name_id = self.names.id(_get(education, "institution_name"))
+                if name_id is not None:
+                    _set(education, "institution_name", self.names.value(name_id))
+        return person_id
+
+    def add_company(self, company):
+        url_id = self.__url_id(_get(company, "linkedin_url"))
+        if url_id is None:
+            raise ValueError("a company needs a linkedin_url to be indexed")
+        with self._lock:
+            self.companies[url_id] = company
+            self.__link(self.names.id(_get(company, "name")), url_id)
+        return url_id
+
+    def __resolve(self, company):
+        # a Company, a company record, a company url or an institution name
+        if not isinstance(company, str):
+            company = _get(company, "linkedin_url")
+        if "/" in company:
+            return self.urls.get(canonical_url(company)), None
+        name_id = self.names.get(company)
+        return self._name_url.get(name_id), name_id
+
+    def employees_of(self, company):
+        url_id, name_id = self.__resolve(company)
+        name_ids = set(self._url_names.get(url_id, ())) if url_id is not None else set([name_id])
+        ids = set(self._by_url.get(url_id, ()))
+        for name_id in name_ids:
+            ids.update(self._by_name.get(name_id, ()))
+        return [self.urls.value(id) for id in sorted(ids)]
+
+    def company_of(self, experience):
+        url_id = _get(experience, "institution_id")
+        if url_id is None:
+            url_id = self.__url_id(_get(experience, "institution_url"))
+        if url_id is None:
+            url_id = self._name_url.get(self.names.get(_get(experience, "institution_name")))
+        return self.companies.get(url_id)
+
+    def institution(self, experience):
+        # the Institution fields of a position, filled in from its scraped company
+        company = self.company_of(experience)
+        if company is None:
+            return None
+        return Institution(name=_get(company, "name"), website=_get(company, "website"), industry=_get(company, "industry"),
+                           type=_get(company, "company_type"), headquarters=_get(company, "headquarters"),
+                           company_size=_get(company, "company_size"), founded=_get(company, "founded"),
+                           institution_name=_get(experience, "institution_name"))
+
+    def unscraped_companies(self):
+        # company urls that positions point at but that have not been added yet
+        return [self.urls.value(url_id) for url_id in sorted(self._by_url) if url_id not in self.companies]
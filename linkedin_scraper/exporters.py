@@ -0,0 +1,145 @@
+import json
+import os
+
+def _record(scraped):
+    if isinstance(scraped, dict):
+        return scraped
+    return scraped.to_dict()
+
+class NDJSONWriter(object):
+
+    def __init__(self, path, batch_size=1000, mode="a"):
+        self.batch_size = batch_size
+        self.rows = 0
+        self._buffer = []
+        if hasattr(path, "write"):
+            self._file, self._owned = path, False
+        else:
+            self._file, self._owned = open(path, mode, encoding="utf-8"), True
+
+    def write(self, scraped):
+        self._buffer.append(json.dumps(_record(scraped), ensure_ascii=False))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_all(self, scraped):
+        for item in scraped:
+            self.write(item)
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self.rows += len(self._buffer)
+            self._buffer = []
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        if self._owned:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _schemas(pa):
+    string = pa.string()
+    summary = pa.list_(pa.struct([("linkedin_url", string), ("name", string), ("followers", string)]))
+    return {
+        "people": pa.schema([
+            ("linkedin_url", string), ("name", string), ("location", string),
+            ("interests", pa.list_(string)),
+            ("accomplishments", pa.list_(pa.struct([("category", string), ("title", string)]))),
+            ("also_viewed_urls", pa.list_(string)),
+        ]),
+        "experiences": pa.schema([
+            ("linkedin_url", string), ("position", pa.int32()), ("institution_name", string),
+            ("institution_url", string), ("position_title", string), ("from_date", string), ("to_date", string),
+            ("duration", string), ("location", string), ("description", string),
+        ]),
+        "educations": pa.schema([
+            ("linkedin_url", string), ("position", pa.int32()), ("institution_name", string),
+            ("degree", string), ("from_date", string), ("to_date", string), ("description", string),
+        ]),
+        "companies": pa.schema([
+            ("linkedin_url", string), ("name", string), ("about_us", string), ("website", string),
+            ("industry", string), ("headquarters", string), ("founded", string), ("company_type", string),
+            ("company_size", string), ("specialties", string),
+            ("showcase_pages", summary), ("affiliated_companies", summary),
+        ]),
+        "employees": pa.schema([
+            ("company_url", string), ("linkedin_url", string), ("name", string),
+        ]),
+    }
+
+class ParquetWriter(object):
+
+    def __init__(self, directory, batch_size=10000, compression="snappy"):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("ParquetWriter requires pyarrow, install it with `pip install pyarrow`")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.directory = directory
+        self.batch_size = batch_size
+        self.compression = compression
+        self.rows = dict()
+        self._schemas = _schemas(pyarrow)
+        self._buffers = dict((table, []) for table in self._schemas)
+        self._writers = dict()
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, scraped):
+        record = _record(scraped)
+        url = record.get("linkedin_url")
+        if "experiences" in record or "educations" in record:
+            self.__append("people", dict(record, interests=[interest["title"] for interest in record.get("interests", [])]))
+            for i, experience in enumerate(record.get("experiences", [])):
+                self.__append("experiences", dict(experience, linkedin_url=url, position=i))
+            for i, education in enumerate(record.get("educations", [])):
+                self.__append("educations", dict(education, linkedin_url=url, position=i))
+        else:
+            self.__append("companies", record)
+            for employee in record.get("employees", []):
+                self.__append("employees", dict(employee, company_url=url))
+
+    def write_all(self, scraped):
+        for item in scraped:
+            self.write(item)
+
+    def flush(self):
+        for table in self._buffers:
+            self.__flush(table)
+
+    def close(self):
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __append(self, table, row):
+        buffer = self._buffers[table]
+        buffer.append(dict((field, row.get(field)) for field in self._schemas[table].names))
+        if len(buffer) >= self.batch_size:
+            self.__flush(table)
+
+    def __flush(self, table):
+        buffer = self._buffers[table]
+        if not buffer:
+            return
+        if table not in self._writers:
+            path = os.path.join(self.directory, table + ".parquet")
+            self._writers[table] = self._pq.ParquetWriter(path, self._schemas[table], compression=self.compression)
+        self._writers[table].write_table(self._pa.Table.from_pylist(buffer, schema=self._schemas[table]))
+        self.rows[table] = self.rows.get(table, 0) + len(buffer)
+        self._buffers[table] = []
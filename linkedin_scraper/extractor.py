@@ -0,0 +1,314 @@
+from urllib.parse import urljoin
+from .objects import Experience, Education, Interest, Accomplishment, CompanySummary
+from .normalize import split_range
+from .urls import canonical_url
+from . import selectors
+import sys
+
+# runs a plan of layout xpaths in the page in one call. a step is [key, xpath, values, children],
+# and each node it finds comes back with the values asked for and the results of its children
+EXTRACT_SCRIPT = """
+function text(node) {
+    return (node.textContent || "").split(/\\s+/).filter(function (t) { return t.length > 0; }).join(" ");
+}
+function lines(node) {
+    var texts = document.evaluate(".//text()", node, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), found = [];
+    for (var i = 0; i < texts.snapshotLength; i++) {
+        var line = text(texts.snapshotItem(i));
+        if (line.length > 0) { found.push(line); }
+    }
+    return found;
+}
+function href(node) {
+    var a = node.tagName === "A" ? node : node.getElementsByTagName("a")[0];
+    return a && a.getAttribute("href") !== null ? a.href : null;
+}
+var values = {text: text, lines: lines, href: href};
+function run(root, plan) {
+    var results = {};
+    plan.forEach(function (step) {
+        var nodes = document.evaluate(step[1], root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), found = [];
+        for (var i = 0; i < nodes.snapshotLength; i++) {
+            var node = nodes.snapshotItem(i), item = run(node, step[3]);
+            step[2].forEach(function (name) { item[name] = values[name](node); });
+            found.push(item);
+        }
+        results[step[0]] = found;
+    });
+    return results;
+}
+return run(document, arguments[0]);
+"""
+
+def _text(node):
+    return " ".join(node.text_content().split())
+
+def _lines(node):
+    return [line for line in (" ".join(text.split()) for text in node.xpath(".//text()")) if line]
+
+def _href(node, base_url):
+    link = node if node.tag == "a" else next(iter(node.xpath(".//a")), None)
+    if link is None or link.get("href") is None:
+        return None
+    return urljoin(base_url, link.get("href"))
+
+def run_plan(tree, plan, base_url=None):
+    # the python twin of EXTRACT_SCRIPT, over an lxml tree
+    base_url = base_url or "https://www.linkedin.com/"
+    values = {"text": _text, "lines": _lines, "href": lambda node: _href(node, base_url)}
+    results = {}
+    for key, path, names, children in plan:
+        found = []
+        for node in tree.xpath(path):
+            item = run_plan(node, children, base_url)
+            for name in names:
+                item[name] = values[name](node)
+            found.append(item)
+        results[key] = found
+    return results
+
+def step(layout, key, values=("text",), children=()):
+    return [key, layout.xpath(key), list(values), list(children)]
+
+def person_plan(layout):
+    if layout.kind == "person_public":
+        return [
+            step(layout, "name"),
+            step(layout, "experience_section", (), [
+                step(layout, "position", (), [
+                    step(layout, "position_title"),
+                    step(layout, "company"),
+                    step(layout, "position_link", ("href",)),
+                    step(layout, "duration", (), [step(layout, "start_date"), step(layout, "end_date")]),
+                    step(layout, "duration_text"),
+                    step(layout, "position_location"),
+                ]),
+            ]),
+            step(layout, "education_section", (), [
+                step(layout, "school", (), [
+                    step(layout, "school_name"),
+                    step(layout, "degree"),
+                    step(layout, "dates", (), [step(layout, "start_date"), step(layout, "end_date")]),
+                ]),
+            ]),
+            step(layout, "also_viewed", ("href",)),
+        ]
+    spans = [step(layout, "spans")]
+    return [
+        step(layout, "name"),
+        step(layout, "location"),
+        step(layout, "experience_section", (), [
+            step(layout, "position", (), [
+                step(layout, "position_title"),
+                step(layout, "position_link", ("href",)),
+                step(layout, "position_lines"),
+                step(layout, "position_facts", (), spans),
+            ]),
+        ]),
+        step(layout, "education_section", (), [
+            step(layout, "school", (), [
+                step(layout, "school_name"),
+                step(layout, "degree", (), spans),
+                step(layout, "dates", (), spans),
+            ]),
+        ]),
+        step(layout, "interests_section", (), [
+            step(layout, "interest", (), [step(layout, "interest_title")]),
+        ]),
+        step(layout, "accomplishments_section", (), [
+            step(layout, "accomplishment_block", (), [
+                step(layout, "accomplishment_category"),
+                step(layout, "accomplishment_title"),
+            ]),
+        ]),
+        step(layout, "also_viewed", ("href",)),
+    ]
+
+def company_plan(layout):
+    if layout.kind == "company_public":
+        return [step(layout, key) for key in ("name", "about", "headquarters", "industry", "company_size")] + [
+            step(layout, key, ("lines",)) for key in ("specialties", "website", "company_type", "founded")] + [
+            step(layout, "showcase", (), [
+                step(layout, "showcase_item", ("lines",), [step(layout, "showcase_name", ("text", "href"))]),
+            ]),
+            step(layout, "affiliated", (), [step(layout, "affiliated_name", ("text", "href"))]),
+        ]
+    return [
+        step(layout, "name"),
+        step(layout, "about", (), [step(layout, "about_text"), step(layout, "about_values")]),
+        step(layout, "company_list", (), [
+            step(layout, "card", (), [step(layout, "card_link", ("text", "href")), step(layout, "card_followers")]),
+        ]),
+    ]
+
+def _first(items, name="text"):
+    return items[0][name] if items else None
+
+def _nth(items, i, name="text"):
+    # the value at index i, or IndexError like the parser's lookups
+    return items[i][name]
+
+def _name(value):
+    return sys.intern(value) if value is not None else None
+
+def _company_url(links):
+    url = _first(links, "href")
+    return canonical_url(url) if url is not None else None
+
+def _profile_links(links):
+    urls = []
+    for link in links:
+        if link["href"] not in urls:
+            urls.append(link["href"])
+    return urls
+
+def _under_subtitle(items):
+    return "\n".join(items[0]["lines"][1:]) if items else None
+
+def person_fields(data, logged_in=True):
+    fields = {"name": _first(data["name"]), "experiences": [], "educations": []}
+    if logged_in:
+        fields["location"] = _first(data["location"])
+        fields["interests"] = []
+        fields["accomplishments"] = []
+
+    for section in data["experience_section"]:
+        for position in section["position"]:
+            if logged_in:
+                try:
+                    company = _name(_nth(position["position_lines"], 1))
+                    facts = position["position_facts"]
+                    from_date, to_date = split_range(_nth(facts[0]["spans"], 1))
+                    duration = _nth(facts[1]["spans"], 1)
+                    location = _nth(facts[2]["spans"], 1)
+                except IndexError:
+                    company = None
+                    from_date, to_date, duration, location = (None, None, None, None)
+                title = _first(position["position_title"]) or ""
+            else:
+                times = position["duration"]
+                from_date = _first(times[0]["start_date"]) if times else None
+                if from_date is None:
+                    to_date, duration, location = (None, None, None)
+                else:
+                    to_date = _first(times[0]["end_date"]) or "Present"
+                    duration = _first(position["duration_text"])
+                    location = _first(position["position_location"])
+                company = _name(_first(position["company"]))
+                title = _first(position["position_title"])
+            experience = Experience(position_title=title, from_date=from_date,
+                                    to_date=to_date, duration=duration, location=location)
+            experience.institution_name = company
+            experience.institution_url = _company_url(position["position_link"])
+            fields["experiences"].append(experience)
+
+    for section in data["education_section"]:
+        for school in section["school"]:
+            if logged_in:
+                try:
+                    degree = _nth(school["degree"][0]["spans"], 1)
+                    from_date, to_date = split_range(_nth(school["dates"][0]["spans"], 1))
+                except IndexError:
+                    degree = None
+                    from_date, to_date = (None, None)
+                university = _name(_first(school["school_name"])) or ""
+            else:
+                times = school["dates"]
+                from_date, to_date = (None, None)
+                if times:
+                    from_date = _first(times[0]["start_date"])
+                    to_date = _first(times[0]["end_date"])
+                degree = _first(school["degree"])
+                university = _name(_first(school["school_name"]))
+            education = Education(from_date=from_date, to_date=to_date, degree=degree)
+            education.institution_name = university
+            fields["educations"].append(education)
+
+    for section in data.get("interests_section", []):
+        for interest in section["interest"]:
+            title = _first(interest["interest_title"])
+            if title is not None:
+                fields["interests"].append(Interest(title))
+
+    for section in data.get("accomplishments_section", []):
+        for block in section["accomplishment_block"]:
+            category = _first(block["accomplishment_category"])
+            for title in block["accomplishment_title"]:
+                fields["accomplishments"].append(Accomplishment(category, title["text"]))
+
+    fields["also_viewed_urls"] = _profile_links(data["also_viewed"])
+    return fields
+
+def _cards(company_list):
+    return [CompanySummary(linkedin_url = _first(card["card_link"], "href"), name = _first(card["card_link"]),
+                           followers = _first(card["card_followers"])) for card in company_list["card"]]
+
+def company_fields(data, logged_in=True):
+    fields = {"name": _first(data["name"]), "showcase_pages": [], "affiliated_companies": []}
+    if logged_in:
+        if data["about"]:
+            grid = data["about"][0]
+            fields["about_us"] = _first(grid["about_text"])
+            values = [value["text"] for value in grid["about_values"]]
+            if len(values) > 5:
+                fields["specialties"] = "\n".join(values[-1].split(", "))
+                fields["website"] = values[0]
+                fields["headquarters"] = values[5]
+                fields["industry"] = values[2]
+                fields["company_size"] = values[3]
+        if len(data["company_list"]) == 2:
+            showcase, affiliated = data["company_list"]
+            fields["showcase_pages"] = _cards(showcase)
+            fields["affiliated_companies"] = _cards(affiliated)
+        return fields
+
+    fields["about_us"] = _first(data["about"])
+    for key in ("headquarters", "industry", "company_size"):
+        fields[key] = _first(data[key])
+    for key in ("specialties", "website", "company_type", "founded"):
+        fields[key] = _under_subtitle(data[key])
+    if len(data["showcase"]) > 1:
+        for item in data["showcase"][1]["showcase_item"]:
+            lines = item["lines"]
+            fields["showcase_pages"].append(CompanySummary(
+                linkedin_url = _first(item["showcase_name"], "href"),
+                name = _first(item["showcase_name"]),
+                followers = lines[1] if len(lines) > 1 else None
+            ))
+    for section in data["affiliated"]:
+        for page in section["affiliated_name"]:
+            fields["affiliated_companies"].append(CompanySummary(linkedin_url = page["href"], name = page["text"]))
+    return fields
+
+# fingerprints the text of each section, see parser.fingerprint for the python twin
+FINGERPRINT_SCRIPT = """
+var sections = arguments[0], fingerprints = {};
+function fnv(s) {
+    var h = 0x811c9dc5;
+    for (var i = 0; i < s.length; i++) {
+        h = Math.imul(h ^ s.charCodeAt(i), 0x01000193) >>> 0;
+    }
+    return ("0000000" + h.toString(16)).slice(-8);
+}
+for (var name in sections) {
+    var nodes = document.evaluate(sections[name], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), texts = [];
+    for (var i = 0; i < nodes.snapshotLength; i++) { texts.push(nodes.snapshotItem(i).textContent); }
+    fingerprints[name] = texts.length ? fnv(texts.join(" ").split(/\\s+/).filter(function (t) { return t.length > 0; }).join(" ")) : null;
+}
+return fingerprints;
+"""
+
+def fingerprint_sections(driver, sections):
+    return driver.execute_script(FINGERPRINT_SCRIPT, dict(sections))
+
+def _in_page(driver, kind, layout):
+    # the layout the selectors come from, detected in the same page when the scrape has not done so
+    return layout if layout is not None else selectors.detect_in_page(driver, kind)
+
+def extract_person(driver, logged_in=True, layout=None):
+    layout = _in_page(driver, "person" if logged_in else "person_public", layout)
+    return person_fields(driver.execute_script(EXTRACT_SCRIPT, person_plan(layout)), logged_in=logged_in)
+
+def extract_company(driver, logged_in=True, layout=None):
+    layout = _in_page(driver, "company" if logged_in else "company_public", layout)
+    return company_fields(driver.execute_script(EXTRACT_SCRIPT, company_plan(layout)), logged_in=logged_in)
@@ -0,0 +1,212 @@
+from collections import namedtuple
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from .cache import cache_key
+from .urls import canonical_url
+from .batch import scrape_many
+
+FrontierItem = namedtuple("FrontierItem", ["url", "kind", "depth"])
+
+QUEUED, LEASED, DONE, FAILED = range(4)
+
+class BloomFilter(object):
+
+    def __init__(self, capacity=10000000, error_rate=0.01):
+        # standard sizing: m = -n ln p / (ln 2)^2 bits and k = m / n ln 2 hashes
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, int(round(self.bits / float(capacity) * math.log(2))))
+        self.array = bytearray((self.bits + 7) // 8)
+
+    def __indexes(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, key):
+        for index in self.__indexes(key):
+            self.array[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, key):
+        return all(self.array[index >> 3] & (1 << (index & 7)) for index in self.__indexes(key))
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.array)
+        os.replace(tmp, path)
+
+    def load(self, path):
+        with open(path, "rb") as f:
+            array = bytearray(f.read())
+        if len(array) != len(self.array):
+            return False
+        self.array = array
+        return True
+
+class Frontier(object):
+
+    def __init__(self, path="frontier.sqlite", capacity=10000000, error_rate=0.01, max_attempts=3,
+                 checkpoint_every=1000, checkpoint_interval=30):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.duplicates = 0
+        self._pending = 0
+        self._checkpointed_at = time.time()
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS frontier ("
+            "key TEXT PRIMARY KEY, url TEXT, kind TEXT, depth INTEGER, priority REAL, "
+            "state INTEGER, attempts INTEGER, updated_at REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS frontier_queue ON frontier (state, priority)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS frontier_meta (name TEXT PRIMARY KEY, value INTEGER)")
+        # anything leased when the last run died was never finished
+        self._db.execute("UPDATE frontier SET state = ? WHERE state = ?", (QUEUED, LEASED))
+        self._db.commit()
+
+        # the bloom filter answers "never seen" in memory, the table is the exact index behind it
+        # the saved filter covers the rows up to the last checkpoint, the ones committed since are added back
+        self.seen = BloomFilter(capacity, error_rate)
+        since = 0
+        if os.path.exists(self.__bloom_path()) and self.seen.load(self.__bloom_path()):
+            row = self._db.execute("SELECT value FROM frontier_meta WHERE name = 'bloom_rowid'").fetchone()
+            since = row[0] if row is not None else 0
+        for (key,) in self._db.execute("SELECT key FROM frontier WHERE rowid > ?", (since,)):
+            self.seen.add(key)
+
+    def __bloom_path(self):
+        return self.path + ".bloom"
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM frontier WHERE state IN (?, ?)", (QUEUED, LEASED)).fetchone()[0]
+
+    def __contains__(self, url):
+        key = cache_key(url)
+        if key not in self.seen:
+            return False
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM frontier WHERE key = ?", (key,)).fetchone() is not None
+
+    def push(self, url, kind="person", depth=0, priority=None):
+        url = canonical_url(url)
+        key = cache_key(url)
+        with self._lock:
+            if key in self.seen and self._db.execute("SELECT 1 FROM frontier WHERE key = ?", (key,)).fetchone() is not None:
+                self.duplicates += 1
+                return False
+            # shallower urls first unless told otherwise
+            self._db.execute(
+                "INSERT OR IGNORE INTO frontier (key, url, kind, depth, priority, state, attempts, updated_at) VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+                (key, url, kind, depth, -depth if priority is None else priority, QUEUED, time.time()))
+            self.seen.add(key)
+            self.__touch()
+            return True
+
+    def seed(self, urls, kind="person", priority=None):
+        return sum(self.push(url, kind=kind, priority=priority) for url in urls)
+
+    def pop(self, count=1, kind=None):
+        with self._lock:
+            query = "SELECT key, url, kind, depth FROM frontier WHERE state = ?"
+            args = [QUEUED]
+            if kind is not None:
+                query += " AND kind = ?"
+                args.append(kind)
+            rows = self._db.execute(query + " ORDER BY priority DESC, rowid LIMIT ?", args + [count]).fetchall()
+            self._db.executemany("UPDATE frontier SET state = ?, updated_at = ? WHERE key = ?",
+                                 [(LEASED, time.time(), row[0]) for row in rows])
+            self.__touch(len(rows))
+            return [FrontierItem(url, kind, depth) for _, url, kind, depth in rows]
+
+    def done(self, url):
+        # outcomes are committed at once, pushes are only batched until the next commit
+        with self._lock:
+            self._db.execute("UPDATE frontier SET state = ?, updated_at = ? WHERE key = ?", (DONE, time.time(), cache_key(url)))
+            self._db.commit()
+
+    def failed(self, url):
+        # requeued until it has failed max_attempts times
+        with self._lock:
+            self._db.execute(
+                "UPDATE frontier SET attempts = attempts + 1, updated_at = ?, "
+                "state = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END WHERE key = ?",
+                (time.time(), self.max_attempts, FAILED, QUEUED, cache_key(url)))
+            self._db.commit()
+
+    def expand(self, record, depth):
+        # people also viewed and company employees are the edges of the crawl graph
+        if not isinstance(record, dict):
+            record = record.to_dict()
+        added = 0
+        for url in record.get("also_viewed_urls", []):
+            added += self.push(url, kind="person", depth=depth + 1)
+        for employee in record.get("employees", []):
+            if employee.get("linkedin_url"):
+                added += self.push(employee["linkedin_url"], kind="person", depth=depth + 1)
+        return added
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._db.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state").fetchall())
+        return {"queued": counts.get(QUEUED, 0), "leased": counts.get(LEASED, 0), "done": counts.get(DONE, 0),
+                "failed": counts.get(FAILED, 0), "duplicates": self.duplicates}
+
+    def checkpoint(self):
+        with self._lock:
+            # rows committed after the filter was saved are added back when the frontier is opened
+            rowid = self._db.execute("SELECT COALESCE(MAX(rowid), 0) FROM frontier").fetchone()[0]
+            self.seen.save(self.__bloom_path())
+            self._db.execute("INSERT OR REPLACE INTO frontier_meta (name, value) VALUES ('bloom_rowid', ?)", (rowid,))
+            self._db.commit()
+            self._pending = 0
+            self._checkpointed_at = time.time()
+
+    def close(self):
+        self.checkpoint()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __touch(self, changes=1):
+        self._pending += changes
+        if self._pending >= self.checkpoint_every or time.time() - self._checkpointed_at >= self.checkpoint_interval:
+            self.checkpoint()
+
+def _drain(frontier, kind, depths, batch_size):
+    while True:
+        items = frontier.pop(batch_size, kind=kind)
+        if not items:
+            return
+        for item in items:
+            depths[item.url] = item.depth
+            yield item.url
+
+def crawl(frontier, max_depth=1, batch_size=100, **kwargs):
+    # each round scrapes everything queued so far, kind by kind, and queues what it discovers
+    while len(frontier):
+        for kind in ("company", "person"):
+            depths = {}
+            for result in scrape_many(_drain(frontier, kind, depths, batch_size), kind=kind, **kwargs):
+                depth = depths.pop(result.url)
+                if result.error is None:
+                    # expanded first, so the urls a record queued are committed along with it being done
+                    if depth < max_depth:
+                        frontier.expand(result.record, depth)
+                    frontier.done(result.url)
+                else:
+                    frontier.failed(result.url)
+                yield result
+        frontier.checkpoint()
@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("linkedin_scraper")
+
+class ScrapeMetrics(object):
+
+    def __init__(self, kind, url, sink):
+        self.kind = kind
+        self.url = url
+        self.sink = sink
+        self.current = "other"
+        self.phases = OrderedDict()
+
+    def stats(self, phase):
+        if phase not in self.phases:
+            self.phases[phase] = {"seconds": 0.0, "commands": 0, "timeouts": 0}
+        return self.phases[phase]
+
+    @contextmanager
+    def phase(self, name):
+        previous, self.current = self.current, name
+        stats = self.stats(name)
+        start = time.time()
+        try:
+            yield stats
+        finally:
+            stats["seconds"] += time.time() - start
+            self.current = previous
+
+    def command(self, name):
+        self.stats(self.current)["commands"] += 1
+
+    def timeout(self):
+        self.stats(self.current)["timeouts"] += 1
+
+    def emit(self):
+        self.sink.emit(self)
+        self.phases = OrderedDict()
+
+_MISSING = object()
+
+def attach(driver, metrics):
+    # every WebDriver command of a driver and of its elements goes through driver.execute
+    if not hasattr(driver, "execute"):
+        return
+    if getattr(driver, "_scrape_metrics", None) is None:
+        # whatever the instance itself held, so detach can put it back
+        driver._scrape_shadowed = vars(driver).get("execute", _MISSING)
+        execute = driver.execute
+
+        def counted(command, params=None):
+            if driver._scrape_metrics is not None:
+                driver._scrape_metrics.command(command)
+            return execute(command, params)
+
+        driver.execute = counted
+    driver._scrape_metrics = metrics
+
+def detach(driver, metrics):
+    # a pooled driver outlives the scrape, so it must stop counting into its metrics
+    if driver is None or getattr(driver, "_scrape_metrics", None) is not metrics:
+        return
+    shadowed = driver._scrape_shadowed
+    if shadowed is _MISSING:
+        del driver.execute
+    else:
+        driver.execute = shadowed
+    driver._scrape_metrics = None
+    del driver._scrape_shadowed
+
+class LoggingSink(object):
+
+    def __init__(self, logger=logger, level=logging.INFO):
+        self.logger = logger
+        self.level = level
+
+    def emit(self, metrics):
+        self.logger.log(self.level, "scraped %s %s: %s", metrics.kind, metrics.url, ", ".join(
+            "{} {:.3f}s {} commands {} timeouts".format(phase, stats["seconds"], stats["commands"], stats["timeouts"])
+            for phase, stats in metrics.phases.items()))
+
+class PrometheusSink(object):
+
+    def __init__(self, prefix="linkedin_scraper"):
+        self.prefix = prefix
+        self.scrapes = OrderedDict()
+        self.totals = OrderedDict()
+        self._lock = threading.Lock()
+
+    def emit(self, metrics):
+        with self._lock:
+            self.scrapes[metrics.kind] = self.scrapes.get(metrics.kind, 0) + 1
+            for phase, stats in metrics.phases.items():
+                totals = self.totals.setdefault((metrics.kind, phase), {"seconds": 0.0, "commands": 0, "timeouts": 0})
+                for key, value in stats.items():
+                    totals[key] += value
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines.append("# HELP {}_scrapes_total Completed scrapes.".format(self.prefix))
+            lines.append("# TYPE {}_scrapes_total counter".format(self.prefix))
+            for kind, count in self.scrapes.items():
+                lines.append('{}_scrapes_total{{kind="{}"}} {}'.format(self.prefix, kind, count))
+            for key, help in (("seconds", "Time spent in each scrape phase."),
+                              ("commands", "WebDriver commands sent in each scrape phase."),
+                              ("timeouts", "WebDriverWait timeouts in each scrape phase.")):
+                name = "{}_phase_{}_total".format(self.prefix, key)
+                lines.append("# HELP {} {}".format(name, help))
+                lines.append("# TYPE {} counter".format(name))
+                for (kind, phase), totals in self.totals.items():
+                    lines.append('{}{{kind="{}",phase="{}"}} {}'.format(name, kind, phase, totals[key]))
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        # for the node_exporter textfile collector, which expects atomic replaces
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
@@ -0,0 +1,133 @@
+from functools import lru_cache
+import datetime
+import re
+
+# month offsets count months since January of year 0, so year * 12 + month - 1
+MISSING = -1
+PRESENT = -2
+
+_MONTHS = dict((name, i) for i, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")))
+_RANGE = re.compile(r"\s+[–—-]\s+|\s*[–—]\s*")
+_DURATION = re.compile(r"(\d+)\s*(yr|year|mo|month)", re.I)
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("normalize requires numpy, install it with `pip install numpy`")
+    return numpy
+
+def split_range(text):
+    # "Jan 2015 – Mar 2018", "2010 – 2014" or "Jan 2015 – Present" into its two ends
+    if not text:
+        return (None, None)
+    ends = _RANGE.split(text.strip(), 1)
+    return (ends[0] or None, ends[1] if len(ends) > 1 and ends[1] else None)
+
+@lru_cache(maxsize=65536)
+def month_offset(text):
+    if not text:
+        return MISSING
+    tokens = text.lower().replace(",", " ").split()
+    if tokens == ["present"]:
+        return PRESENT
+    if len(tokens) == 1 and tokens[0].isdigit():
+        return int(tokens[0]) * 12
+    if len(tokens) == 2 and tokens[0][:3] in _MONTHS and tokens[1].isdigit():
+        return int(tokens[1]) * 12 + _MONTHS[tokens[0][:3]]
+    return MISSING
+
+@lru_cache(maxsize=65536)
+def duration_months(text):
+    # "2 yrs 3 mos", "1 yr", "5 mos" or "less than a year"
+    if not text:
+        return MISSING
+    months = 0
+    found = False
+    for count, unit in _DURATION.findall(text):
+        months += int(count) * (12 if unit.lower().startswith("y") else 1)
+        found = True
+    if not found:
+        return 0 if "less than" in text.lower() else MISSING
+    return months
+
+def this_month(today=None):
+    today = today or datetime.date.today()
+    return today.year * 12 + today.month - 1
+
+def _column(np, values, parse, dtype):
+    # every distinct string is parsed once and the results are scattered back by index
+    if isinstance(values, np.ndarray):
+        uniques, inverse = np.unique(values.astype(str), return_inverse=True)
+        uniques = uniques.tolist()
+    else:
+        # hashing the python strings is several times faster than sorting them for np.unique
+        codes = {}
+        inverse = np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.intp)
+        uniques = list(codes)
+    table = np.fromiter((parse(value) if isinstance(value, str) else MISSING for value in uniques),
+                        dtype=dtype, count=len(uniques))
+    return table[inverse.reshape(-1)]
+
+def month_offsets(values, present=None):
+    np = _numpy()
+    offsets = _column(np, values, month_offset, np.int32)
+    if present is not None:
+        offsets[offsets == PRESENT] = present
+    return offsets
+
+def durations(values):
+    np = _numpy()
+    return _column(np, values, duration_months, np.int32)
+
+def tenure(from_months, to_months, fallback=None):
+    # inclusive of both ends, as linkedin counts it, with the stated duration where a date is missing
+    np = _numpy()
+    from_months = np.asarray(from_months)
+    to_months = np.asarray(to_months)
+    known = (from_months >= 0) & (to_months >= from_months)
+    months = np.where(known, to_months - from_months + 1, MISSING).astype(np.int32)
+    if fallback is not None:
+        months = np.where(known, months, np.asarray(fallback)).astype(np.int32)
+    return months
+
+def _records(scraped):
+    for item in scraped:
+        yield item if isinstance(item, dict) else item.to_dict()
+
+def _columns(scraped, key, fields):
+    columns = dict((field, []) for field in ("linkedin_url", "position") + fields)
+    for record in _records(scraped):
+        for i, entry in enumerate(record.get(key) or []):
+            columns["linkedin_url"].append(record.get("linkedin_url"))
+            columns["position"].append(i)
+            for field in fields:
+                columns[field].append(entry.get(field))
+    return columns
+
+def normalize_experiences(scraped, today=None):
+    np = _numpy()
+    columns = _columns(scraped, "experiences", ("from_date", "to_date", "duration"))
+    to_months = month_offsets(columns["to_date"])
+    current = to_months == PRESENT
+    to_months[current] = this_month(today)
+    from_months = month_offsets(columns["from_date"])
+    return {
+        "linkedin_url": np.asarray(columns["linkedin_url"], dtype=object),
+        "position": np.asarray(columns["position"], dtype=np.int32),
+        "from_month": from_months,
+        "to_month": to_months,
+        "current": current,
+        "tenure": tenure(from_months, to_months, fallback=durations(columns["duration"])),
+    }
+
+def normalize_educations(scraped, today=None):
+    np = _numpy()
+    columns = _columns(scraped, "educations", ("from_date", "to_date"))
+    return {
+        "linkedin_url": np.asarray(columns["linkedin_url"], dtype=object),
+        "position": np.asarray(columns["position"], dtype=np.int32),
+        "from_month": month_offsets(columns["from_date"]),
+        "to_month": month_offsets(columns["to_date"], present=this_month(today)),
+    }
@@ -1,13 +1,45 @@
-class Institution(object):
-    institution_name = None
-    website = None
-    industry = None
-    type = None
-    headquarters = None
-    company_size = None
-    founded = None
-
-    def __init__(self, name=None, website=None, industry=None, type=None, headquarters=None, company_size=None, founded=None):
+from contextlib import contextmanager
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+from .instrumentation import ScrapeMetrics, attach, detach
+from .retry import Backoff, Blocked, CircuitOpen, blocked_reason
+
+def _plain(value):
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    return value
+
+class Record(object):
+    __slots__ = ()
+    _fields = ()
+
+    def to_dict(self):
+        return dict((field, _plain(getattr(self, field))) for field in self._fields)
+
+    @classmethod
+    def from_dict(cls, record):
+        obj = cls()
+        for field in cls._fields:
+            setattr(obj, field, record.get(field))
+        return obj
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, field) == getattr(other, field) for field in self._fields)
+
+    def __ne__(self, other):
+        return not self == other
+
+    # defining __eq__ alone would leave records unhashable. the hash follows the fields,
+    # so a record must not be changed while it is in a set or used as a dict key
+    def __hash__(self):
+        return hash(tuple(getattr(self, field) for field in self._fields))
+
+class Institution(Record):
+    __slots__ = ("institution_name", "name", "website", "industry", "type", "headquarters", "company_size", "founded")
+    _fields = ("institution_name", "name", "website", "industry", "type", "headquarters", "company_size", "founded")
+
+    def __init__(self, name=None, website=None, industry=None, type=None, headquarters=None, company_size=None, founded=None, institution_name=None):
+        self.institution_name = institution_name
         self.name = name
         self.website = website
         self.industry = industry
@@ -16,14 +48,17 @@ class Institution(object):
         self.company_size = company_size
         self.founded = founded
 
-class Experience(Institution):
-    from_date = None
-    to_date = None
-    description = None
-    position_title = None
-    duration = None
+# entries only keep the name and url of their institution rather than carrying
+# the whole Institution record, which keeps every row down to its own fields.
+# institution_id is the company's id in an EntityIndex, see entities.py
+class Experience(Record):
+    __slots__ = ("institution_name", "institution_url", "institution_id", "from_date", "to_date", "description", "position_title", "duration", "location")
+    _fields = ("institution_name", "institution_url", "position_title", "from_date", "to_date", "duration", "location", "description")
 
-    def __init__(self, from_date = None, to_date = None, description = None, position_title = None, duration = None, location = None):
+    def __init__(self, from_date = None, to_date = None, description = None, position_title = None, duration = None, location = None, institution_name = None, institution_url = None):
+        self.institution_name = institution_name
+        self.institution_url = institution_url
+        self.institution_id = None
         self.from_date = from_date
         self.to_date = to_date
         self.description = description
@@ -34,13 +69,12 @@ class Experience(Institution):
     def __repr__(self):
         return "{position_title} at {company} from {from_date} to {to_date} for {duration} based at {location}".format( from_date = self.from_date, to_date = self.to_date, position_title = self.position_title, company = self.institution_name, duration = self.duration, location = self.location)
 
-class Education(Institution):
-    from_date = None
-    to_date = None
-    description = None
-    degree = None
+class Education(Record):
+    __slots__ = ("institution_name", "from_date", "to_date", "description", "degree")
+    _fields = ("institution_name", "degree", "from_date", "to_date", "description")
 
-    def __init__(self, from_date = None, to_date = None, description = None, degree = None):
+    def __init__(self, from_date = None, to_date = None, description = None, degree = None, institution_name = None):
+        self.institution_name = institution_name
         self.from_date = from_date
         self.to_date = to_date
         self.description = description
@@ -49,36 +83,201 @@ class Education(Institution):
     def __repr__(self):
         return "{degree} at {company} from {from_date} to {to_date}".format( from_date = self.from_date, to_date = self.to_date, degree = self.degree, company = self.institution_name)
 
-class Interest(Institution):
-    title = None
-    
+class Interest(Record):
+    __slots__ = ("title",)
+    _fields = ("title",)
+
     def __init__(self, title = None):
-        self.title = title.decode('utf-8')
-    
+        self.title = _plain(title)
+
     def __repr__(self):
         return self.title
 
-class Accomplishment(Institution):
-    category = None
-    title = None
-    
+class Accomplishment(Record):
+    __slots__ = ("category", "title")
+    _fields = ("category", "title")
+
     def __init__(self, category = None, title = None):
         self.category = category
         self.title = title
-    
+
     def __repr__(self):
         return self.category + ": " + self.title
 
+class CompanySummary(Record):
+    __slots__ = ("linkedin_url", "name", "followers")
+    _fields = ("linkedin_url", "name", "followers")
+
+    def __init__(self, linkedin_url = None, name = None, followers = None):
+        self.linkedin_url = linkedin_url
+        self.name = name
+        self.followers = followers
+
+    def __repr__(self):
+        if self.followers == None:
+            return """ {name} """.format(name = self.name)
+        else:
+            return """ {name} {followers} """.format(name = self.name, followers = self.followers)
+
+def _position_key(entry):
+    return (entry.get("institution_name"), entry.get("from_date"))
+
+class ProfileDiff(Record):
+    __slots__ = ("linkedin_url", "changed_sections", "changed_fields", "added_positions", "removed_positions",
+                 "title_changes", "added_educations", "removed_educations")
+    _fields = __slots__
+    # its fields are lists and dicts, so it is compared by value but not hashed
+    __hash__ = None
+
+    def __init__(self, linkedin_url=None, changed_sections=None, changed_fields=None, added_positions=None, removed_positions=None,
+                 title_changes=None, added_educations=None, removed_educations=None):
+        self.linkedin_url = linkedin_url
+        self.changed_sections = list(changed_sections or [])
+        self.changed_fields = dict(changed_fields or {})
+        self.added_positions = list(added_positions or [])
+        self.removed_positions = list(removed_positions or [])
+        self.title_changes = list(title_changes or [])
+        self.added_educations = list(added_educations or [])
+        self.removed_educations = list(removed_educations or [])
+
+    @classmethod
+    def between(cls, old, new, changed_sections=()):
+        # old and new are to_dict() records of the same profile
+        diff = cls(new.get("linkedin_url"), changed_sections)
+        for field in ("name", "location"):
+            if old.get(field) != new.get(field):
+                diff.changed_fields[field] = [old.get(field), new.get(field)]
+
+        # a position is the same position while it stays at the same place and start date
+        old_positions = dict((_position_key(entry), entry) for entry in old.get("experiences", []))
+        new_positions = dict((_position_key(entry), entry) for entry in new.get("experiences", []))
+        for key, entry in new_positions.items():
+            if key not in old_positions:
+                diff.added_positions.append(entry)
+            elif old_positions[key].get("position_title") != entry.get("position_title"):
+                diff.title_changes.append({"institution_name": key[0], "from_date": key[1],
+                                           "old": old_positions[key].get("position_title"), "new": entry.get("position_title")})
+        diff.removed_positions = [entry for key, entry in old_positions.items() if key not in new_positions]
+
+        old_educations = set(_position_key(entry) for entry in old.get("educations", []))
+        new_educations = set(_position_key(entry) for entry in new.get("educations", []))
+        diff.added_educations = [entry for entry in new.get("educations", []) if _position_key(entry) not in old_educations]
+        diff.removed_educations = [entry for entry in old.get("educations", []) if _position_key(entry) not in new_educations]
+        return diff
+
+    def __bool__(self):
+        return any(getattr(self, field) for field in self._fields[1:])
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return "<ProfileDiff {} sections={} +{} -{} positions, {} title changes>".format(
+            self.linkedin_url, self.changed_sections, len(self.added_positions), len(self.removed_positions), len(self.title_changes))
+
 class Scraper(object):
     driver = None
+    pool = None
+    # whether self.driver is checked out of self.pool and still has to go back
+    leased = False
+    cache = None
+    snapshots = None
+    metrics = None
+    breaker = None
+    backoff = Backoff(base=0.5, ceiling=10.0)
+    interactive = True
+    # the page layout detected on the last load, see selectors.py
+    layout = None
+
+    def instrument(self, sink, driver):
+        if sink is not None:
+            self.metrics = ScrapeMetrics(type(self).__name__.lower(), self.linkedin_url, sink)
+            attach(driver, self.metrics)
+
+    @contextmanager
+    def phase(self, name):
+        if self.metrics is None:
+            yield None
+        else:
+            with self.metrics.phase(name) as stats:
+                yield stats
+
+    def count_timeout(self):
+        if self.metrics is not None:
+            self.metrics.timeout()
+
+    def detach_metrics(self):
+        if self.metrics is not None:
+            detach(self.driver, self.metrics)
+
+    def emit_metrics(self):
+        if self.metrics is not None:
+            self.detach_metrics()
+            self.metrics.emit()
+
+    def load_page(self, url, driver=None):
+        if self.breaker is not None and not self.breaker.allow(url):
+            raise CircuitOpen(url, self.breaker.retry_at(url))
+        (driver or self.driver).get(url)
+        self.watch_blocked(url, driver)
+
+    def watch_blocked(self, url, driver=None):
+        # after any navigation, for scrapes that act on blocks rather than leave them to a human
+        if self.breaker is not None or not self.interactive:
+            self.check_blocked(url, driver)
+
+    def check_blocked(self, url=None, driver=None):
+        # an unattended scrape gives up on authwalls and captchas instead of waiting on a human
+        url = url or self.linkedin_url
+        reason = blocked_reason((driver or self.driver).current_url)
+        if self.breaker is not None:
+            if reason is None:
+                self.breaker.success(url)
+            else:
+                self.breaker.failure(url)
+        if reason is not None:
+            raise Blocked(url, reason)
+
+    def from_cache(self):
+        record = self.cache.get(self.linkedin_url)
+        if record is None:
+            return False
+        self.load(record)
+        return True
+
+    def snapshot(self, kind, page_source, logged_in=True):
+        if self.snapshots is not None:
+            self.snapshots.save(self.linkedin_url, page_source, kind, logged_in=logged_in)
+
+    def to_cache(self):
+        if self.cache is not None:
+            self.cache.put(self.linkedin_url, self.to_dict(), kind=type(self).__name__.lower())
+
+    def close_driver(self, quit=False):
+        self.detach_metrics()
+        if self.pool is not None:
+            # a pooled driver goes back once, however many times the scrape is closed
+            if self.leased:
+                self.leased = False
+                self.pool.release(self.driver)
+        elif quit:
+            self.driver.quit()
+        else:
+            self.driver.close()
+
+    def is_signed_in(self, wait_time=3):
+        # with the eager load strategy the nav may not be rendered yet, so it is
+        # waited for until the page has fully loaded, as a normal load would have
+        def signed_in_or_loaded(driver):
+            if driver.find_elements_by_id("profile-nav-item"):
+                return "signed_in"
+            if driver.execute_script("return document.readyState;") == "complete":
+                return "signed_out"
+            return False
 
-    def is_signed_in(self):
         try:
-            self.driver.find_element_by_id("profile-nav-item")
-            return True
-        except:
-            pass
-        return False
+            return WebDriverWait(self.driver, wait_time).until(signed_in_or_loaded) == "signed_in"
+        except (TimeoutException, WebDriverException):
+            return False
 
     def __find_element_by_class_name__(self, class_name):
         try:
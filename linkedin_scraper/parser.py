@@ -0,0 +1,334 @@
+from collections import OrderedDict
+from lxml import html
+import sys
+from urllib.parse import urljoin
+from .objects import Experience, Education, Interest, Accomplishment, CompanySummary
+from . import selectors
+from .normalize import split_range
+from .urls import canonical_url
+
+BASE_URL = "https://www.linkedin.com/"
+
+def _first(elems):
+    return elems[0] if len(elems) > 0 else None
+
+def _text(elem):
+    if elem is None:
+        return None
+    return " ".join(elem.text_content().split())
+
+def _lines(elem):
+    lines = []
+    for text in elem.itertext():
+        text = " ".join(text.split())
+        if text:
+            lines.append(text)
+    return lines
+
+def _href(elem):
+    if elem is None:
+        return None
+    if elem.tag != "a":
+        elem = _first(elem.xpath(".//a"))
+    if elem is None or elem.get("href") is None:
+        return None
+    return urljoin(BASE_URL, elem.get("href"))
+
+def _name(elem):
+    # the same institutions come up on profile after profile, so their names share one string
+    text = _text(elem)
+    return sys.intern(text) if text is not None else None
+
+def _company_url(links):
+    url = _href(_first(links))
+    return canonical_url(url) if url is not None else None
+
+def _profile_links(links):
+    urls = []
+    for link in links:
+        url = _href(link)
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+def to_tree(page_source):
+    if isinstance(page_source, (str, bytes)):
+        return html.document_fromstring(page_source)
+    return page_source
+
+def _layout(kind, tree, layout):
+    # an unknown page fails here, before any field is looked for
+    return layout if layout is not None else selectors.detect(kind, tree)
+
+def parse_person(page_source, logged_in=True, layout=None):
+    tree = to_tree(page_source)
+    if logged_in:
+        return parse_person_logged_in(tree, layout)
+    return parse_person_not_logged_in(tree, layout)
+
+def parse_company(page_source, logged_in=True, layout=None):
+    tree = to_tree(page_source)
+    if logged_in:
+        return parse_company_logged_in(tree, layout)
+    return parse_company_not_logged_in(tree, layout)
+
+# the sections of a signed-in profile that are fingerprinted and re-parsed on their own
+PERSON_SECTIONS = selectors.latest("person").sections
+
+def fingerprint(text):
+    # 32 bit FNV-1a over UTF-16 code units, the same as the in-page version in extractor.py
+    h = 0x811c9dc5
+    units = text.encode("utf-16-le")
+    for i in range(0, len(units), 2):
+        h = ((h ^ (units[i] | units[i + 1] << 8)) * 0x01000193) & 0xffffffff
+    return "{:08x}".format(h)
+
+def section_fingerprints(page_source, sections=PERSON_SECTIONS):
+    tree = to_tree(page_source)
+    fingerprints = OrderedDict()
+    for name, path in sections.items():
+        nodes = tree.xpath(path)
+        fingerprints[name] = fingerprint(" ".join(" ".join(node.text_content() for node in nodes).split())) if nodes else None
+    return fingerprints
+
+def _person_top_card(tree, layout):
+    return {
+        "name": _text(_first(layout["name"](tree))),
+        "location": _text(_first(layout["location"](tree))),
+    }
+
+def _person_experiences(tree, layout):
+    experiences = []
+    for exp in layout["experience_section"](tree):
+        for position in layout["position"](exp):
+            position_title = _text(_first(layout["position_title"](position))) or ""
+            try:
+                company = _name(layout["position_lines"](position)[1])
+                h4 = layout["position_facts"](position)
+                from_date, to_date = split_range(_text(layout["spans"](h4[0])[1]))
+                duration = _text(layout["spans"](h4[1])[1])
+                location = _text(layout["spans"](h4[2])[1])
+            except IndexError:
+                company = None
+                from_date, to_date, duration, location = (None, None, None, None)
+
+            experience = Experience(position_title=position_title, from_date=from_date,
+                                    to_date=to_date, duration=duration, location=location)
+            experience.institution_name = company
+            experience.institution_url = _company_url(layout["position_link"](position))
+            experiences.append(experience)
+    return experiences
+
+def _person_educations(tree, layout):
+    educations = []
+    for edu in layout["education_section"](tree):
+        for school in layout["school"](edu):
+            university = _name(_first(layout["school_name"](school))) or ""
+            try:
+                degree = _text(layout["spans"](layout["degree"](school)[0])[1])
+                from_date, to_date = split_range(_text(layout["spans"](layout["dates"](school)[0])[1]))
+            except IndexError:
+                degree = None
+                from_date, to_date = (None, None)
+            education = Education(from_date=from_date, to_date=to_date, degree=degree)
+            education.institution_name = university
+            educations.append(education)
+    return educations
+
+def _person_interests(tree, layout):
+    interests = []
+    for container in layout["interests_section"](tree):
+        for interest in layout["interest"](container):
+            title = _text(_first(layout["interest_title"](interest)))
+            if title is not None:
+                interests.append(Interest(title))
+    return interests
+
+def _person_accomplishments(tree, layout):
+    accomplishments = []
+    for acc in layout["accomplishments_section"](tree):
+        for block in layout["accomplishment_block"](acc):
+            category = _text(_first(layout["accomplishment_category"](block)))
+            for title in layout["accomplishment_title"](block):
+                accomplishments.append(Accomplishment(category, _text(title)))
+    return accomplishments
+
+_PERSON_SECTION_PARSERS = {
+    "top_card": _person_top_card,
+    "experience": lambda tree, layout: {"experiences": _person_experiences(tree, layout)},
+    "education": lambda tree, layout: {"educations": _person_educations(tree, layout)},
+    "interests": lambda tree, layout: {"interests": _person_interests(tree, layout)},
+    "accomplishments": lambda tree, layout: {"accomplishments": _person_accomplishments(tree, layout)},
+}
+
+def parse_person_sections(page_source, sections, layout=None):
+    # only the fields of the given sections, for refreshing a profile incrementally
+    tree = to_tree(page_source)
+    layout = _layout("person", tree, layout)
+    fields = {}
+    for name in sections:
+        fields.update(_PERSON_SECTION_PARSERS[name](tree, layout))
+    return fields
+
+def parse_person_logged_in(tree, layout=None):
+    layout = _layout("person", tree, layout)
+    fields = _person_top_card(tree, layout)
+    fields["experiences"] = _person_experiences(tree, layout)
+    fields["educations"] = _person_educations(tree, layout)
+    fields["interests"] = _person_interests(tree, layout)
+    fields["accomplishments"] = _person_accomplishments(tree, layout)
+
+    # get people also viewed
+    fields["also_viewed_urls"] = _profile_links(layout["also_viewed"](tree))
+
+    return fields
+
+def parse_person_not_logged_in(tree, layout=None):
+    layout = _layout("person_public", tree, layout)
+    fields = {
+        "name": _text(_first(layout["name"](tree))),
+        "experiences": [],
+        "educations": [],
+    }
+
+    # get experience
+    for exp in layout["experience_section"](tree):
+        for position in layout["position"](exp):
+            times = _first(layout["duration"](position))
+            from_date = _text(_first(layout["start_date"](times))) if times is not None else None
+            if from_date is None:
+                from_date, to_date, duration, location = (None, None, None, None)
+            else:
+                to_date = _text(_first(layout["end_date"](times))) or "Present"
+                duration = _text(_first(layout["duration_text"](position)))
+                location = _text(_first(layout["position_location"](position)))
+
+            experience = Experience(position_title=_text(_first(layout["position_title"](position))),
+                                    from_date=from_date, to_date=to_date, duration=duration, location=location)
+            experience.institution_name = _name(_first(layout["company"](position)))
+            experience.institution_url = _company_url(layout["position_link"](position))
+            fields["experiences"].append(experience)
+
+    # get education
+    for edu in layout["education_section"](tree):
+        for school in layout["school"](edu):
+            times = _first(layout["dates"](school))
+            from_date, to_date = (None, None)
+            if times is not None:
+                from_date = _text(_first(layout["start_date"](times)))
+                to_date = _text(_first(layout["end_date"](times)))
+            education = Education(from_date=from_date, to_date=to_date,
+                                  degree=_text(_first(layout["degree"](school))))
+            education.institution_name = _name(_first(layout["school_name"](school)))
+            fields["educations"].append(education)
+
+    # get people also viewed
+    fields["also_viewed_urls"] = _profile_links(layout["also_viewed"](tree))
+
+    return fields
+
+def _parse_company_cards(company_list, layout):
+    summaries = []
+    for card in layout["card"](company_list):
+        link = _first(layout["card_link"](card))
+        summaries.append(CompanySummary(
+            linkedin_url = _href(link),
+            name = _text(link),
+            followers = _text(_first(layout["card_followers"](card)))
+        ))
+    return summaries
+
+def parse_company_logged_in(tree, layout = None):
+    layout = _layout("company", tree, layout)
+    fields = {
+        "name": _text(_first(layout["name"](tree))),
+        "showcase_pages": [],
+        "affiliated_companies": [],
+    }
+
+    grid = _first(layout["about"](tree))
+    if grid is not None:
+        fields["about_us"] = _text(_first(layout["about_text"](grid)))
+
+        values = [_text(value) for value in layout["about_values"](grid)]
+        if len(values) > 5:
+            fields["specialties"] = "\n".join(values[-1].split(", "))
+            fields["website"] = values[0]
+            fields["headquarters"] = values[5]
+            fields["industry"] = values[2]
+            fields["company_size"] = values[3]
+
+    company_lists = layout["company_list"](tree)
+    if len(company_lists) == 2:
+        showcase, affiliated = company_lists
+        fields["showcase_pages"] = _parse_company_cards(showcase, layout)
+        fields["affiliated_companies"] = _parse_company_cards(affiliated, layout)
+
+    return fields
+
+def _text_under_subtitle(elems):
+    elem = _first(elems)
+    if elem is None:
+        return None
+    return "\n".join(_lines(elem)[1:])
+
+def parse_company_not_logged_in(tree, layout = None):
+    layout = _layout("company_public", tree, layout)
+    fields = {
+        "name": _text(_first(layout["name"](tree))),
+        "about_us": _text(_first(layout["about"](tree))),
+        "specialties": _text_under_subtitle(layout["specialties"](tree)),
+        "website": _text_under_subtitle(layout["website"](tree)),
+        "headquarters": _text(_first(layout["headquarters"](tree))),
+        "industry": _text(_first(layout["industry"](tree))),
+        "company_size": _text(_first(layout["company_size"](tree))),
+        "company_type": _text_under_subtitle(layout["company_type"](tree)),
+        "founded": _text_under_subtitle(layout["founded"](tree)),
+        "showcase_pages": [],
+        "affiliated_companies": [],
+    }
+
+    # get showcase
+    showcase_pages = layout["showcase"](tree)
+    if len(showcase_pages) > 1:
+        for showcase_company in layout["showcase_item"](showcase_pages[1]):
+            name_elem = _first(layout["showcase_name"](showcase_company))
+            lines = _lines(showcase_company)
+            fields["showcase_pages"].append(CompanySummary(
+                linkedin_url = _href(name_elem),
+                name = _text(name_elem),
+                followers = lines[1] if len(lines) > 1 else None
+            ))
+
+    # affiliated company
+    for affiliated_pages in layout["affiliated"](tree):
+        for affiliated_page in layout["affiliated_name"](affiliated_pages):
+            fields["affiliated_companies"].append(CompanySummary(
+                linkedin_url = _href(affiliated_page),
+                name = _text(affiliated_page)
+            ))
+
+    return fields
+
+_SEARCH = selectors.latest("search")
+
+def parse_employees(page_source, layout = _SEARCH):
+    tree = to_tree(page_source)
+    employees = []
+    for results in layout["results"](tree):
+        for res in layout["result"](results):
+            links = layout["result_link"](res)
+            if len(links) < 2:
+                continue
+            # a result without a link (a private member, say) has nothing to scrape or dedup
+            linkedin_url = _href(links[0])
+            if linkedin_url is None:
+                continue
+            employees.append((linkedin_url, _text(links[1])))
+    return employees
+
+def parse_page_count(page_source, layout = _SEARCH):
+    tree = to_tree(page_source)
+    pages = [_text(page) for page in layout["page_indicator"](tree)]
+    pages = [int(page) for page in pages if page and page.isdigit()]
+    return max(pages) if pages else 1
@@ -1,43 +1,131 @@
-import requests
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from .objects import Experience, Education, Scraper, Interest, Accomplishment
-import os
+from selenium.common.exceptions import TimeoutException
+from .objects import Experience, Education, Scraper, Interest, Accomplishment, ProfileDiff
+from . import parser, extractor, browser, waits, selectors
+from .pool import DriverPool
+
+# the record field each re-parsable section below the top card fills in
+_SECTION_FIELDS = {
+    "experience": "experiences",
+    "education": "educations",
+    "interests": "interests",
+    "accomplishments": "accomplishments",
+}
 
 class Person(Scraper):
 
-    __TOP_CARD = "pv-top-card"
-
-    def __init__(self, linkedin_url=None, name=None, experiences=[], educations=[], interests=[], accomplishments=[], driver=None, get=True, scrape=True, close_on_complete=True):
+    def __init__(self, linkedin_url=None, name=None, experiences=None, educations=None, interests=None, accomplishments=None, driver=None, get=True, scrape=True, close_on_complete=True, use_js=False, cache=None, snapshots=None, metrics=None, dedup=None, interactive=True, breaker=None, backoff=None, previous=None):
         self.linkedin_url = linkedin_url
         self.name = name
-        self.experiences = experiences
-        self.educations = educations
-        self.interests = interests
-        self.accomplishments = accomplishments
+        self.experiences = list(experiences or [])
+        self.educations = list(educations or [])
+        self.interests = list(interests or [])
+        self.accomplishments = list(accomplishments or [])
         self.also_viewed_urls = []
-
-        if driver is None:
-            try:
-                if os.getenv("CHROMEDRIVER") == None:
-                    driver_path = os.path.join(os.path.dirname(
-                        __file__), 'drivers/chromedriver')
-                else:
-                    driver_path = os.getenv("CHROMEDRIVER")
-
-                driver = webdriver.Chrome(driver_path)
-            except:
-                driver = webdriver.Chrome()
-
-        if get:
-            driver.get(linkedin_url)
-
-        self.driver = driver
-
-        if scrape:
-            self.scrape(close_on_complete)
+        self.sections = {}
+        self.wait_timings = []
+        self.fingerprints = {}
+        self.diff = None
+        self.cache = cache
+        self.snapshots = snapshots
+        self.duplicate = False
+
+        # a profile already scraped in this run is not loaded again
+        # a record without a url has nothing to be a duplicate of
+        if dedup is not None and linkedin_url and not dedup.add(linkedin_url):
+            self.duplicate = True
+            self.driver = None if isinstance(driver, DriverPool) else driver
+            return
+
+        owned = False
+        try:
+            # a profile scraped before is refreshed incrementally, see scrape_logged_in
+            self.previous = previous if previous is None or isinstance(previous, dict) else previous.to_dict()
+
+            if previous is None and cache is not None and self.from_cache():
+                self.driver = None if isinstance(driver, DriverPool) else driver
+                return
+
+            if isinstance(driver, DriverPool):
+                self.pool = driver
+                driver = self.pool.acquire()
+                self.leased = True
+            elif driver is None:
+                driver = browser.new_driver()
+                owned = True
+
+            self.driver = driver
+            self.interactive = interactive
+            self.breaker = breaker
+            if backoff is not None:
+                self.backoff = backoff
+            self.instrument(metrics, driver)
+            if get:
+                with self.phase("page_load"):
+                    self.load_page(linkedin_url)
+
+            if scrape:
+                self.scrape(close_on_complete, use_js=use_js)
+        except BaseException:
+            # a url that failed is not a duplicate, so a retry with the same index goes ahead
+            if dedup is not None and linkedin_url:
+                dedup.discard(linkedin_url)
+            # a failed scrape must not keep a pooled browser checked out
+            if self.pool is not None:
+                self.close_driver()
+            # nor leave behind a browser it started itself
+            elif owned:
+                self.driver.quit()
+            raise
+        finally:
+            self.detach_metrics()
+
+    @classmethod
+    def from_html(cls, page_source, linkedin_url=None, logged_in=True):
+        person = cls.from_dict({"linkedin_url": linkedin_url})
+        tree = parser.to_tree(page_source)
+        person.parse(tree, logged_in=logged_in)
+        if logged_in:
+            person.fingerprints = dict(parser.section_fingerprints(tree, selectors.detect("person", tree).sections))
+        return person
+
+    @classmethod
+    def from_dict(cls, record):
+        person = cls.__new__(cls)
+        person.linkedin_url = None
+        person.name = None
+        person.experiences = []
+        person.educations = []
+        person.interests = []
+        person.accomplishments = []
+        person.also_viewed_urls = []
+        person.sections = {}
+        person.wait_timings = []
+        person.fingerprints = {}
+        person.previous = None
+        person.diff = None
+        person.duplicate = False
+        person.driver = None
+        person.load(record)
+        return person
+
+    def load(self, record):
+        self.linkedin_url = record.get("linkedin_url", self.linkedin_url)
+        self.name = record.get("name", self.name)
+        if record.get("location") is not None:
+            self.add_location(record["location"])
+        for experience in record.get("experiences", []):
+            self.add_experience(Experience.from_dict(experience))
+        for education in record.get("educations", []):
+            self.add_education(Education.from_dict(education))
+        for interest in record.get("interests", []):
+            self.add_interest(Interest.from_dict(interest))
+        for accomplishment in record.get("accomplishments", []):
+            self.add_accomplishment(Accomplishment.from_dict(accomplishment))
+        self.also_viewed_urls.extend(record.get("also_viewed_urls", []))
+        self.fingerprints = dict(record.get("fingerprints") or self.fingerprints)
 
     def add_experience(self, experience):
         self.experiences.append(experience)
@@ -54,200 +142,155 @@ class Person(Scraper):
     def add_location(self, location):
         self.location = location
 
-    def scrape(self, close_on_complete=True):
+    def scrape(self, close_on_complete=True, use_js=False):
 
         if self.is_signed_in():
-            self.scrape_logged_in(close_on_complete=close_on_complete)
+            self.scrape_logged_in(close_on_complete=close_on_complete, use_js=use_js)
         else:
-            print('you are not logged in!')
-            x = input(
-                'please verify the capcha then press any key to continue...')
-            self.scrape_not_logged_in(close_on_complete=close_on_complete)
-
-    def scrape_logged_in(self, close_on_complete=True):
-        driver = self.driver
-        duration = None
-
-        root = driver.find_element_by_class_name(self.__TOP_CARD)
-        self.name = root.find_elements_by_xpath(
-            "//section/div/div/div/*/li")[0].text.strip()
-
-        driver.execute_script(
-            "window.scrollTo(0, Math.ceil(document.body.scrollHeight/2));")
-
-        # get experience
-        try:
-            _ = WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.ID, "experience-section")))
-            exp = driver.find_element_by_id("experience-section")
-        except:
-            exp = None
-
-        if (exp is not None):
-            for position in exp.find_elements_by_class_name("pv-position-entity"):
-                position_title = position.find_element_by_tag_name(
-                    "h3").text.encode('utf-8').strip()
-
-                try:
-                    company = position.find_elements_by_tag_name(
-                        "p")[1].text.encode('utf-8').strip()
-                    times = str(position.find_elements_by_tag_name("h4")[
-                                0].find_elements_by_tag_name("span")[1].text.strip())
-                    from_date = " ".join(times.split(' ')[:2])
-                    to_date = " ".join(times.split(' ')[3:])
-                    duration = position.find_elements_by_tag_name(
-                        "h4")[1].find_elements_by_tag_name("span")[1].text.strip()
-                    location = position.find_elements_by_tag_name(
-                        "h4")[2].find_elements_by_tag_name("span")[1].text.strip()
-                except:
-                    company = None
-                    from_date, to_date, duration, location = (
-                        None, None, None, None)
-
-                experience = Experience(position_title=position_title, from_date=from_date,
-                                        to_date=to_date, duration=duration, location=location)
-                experience.institution_name = company
-                self.add_experience(experience)
-
-        # get location
-        location = driver.find_element_by_class_name(
-            f'{self.__TOP_CARD}--list-bullet')
-        location = location.find_element_by_tag_name('li').text
-        self.add_location(location)
-
-        driver.execute_script(
-            "window.scrollTo(0, Math.ceil(document.body.scrollHeight/1.5));")
-
-        # get education
-        try:
-            _ = WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.ID, "education-section")))
-            edu = driver.find_element_by_id("education-section")
-        except:
-            edu = None
-
-        if (edu is not None):
-            for school in edu.find_elements_by_class_name("pv-profile-section__list-item"):
-                university = school.find_element_by_class_name(
-                    "pv-entity__school-name").text.encode('utf-8').strip()
-
-                try:
-                    degree = school.find_element_by_class_name(
-                        "pv-entity__degree-name").find_elements_by_tag_name("span")[1].text.encode('utf-8').strip()
-                    times = school.find_element_by_class_name(
-                        "pv-entity__dates").find_elements_by_tag_name("span")[1].text.strip()
-                    from_date, to_date = (times.split(
-                        " ")[0], times.split(" ")[2])
-                except:
-                    degree = None
-                    from_date, to_date = (None, None)
-                education = Education(
-                    from_date=from_date, to_date=to_date, degree=degree)
-                education.institution_name = university
-                self.add_education(education)
-
-        # get interest
+            if self.interactive:
+                print('you are not logged in!')
+                x = input(
+                    'please verify the capcha then press any key to continue...')
+            else:
+                self.check_blocked()
+            self.scrape_not_logged_in(close_on_complete=close_on_complete, use_js=use_js)
+        self.to_cache()
+        self.emit_metrics()
+
+    def __wait_for(self, locator, wait_time=3):
         try:
-            _ = WebDriverWait(driver, 3).until(EC.presence_of_element_located(
-                (By.XPATH, "//*[@class='pv-profile-section pv-interests-section artdeco-container-card ember-view']")))
-            interestContainer = driver.find_element_by_xpath(
-                "//*[@class='pv-profile-section pv-interests-section artdeco-container-card ember-view']")
-            for interestElement in interestContainer.find_elements_by_xpath("//*[@class='pv-entity__summary-info ember-view']"):
-                interest = Interest(interestElement.find_element_by_tag_name(
-                    "h3").text.encode('utf-8').strip())
-                self.add_interest(interest)
+            _ = WebDriverWait(self.driver, wait_time).until(
+                EC.presence_of_element_located(locator))
+            return True
+        except TimeoutException:
+            self.count_timeout()
+            return False
         except:
-            pass
+            return False
+
+    def parse(self, page_source, logged_in=True, layout=None):
+        self.__apply(parser.parse_person(page_source, logged_in=logged_in, layout=layout))
+
+    def extract(self, logged_in=True):
+        self.__apply(extractor.extract_person(self.driver, logged_in=logged_in, layout=self.layout if logged_in else None))
+
+    def __apply(self, fields):
+        if fields.get("name") is not None:
+            self.name = fields["name"]
+        if fields.get("location") is not None:
+            self.add_location(fields["location"])
+        for experience in fields.get("experiences", []):
+            self.add_experience(experience)
+        for education in fields.get("educations", []):
+            self.add_education(education)
+        for interest in fields.get("interests", []):
+            self.add_interest(interest)
+        for accomplishment in fields.get("accomplishments", []):
+            self.add_accomplishment(accomplishment)
+        for url in fields.get("also_viewed_urls", []):
+            if url not in self.also_viewed_urls:
+                self.also_viewed_urls.append(url)
+
+    def __replace(self, fields):
+        # the sections in fields replace what was held before, the others are kept
+        for key in ("experiences", "educations", "interests", "accomplishments"):
+            if key in fields:
+                setattr(self, key, [])
+        self.__apply(fields)
+
+    def scrape_logged_in(self, close_on_complete=True, use_js=False):
+        driver = self.driver
 
-        # get accomplishment
-        try:
-            _ = WebDriverWait(driver, 3).until(EC.presence_of_element_located(
-                (By.XPATH, "//*[@class='pv-profile-section pv-accomplishments-section artdeco-container-card ember-view']")))
-            acc = driver.find_element_by_xpath(
-                "//*[@class='pv-profile-section pv-accomplishments-section artdeco-container-card ember-view']")
-            for block in acc.find_elements_by_xpath("//div[@class='pv-accomplishments-block__content break-words']"):
-                category = block.find_element_by_tag_name("h3")
-                for title in block.find_element_by_tag_name("ul").find_elements_by_tag_name("li"):
-                    accomplishment = Accomplishment(category.text, title.text)
-                    self.add_accomplishment(accomplishment)
-        except:
-            pass
+        # the layout decides which selectors run from here on, and an unknown one fails fast
+        with self.phase("top_card"):
+            self.layout = layout = selectors.detect_in_page(driver, "person", wait_time=3)
+
+        # sections are lazily rendered as the page scrolls, so load them all
+        # before taking a single snapshot of the page. one probe reports every
+        # section at once and only sections that may still render are waited for
+        with self.phase("sections"):
+            lazy = dict((name, path) for name, path in layout.sections.items() if name != "top_card")
+            self.sections, timing = waits.wait_for_sections(driver, lazy)
+            self.wait_timings.append(timing)
+            if not timing.settled:
+                self.count_timeout()
+
+        with self.phase("fingerprint"):
+            fingerprints = extractor.fingerprint_sections(driver, layout.sections)
+
+        previous = self.previous
+        if previous is not None and previous.get("fingerprints"):
+            # only the sections whose fingerprint moved are read again, the rest comes from the previous record
+            changed = [name for name, value in fingerprints.items() if value != previous["fingerprints"].get(name)]
+            kept = dict((key, previous.get(key) or []) for name, key in _SECTION_FIELDS.items() if name not in changed)
+            kept["also_viewed_urls"] = previous.get("also_viewed_urls") or []
+            if "top_card" not in changed:
+                kept["name"] = previous.get("name")
+                kept["location"] = previous.get("location")
+            self.load(kept)
+            # an unchanged profile never reads the page source back
+            if changed:
+                with self.phase("parse"):
+                    page_source = driver.page_source
+                    self.snapshot("person", page_source, logged_in=True)
+                    self.__replace(parser.parse_person_sections(page_source, changed, layout=layout))
+        else:
+            changed = list(fingerprints)
+            with self.phase("parse"):
+                if use_js:
+                    self.extract(logged_in=True)
+                    if self.snapshots is not None:
+                        self.snapshot("person", driver.page_source, logged_in=True)
+                else:
+                    page_source = driver.page_source
+                    self.snapshot("person", page_source, logged_in=True)
+                    self.parse(page_source, logged_in=True, layout=layout)
+        if previous is not None:
+            self.diff = ProfileDiff.between(previous, self.to_dict(), changed) if changed else ProfileDiff(self.linkedin_url)
+        self.fingerprints = fingerprints
 
         if close_on_complete:
-            driver.quit()
+            self.close_driver(quit=True)
 
-    def scrape_not_logged_in(self, close_on_complete=True, retry_limit=10):
+    def scrape_not_logged_in(self, close_on_complete=True, retry_limit=10, use_js=False):
         driver = self.driver
         retry_times = 0
-        while self.is_signed_in() and retry_times <= retry_limit:
-            page = driver.get(self.linkedin_url)
-            retry_times = retry_times + 1
-
-        # get name
-        self.name = driver.find_element_by_class_name("top-card-layout__title").text.strip()
-
-        # get experience
-        try:
-            _ = WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "experience")))
-            exp = driver.find_element_by_class_name("experience")
-        except:
-            exp = None
-
-        if(exp is not None):
-        	for position in exp.find_elements_by_class_name("experience-item__contents"):
-        	    position_title = position.find_element_by_class_name(
-        	        "experience-item__title").text.strip()
-        	    company = position.find_element_by_class_name(
-        	        "experience-item__subtitle").text.strip()
-
-        	    try:
-        	        times = position.find_element_by_class_name(
-        	            "experience-item__duration")
-        	        from_date = times.find_element_by_class_name(
-        	            "date-range__start-date").text.strip()
-        	        try:
-        	            to_date = times.find_element_by_class_name(
-        	                "date-range__end-date").text.strip()
-        	        except:
-        	            to_date = "Present"
-        	        duration = position.find_element_by_class_name(
-        	            "date-range__duration").text.strip()
-        	        location = position.find_element_by_class_name(
-        	            "experience-item__location").text.strip()
-        	    except:
-        	        from_date, to_date, duration, location = (
-        	            None, None, None, None)
-
-        	    experience = Experience(position_title=position_title, from_date=from_date,
-        	                            to_date=to_date, duration=duration, location=location)
-        	    experience.institution_name = company
-        	    self.add_experience(experience)
-        driver.execute_script(
-            "window.scrollTo(0, Math.ceil(document.body.scrollHeight/1.5));")
-
-        # get education
-        edu = driver.find_element_by_class_name("education__list")
-        for school in edu.find_elements_by_class_name("result-card"):
-            university = school.find_element_by_class_name(
-                "result-card__title").text.strip()
-            degree = school.find_element_by_class_name(
-                "education__item--degree-info").text.strip()
-            try:
-                times = school.find_element_by_class_name("date-range")
-                from_date = times.find_element_by_class_name(
-                    "date-range__start-date").text.strip()
-                to_date = times.find_element_by_class_name(
-                    "date-range__end-date").text.strip()
-            except:
-                from_date, to_date = (None, None)
-            education = Education(from_date=from_date,
-                                  to_date=to_date, degree=degree)
-            education.institution_name = university
-            self.add_education(education)
+        with self.phase("page_load"):
+            while self.is_signed_in() and retry_times <= retry_limit:
+                self.backoff.sleep(retry_times)
+                self.load_page(self.linkedin_url)
+                retry_times = retry_times + 1
+
+        with self.phase("experience"):
+            self.__wait_for((By.CLASS_NAME, "experience"))
+            driver.execute_script(
+                "window.scrollTo(0, Math.ceil(document.body.scrollHeight/1.5));")
+
+        with self.phase("parse"):
+            if use_js:
+                self.extract(logged_in=False)
+                if self.snapshots is not None:
+                    self.snapshot("person", driver.page_source, logged_in=False)
+            else:
+                page_source = driver.page_source
+                self.snapshot("person", page_source, logged_in=False)
+                self.parse(page_source, logged_in=False)
 
         if close_on_complete:
-            driver.close()
+            self.close_driver()
+
+    def to_dict(self):
+        return {
+            "linkedin_url": self.linkedin_url,
+            "name": self.name,
+            "location": getattr(self, "location", None),
+            "experiences": [experience.to_dict() for experience in self.experiences],
+            "educations": [education.to_dict() for education in self.educations],
+            "interests": [interest.to_dict() for interest in self.interests],
+            "accomplishments": [accomplishment.to_dict() for accomplishment in self.accomplishments],
+            "also_viewed_urls": list(self.also_viewed_urls),
+            "fingerprints": dict(self.fingerprints),
+        }
 
     def __repr__(self):
         return "{name}\n\nExperience\n{exp}\n\nEducation\n{edu}\n\nInterest\n{int}\n\nAccomplishments\n{acc}".format(name=self.name, exp=self.experiences, edu=self.educations, int=self.interests, acc=self.accomplishments)
@@ -0,0 +1,147 @@
+from contextlib import contextmanager
+import threading
+import time
+from . import browser
+
+class PoolTimeout(Exception):
+    pass
+
+class DriverPool(object):
+
+    def __init__(self, size=2, factory=None, max_pages=100, max_memory=None, reset_url="about:blank"):
+        self.size = size
+        self.factory = factory or browser.new_driver
+        self.max_pages = max_pages
+        self.max_memory = max_memory
+        self.reset_url = reset_url
+        self.recycled = 0
+        self._idle = []
+        # page loads per driver, and each driver's own get for the resets between uses
+        self._pages = {}
+        self._gets = {}
+        self._count = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return self._count
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("pool is closed")
+                if self._idle:
+                    driver = self._idle.pop()
+                elif self._count < self.size:
+                    driver = None
+                    # reserve the slot so the browser can start outside the lock
+                    self._count += 1
+                else:
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        raise PoolTimeout("no driver available after {} seconds".format(timeout))
+                    self._cond.wait(remaining)
+                    continue
+
+            if driver is None:
+                return self.__start()
+            if self.is_healthy(driver):
+                return driver
+            self.__discard(driver)
+
+    def release(self, driver):
+        with self._cond:
+            pages = self._pages.get(id(driver), 0)
+
+        # memory is read before the reset, while the last page is still loaded
+        if self._closed or pages >= self.max_pages or self.__over_memory(driver) or not self.__reset(driver):
+            self.recycled += 1
+            self.__discard(driver)
+            return
+
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def session(self, timeout=None):
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def is_healthy(self, driver):
+        try:
+            return driver.execute_script("return 1;") == 1
+        except:
+            return False
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self.__discard(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __start(self):
+        try:
+            driver = self.factory()
+        except:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+        get = driver.get
+
+        def counted(url):
+            with self._cond:
+                self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+            return get(url)
+
+        driver.get = counted
+        with self._cond:
+            self._pages[id(driver)] = 0
+            self._gets[id(driver)] = get
+        return driver
+
+    def __reset(self, driver):
+        try:
+            if self.reset_url is not None:
+                # the reset is not a page anyone scraped, so it is not counted
+                self._gets.get(id(driver), driver.get)(self.reset_url)
+            return True
+        except:
+            return False
+
+    def __over_memory(self, driver):
+        if self.max_memory is None:
+            return False
+        # the browser's resident memory is what grows, the page's JS heap is only a fallback for remote drivers
+        used = browser.browser_rss(driver)
+        if used is None:
+            try:
+                used = driver.execute_script(
+                    "return window.performance.memory ? window.performance.memory.usedJSHeapSize : 0;") or 0
+            except:
+                return True
+        return used > self.max_memory
+
+    def __discard(self, driver):
+        try:
+            driver.quit()
+        except:
+            pass
+        with self._cond:
+            self._pages.pop(id(driver), None)
+            self._gets.pop(id(driver), None)
+            self._count -= 1
+            self._cond.notify()
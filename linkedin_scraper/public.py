@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import itertools
+import traceback
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .batch import ScrapeResult, KINDS
+from .retry import Blocked
+from .person import Person
+from .company import Company
+
+USER_AGENT = ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+class AuthWallError(Blocked):
+
+    def __init__(self, url):
+        super(AuthWallError, self).__init__(url, "authwall")
+
+def new_session(pool_size=16, retries=2, user_agent=USER_AGENT):
+    # one keep-alive connection pool per host, shared by every fetch on the session
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504)))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": user_agent, "Accept-Language": "en-US,en;q=0.9"})
+    return session
+
+_session = None
+
+def _default_session():
+    global _session
+    if _session is None:
+        _session = new_session()
+    return _session
+
+def fetch(url, session=None, timeout=10):
+    response = (session or _default_session()).get(url, timeout=timeout)
+    # linkedin answers throttled or signed-out-only requests with 999 or a redirect to the authwall
+    if response.status_code == 999 or "authwall" in response.url:
+        raise AuthWallError(url)
+    response.raise_for_status()
+    return response.text
+
+def _fetch(cls, kind, url, session, timeout, cache, snapshots):
+    scraped = cls.from_dict({"linkedin_url": url})
+    scraped.cache = cache
+    scraped.snapshots = snapshots
+    if cache is not None and scraped.from_cache():
+        return scraped
+    page_source = fetch(url, session=session, timeout=timeout)
+    scraped.snapshot(kind, page_source, logged_in=False)
+    scraped.parse(page_source, logged_in=False)
+    scraped.to_cache()
+    return scraped
+
+def fetch_person(url, session=None, timeout=10, cache=None, snapshots=None):
+    return _fetch(Person, "person", url, session, timeout, cache, snapshots)
+
+def fetch_company(url, session=None, timeout=10, cache=None, snapshots=None):
+    return _fetch(Company, "company", url, session, timeout, cache, snapshots)
+
+def _fetch_result(url, kind, session, timeout, cache, snapshots):
+    try:
+        cls = Person if kind == "person" else Company
+        return ScrapeResult(url, _fetch(cls, kind, url, session, timeout, cache, snapshots).to_dict(), None)
+    except Exception:
+        return ScrapeResult(url, None, traceback.format_exc())
+
+def fetch_many(urls, kind="person", workers=16, session=None, timeout=10, cache=None, snapshots=None, backlog=4):
+    if kind not in KINDS:
+        raise ValueError("kind must be one of {}, not {!r}".format(KINDS, kind))
+
+    session = session or new_session(pool_size=workers)
+    urls = iter(urls)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set(executor.submit(_fetch_result, url, kind, session, timeout, cache, snapshots)
+                      for url in itertools.islice(urls, workers * backlog))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            for url in itertools.islice(urls, len(done)):
+                pending.add(executor.submit(_fetch_result, url, kind, session, timeout, cache, snapshots))
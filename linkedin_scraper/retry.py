@@ -0,0 +1,97 @@
+from urllib.parse import urlsplit
+import random
+import threading
+import time
+
+# where linkedin sends sessions it wants to stop
+_BLOCKS = (
+    ("/authwall", "authwall"),
+    ("/checkpoint/challenge", "captcha"),
+    ("/checkpoint/lg/login", "login"),
+    ("captcha", "captcha"),
+    ("/uas/login", "login"),
+)
+
+def blocked_reason(url):
+    url = (url or "").lower()
+    for marker, reason in _BLOCKS:
+        if marker in url:
+            return reason
+    return None
+
+class Blocked(Exception):
+
+    def __init__(self, url, reason):
+        super(Blocked, self).__init__("{} is blocked: {}".format(url, reason))
+        self.url = url
+        self.reason = reason
+
+class CircuitOpen(Blocked):
+
+    def __init__(self, url, retry_at):
+        Exception.__init__(self, "circuit for {} is open until {:.0f}".format(_host(url), retry_at))
+        self.url = url
+        self.reason = "circuit open"
+        self.retry_at = retry_at
+
+class Backoff(object):
+
+    def __init__(self, base=1.0, factor=2.0, ceiling=300.0, jitter=True):
+        self.base = base
+        self.factor = factor
+        self.ceiling = ceiling
+        self.jitter = jitter
+
+    def delay(self, attempt):
+        # full jitter, so workers blocked at the same moment don't come back in lockstep
+        delay = min(self.ceiling, self.base * self.factor ** attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def sleep(self, attempt):
+        time.sleep(self.delay(attempt))
+
+def _host(url):
+    return (urlsplit(url).hostname or "").lower()
+
+class CircuitBreaker(object):
+
+    def __init__(self, threshold=3, cooldown=300.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def __state(self, url):
+        return self._hosts.setdefault(_host(url), {"failures": 0, "opened_at": None, "trial": False})
+
+    def is_open(self, url):
+        with self._lock:
+            return self.__state(url)["opened_at"] is not None
+
+    def retry_at(self, url):
+        with self._lock:
+            opened_at = self.__state(url)["opened_at"]
+        return time.time() if opened_at is None else opened_at + self.cooldown
+
+    def allow(self, url):
+        # after the cooldown a single trial request is let through (half open)
+        with self._lock:
+            state = self.__state(url)
+            if state["opened_at"] is None:
+                return True
+            if state["trial"] or time.time() - state["opened_at"] < self.cooldown:
+                return False
+            state["trial"] = True
+            return True
+
+    def success(self, url):
+        with self._lock:
+            self._hosts[_host(url)] = {"failures": 0, "opened_at": None, "trial": False}
+
+    def failure(self, url):
+        with self._lock:
+            state = self.__state(url)
+            state["failures"] += 1
+            if state["trial"] or state["failures"] >= self.threshold:
+                state["opened_at"] = time.time()
+                state["trial"] = False
@@ -0,0 +1,179 @@
+from collections import OrderedDict
+from lxml import etree
+import time
+
+class LayoutError(Exception):
+
+    def __init__(self, kind, tried, url=None):
+        super(LayoutError, self).__init__("{}page matches none of the known {} layouts ({})".format(
+            "" if url is None else url + ": ", kind, ", ".join(tried) or "none registered"))
+        self.kind = kind
+        self.tried = tried
+        self.url = url
+
+def cls(class_name):
+    return "contains(concat(' ', normalize-space(@class), ' '), ' {} ')".format(class_name)
+
+def by_class(class_name, tag="*", scope=".//"):
+    return "{}{}[{}]".format(scope, tag, cls(class_name))
+
+class Layout(object):
+    """The selectors of one version of one kind of page, compiled once."""
+
+    def __init__(self, kind, version, detect, selectors, sections=()):
+        self.kind = kind
+        self.version = version
+        self.name = "{}/{}".format(kind, version)
+        self.detect = detect
+        self.raw = OrderedDict(selectors)
+        self.sections = OrderedDict((section, self.raw[key]) for section, key in sections)
+        self._detect = etree.XPath("boolean({})".format(detect))
+        self._compiled = dict((name, etree.XPath(path)) for name, path in self.raw.items())
+
+    def __getitem__(self, name):
+        return self._compiled[name]
+
+    def xpath(self, name):
+        # the source, for lookups that run in the browser
+        return self.raw[name]
+
+    def matches(self, tree):
+        return self._detect(tree)
+
+    def __repr__(self):
+        return "<Layout {}>".format(self.name)
+
+# newest layout of each kind first
+LAYOUTS = OrderedDict()
+
+def register(layout):
+    LAYOUTS.setdefault(layout.kind, []).insert(0, layout)
+    return layout
+
+def latest(kind):
+    return LAYOUTS[kind][0]
+
+def detect(kind, tree, url=None):
+    for layout in LAYOUTS.get(kind, []):
+        if layout.matches(tree):
+            return layout
+    raise LayoutError(kind, [layout.name for layout in LAYOUTS.get(kind, [])], url)
+
+DETECT_SCRIPT = """
+var layouts = arguments[0];
+for (var i = 0; i < layouts.length; i++) {
+    if (document.evaluate("boolean(" + layouts[i][1] + ")", document, null, XPathResult.BOOLEAN_TYPE, null).booleanValue) {
+        return layouts[i][0];
+    }
+}
+return null;
+"""
+
+def detect_in_page(driver, kind, wait_time=0, interval=0.25):
+    # one script per poll checks every known layout, and gives up as soon as wait_time is over
+    layouts = LAYOUTS.get(kind, [])
+    deadline = time.time() + wait_time
+    while True:
+        name = driver.execute_script(DETECT_SCRIPT, [[layout.name, layout.detect] for layout in layouts])
+        for layout in layouts:
+            if layout.name == name:
+                return layout
+        if time.time() >= deadline:
+            raise LayoutError(kind, [layout.name for layout in layouts], getattr(driver, "current_url", None))
+        time.sleep(interval)
+
+register(Layout("person", "2020", by_class("pv-top-card", scope="//"), [
+    ("top_card", by_class("pv-top-card", scope="//")),
+    ("name", "//section/div/div/div/*/li"),
+    ("location", "//*[{}]//li".format(cls("pv-top-card--list-bullet"))),
+    ("experience_section", "//*[@id='experience-section']"),
+    ("position", by_class("pv-position-entity")),
+    ("position_title", ".//h3"),
+    ("position_link", ".//a[contains(@href, '/company/')]"),
+    ("position_lines", ".//p"),
+    ("position_facts", ".//h4"),
+    ("spans", ".//span"),
+    ("education_section", "//*[@id='education-section']"),
+    ("school", by_class("pv-profile-section__list-item")),
+    ("school_name", by_class("pv-entity__school-name")),
+    ("degree", by_class("pv-entity__degree-name")),
+    ("dates", by_class("pv-entity__dates")),
+    ("interests_section", by_class("pv-interests-section", scope="//")),
+    ("interest", by_class("pv-entity__summary-info")),
+    ("interest_title", ".//h3"),
+    ("accomplishments_section", by_class("pv-accomplishments-section", scope="//")),
+    ("accomplishment_block", by_class("pv-accomplishments-block__content", tag="div")),
+    ("accomplishment_category", ".//h3"),
+    ("accomplishment_title", ".//ul/li"),
+    ("also_viewed", "//*[{}]//a[contains(@href, '/in/')]".format(cls("pv-browsemap-section"))),
+], sections=[
+    ("top_card", "top_card"),
+    ("experience", "experience_section"),
+    ("education", "education_section"),
+    ("interests", "interests_section"),
+    ("accomplishments", "accomplishments_section"),
+]))
+
+register(Layout("person_public", "2020", by_class("top-card-layout__title", scope="//"), [
+    ("name", by_class("top-card-layout__title", scope="//")),
+    ("experience_section", by_class("experience", scope="//")),
+    ("position", by_class("experience-item__contents")),
+    ("position_title", by_class("experience-item__title")),
+    ("company", by_class("experience-item__subtitle")),
+    ("position_link", ".//a[contains(@href, '/company/')]"),
+    ("duration", by_class("experience-item__duration")),
+    ("start_date", by_class("date-range__start-date")),
+    ("end_date", by_class("date-range__end-date")),
+    ("duration_text", by_class("date-range__duration")),
+    ("position_location", by_class("experience-item__location")),
+    ("education_section", by_class("education__list", scope="//")),
+    ("school", by_class("result-card")),
+    ("school_name", by_class("result-card__title")),
+    ("degree", by_class("education__item--degree-info")),
+    ("dates", by_class("date-range")),
+    ("also_viewed", "//*[{}]//a[contains(@href, '/in/')]".format(cls("browsemap"))),
+], sections=[
+    ("experience", "experience_section"),
+    ("education", "education_section"),
+]))
+
+register(Layout("company", "2020", by_class("org-page-navigation__items", scope="//"), [
+    ("name", '//span[@dir="ltr"]'),
+    ("about_tab", "//a[@data-control-name='page_member_main_nav_about_tab']"),
+    ("see_all_employees", '//a[@data-control-name="topcard_see_all_employees"]'),
+    # the overview is the section holding the definition list of company facts
+    ("about", "(//section[.//dl])[1]"),
+    ("about_text", ".//p"),
+    ("about_values", ".//dd"),
+    ("company_list", by_class("company-list", scope="//")),
+    ("show_more", "//*[@id='org-related-companies-module__show-more-btn']"),
+    ("card", by_class("org-company-card")),
+    ("card_link", by_class("company-name-link")),
+    ("card_followers", by_class("company-followers-count")),
+]))
+
+register(Layout("company_public", "2020", " | ".join(
+    by_class(class_name, scope="//") for class_name in ("basic-info-description", "company-size", "industry")), [
+    ("name", by_class("name", scope="//")),
+    ("about", by_class("basic-info-description", scope="//")),
+    ("specialties", by_class("specialties", scope="//")),
+    ("website", by_class("website", scope="//")),
+    ("headquarters", by_class("adr", scope="//")),
+    ("industry", by_class("industry", scope="//")),
+    ("company_size", by_class("company-size", scope="//")),
+    ("company_type", by_class("type", scope="//")),
+    ("founded", by_class("founded", scope="//")),
+    ("showcase", by_class("company-showcase-pages", scope="//")),
+    ("showcase_item", ".//li"),
+    ("showcase_name", by_class("name")),
+    ("affiliated", by_class("affiliated-companies", scope="//")),
+    ("affiliated_name", by_class("affiliated-company-name")),
+]))
+
+register(Layout("search", "2020", by_class("search-results", scope="//"), [
+    ("results", by_class("search-results", scope="//")),
+    ("result", ".//li"),
+    ("result_link", by_class("search-result__result-link")),
+    ("page_indicator", by_class("artdeco-pagination__indicator", scope="//")),
+    ("next", '//button[@aria-label="Next"]'),
+]))
@@ -0,0 +1,140 @@
+from collections import namedtuple
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from .pool import PoolTimeout
+import json
+import multiprocessing
+import os
+import re
+import time
+
+ORIGIN = "https://www.linkedin.com/"
+
+_LOCAL_STORAGE = "return Object.assign({}, window.localStorage);"
+_SET_LOCAL_STORAGE = """
+var items = arguments[0];
+for (var key in items) { window.localStorage.setItem(key, items[key]); }
+"""
+
+_CLEAR_STORAGE = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+def clear_session(driver, origin=ORIGIN):
+    # storage can only be cleared from a page of its own origin
+    if not (driver.current_url or "").startswith(origin):
+        driver.get(origin)
+    driver.delete_all_cookies()
+    driver.execute_script(_CLEAR_STORAGE)
+
+def save_session(driver, path):
+    session = {
+        "origin": ORIGIN,
+        "saved_at": time.time(),
+        "cookies": driver.get_cookies(),
+        "local_storage": driver.execute_script(_LOCAL_STORAGE) or {},
+    }
+    # replaced atomically so a crash never leaves half a session behind
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(session, f)
+    os.replace(tmp, path)
+
+def restore_session(driver, path, wait_time=5):
+    if not os.path.exists(path):
+        return False
+    with open(path) as f:
+        session = json.load(f)
+
+    # cookies and local storage can only be set for the page's own origin
+    # whatever account the driver was signed in as goes first, storage included
+    now = time.time()
+    driver.get(session.get("origin", ORIGIN))
+    clear_session(driver, session.get("origin", ORIGIN))
+    for cookie in session["cookies"]:
+        if cookie.get("expiry") is not None and cookie["expiry"] < now:
+            continue
+        if cookie.get("sameSite") not in ("Strict", "Lax", "None"):
+            cookie.pop("sameSite", None)
+        driver.add_cookie(cookie)
+    if session.get("local_storage"):
+        driver.execute_script(_SET_LOCAL_STORAGE, session["local_storage"])
+
+    driver.get(session.get("origin", ORIGIN) + "feed/")
+    try:
+        WebDriverWait(driver, wait_time).until(EC.presence_of_element_located((By.ID, "profile-nav-item")))
+        return True
+    except TimeoutException:
+        return False
+
+Account = namedtuple("Account", ["email", "password", "session_file"])
+
+def _session_file(session_dir, email):
+    return os.path.join(session_dir, re.sub(r"[^\w.@-]", "_", email) + ".session.json")
+
+class AccountPool(object):
+
+    def __init__(self, accounts, budget=100, window=24 * 60 * 60, session_dir="."):
+        if budget < 1:
+            raise ValueError("budget must be at least 1, not {!r}".format(budget))
+        self.budget = budget
+        self.window = window
+        self.accounts = []
+        for account in accounts:
+            if not isinstance(account, Account):
+                email, password = account
+                account = Account(email, password, _session_file(session_dir, email))
+            self.accounts.append(account)
+        if not self.accounts:
+            raise ValueError("an AccountPool needs at least one account")
+        # budget timestamps per account in shared memory, so worker processes charge the same budgets.
+        # a slot is free once its use has left the window
+        self._used = multiprocessing.RawArray("d", [float("-inf")] * (budget * len(self.accounts)))
+        self._next = multiprocessing.RawValue("i", 0)
+        self._cond = multiprocessing.Condition()
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def remaining(self, account):
+        with self._cond:
+            return self.budget - self.__live(account, time.time())
+
+    def charge(self, account):
+        # spends one use of an account already in hand, or returns False when its budget is spent for now
+        with self._cond:
+            return self.__spend(account, time.time())
+
+    def acquire(self, timeout=None):
+        # round robin over the accounts that still have budget left in the current window
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while True:
+                now = time.time()
+                for i in range(len(self.accounts)):
+                    account = self.accounts[(self._next.value + i) % len(self.accounts)]
+                    if self.__spend(account, now):
+                        self._next.value = (self._next.value + i + 1) % len(self.accounts)
+                        return account
+
+                # every budget is spent, so sleep until the oldest use leaves its window
+                wait = min(self._used) + self.window - now
+                if deadline is not None:
+                    if now >= deadline:
+                        raise PoolTimeout("no account has budget left")
+                    wait = min(wait, deadline - now)
+                self._cond.wait(max(wait, 0.01))
+
+    def __slots(self, account):
+        start = self.accounts.index(account) * self.budget
+        return range(start, start + self.budget)
+
+    def __live(self, account, now):
+        return sum(1 for i in self.__slots(account) if self._used[i] > now - self.window)
+
+    def __spend(self, account, now):
+        oldest = min(self.__slots(account), key=lambda i: self._used[i])
+        if self._used[oldest] > now - self.window:
+            return False
+        self._used[oldest] = now
+        return True
@@ -0,0 +1,70 @@
+from collections import namedtuple
+import gzip
+import hashlib
+import os
+import threading
+import time
+from . import parser
+from .person import Person
+from .company import Company
+
+Snapshot = namedtuple("Snapshot", ["url", "kind", "logged_in", "digest", "stored_at"])
+
+KINDS = ("person", "company", "employees")
+
+class SnapshotStore(object):
+
+    def __init__(self, root, compresslevel=6):
+        self.root = root
+        self.compresslevel = compresslevel
+        self.manifest = os.path.join(root, "manifest.tsv")
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+
+    def path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest[2:] + ".html.gz")
+
+    def save(self, url, page_source, kind, logged_in=True):
+        data = page_source.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+
+        # identical pages are only ever stored once
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+            with gzip.open(tmp, "wb", compresslevel=self.compresslevel) as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+        with self._lock:
+            with open(self.manifest, "a", encoding="utf-8") as f:
+                f.write("\t".join([str(time.time()), kind, "1" if logged_in else "0", digest, url or ""]) + "\n")
+        return digest
+
+    def open(self, digest):
+        return gzip.open(self.path(digest), "rb")
+
+    def read(self, digest):
+        with self.open(digest) as f:
+            return f.read().decode("utf-8")
+
+    def __iter__(self):
+        if not os.path.exists(self.manifest):
+            return
+        with open(self.manifest, encoding="utf-8") as f:
+            for line in f:
+                stored_at, kind, logged_in, digest, url = line.rstrip("\n").split("\t", 4)
+                yield Snapshot(url or None, kind, logged_in == "1", digest, float(stored_at))
+
+def replay(store, kinds=KINDS):
+    for snapshot in store:
+        if snapshot.kind not in kinds:
+            continue
+        page_source = store.read(snapshot.digest)
+        if snapshot.kind == "person":
+            yield snapshot, Person.from_html(page_source, linkedin_url=snapshot.url, logged_in=snapshot.logged_in)
+        elif snapshot.kind == "company":
+            yield snapshot, Company.from_html(page_source, linkedin_url=snapshot.url, logged_in=snapshot.logged_in)
+        else:
+            yield snapshot, parser.parse_employees(page_source)
@@ -0,0 +1,80 @@
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, quote, unquote
+import hashlib
+import re
+import threading
+
+# regional and mobile hosts (ca., in., uk., de., mobile. ...) all serve the same entities
+_LINKEDIN_HOST = re.compile(r"(^|\.)linkedin\.com$")
+_ENTITY_PATH = re.compile(r"^/(in|company|school|showcase)/([^/?#]+)")
+_KINDS = {"in": "person", "pub": "person", "company": "company", "school": "company", "showcase": "company"}
+_TRACKING = set(["trk", "trkinfo", "lipi", "licu", "originalsubdomain", "midtoken", "midsig", "eid",
+                 "refid", "trackingid", "ref", "src", "lici", "challengeid", "sessionredirect"])
+
+def _tracking(key):
+    key = key.lower()
+    return key in _TRACKING or key.startswith("utm_")
+
+@lru_cache(maxsize=65536)
+def canonical_url(url):
+    url = url.strip()
+    if "//" not in url:
+        url = "https://" + url.lstrip("/")
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+
+    if _LINKEDIN_HOST.search(host):
+        scheme, netloc = "https", "www.linkedin.com"
+    else:
+        scheme, netloc = parts.scheme.lower(), parts.netloc.lower()
+
+    entity = _ENTITY_PATH.match(parts.path)
+    if entity is not None:
+        # public ids are case insensitive, and sub pages (/about/, /detail/...) are the same entity
+        kind, public = entity.groups()
+        path = "/{}/{}/".format(kind, quote(unquote(public).lower(), safe="-_.~"))
+        return urlunsplit((scheme, netloc, path, "", ""))
+
+    query = urlencode([(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if not _tracking(key)])
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+def public_id(url):
+    entity = _ENTITY_PATH.match(urlsplit(canonical_url(url)).path)
+    if entity is None:
+        return None
+    return unquote(entity.group(2))
+
+def url_kind(url):
+    segments = urlsplit(canonical_url(url)).path.split("/")
+    return _KINDS.get(segments[1]) if len(segments) > 1 else None
+
+class DedupIndex(object):
+
+    def __init__(self, urls=()):
+        # 64 bit digests of the canonical urls instead of the strings themselves
+        self._keys = set()
+        self._lock = threading.Lock()
+        for url in urls:
+            self.add(url)
+
+    @staticmethod
+    def key(url):
+        return int.from_bytes(hashlib.blake2b(canonical_url(url).encode("utf-8"), digest_size=8).digest(), "little")
+
+    def add(self, url):
+        key = self.key(url)
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            return True
+
+    def discard(self, url):
+        with self._lock:
+            self._keys.discard(self.key(url))
+
+    def __contains__(self, url):
+        return self.key(url) in self._keys
+
+    def __len__(self):
+        return len(self._keys)
@@ -0,0 +1,113 @@
+from collections import namedtuple
+from selenium.common.exceptions import WebDriverException
+import time
+
+WaitResult = namedtuple("WaitResult", ["name", "elapsed", "settled"])
+
+_SCROLL_STEP = """
+var list = document.getElementsByClassName(arguments[0])[0];
+window.scrollBy(0, window.innerHeight);
+var height = document.body.scrollHeight;
+return [
+    list ? list.getElementsByTagName("li").length : 0,
+    height,
+    window.innerHeight + window.pageYOffset >= height - 2
+];
+"""
+
+_QUIESCENCE = """
+var quiet = arguments[0], ceiling = arguments[1], done = arguments[arguments.length - 1];
+var finished = false, timer = null, cap = null;
+var observer = new MutationObserver(function () {
+    clearTimeout(timer);
+    timer = setTimeout(finish, quiet, true);
+});
+function finish(settled) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(cap);
+    done(settled);
+}
+observer.observe(document.body, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(finish, quiet, true);
+cap = setTimeout(finish, ceiling, false);
+"""
+
+_SECTION_PROBE = """
+var selectors = arguments[0], scroll = arguments[1];
+if (scroll) { window.scrollBy(0, window.innerHeight); }
+var loading = document.readyState !== "complete" ||
+    document.querySelector(".artdeco-loader, .pv-deferred-area--loading, [aria-busy='true']") !== null;
+var atBottom = window.innerHeight + window.pageYOffset >= document.body.scrollHeight - 2;
+var found = {};
+for (var name in selectors) {
+    found[name] = document.evaluate(selectors[name], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null;
+}
+return {found: found, settled: !loading && (atBottom || !scroll)};
+"""
+
+PRESENT = "present"
+PENDING = "pending"
+ABSENT = "absent"
+
+def probe_sections(driver, selectors, scroll=False):
+    probe = driver.execute_script(_SECTION_PROBE, selectors, scroll)
+    statuses = {}
+    for name, found in probe["found"].items():
+        if found:
+            statuses[name] = PRESENT
+        elif probe["settled"]:
+            statuses[name] = ABSENT
+        else:
+            statuses[name] = PENDING
+    return statuses
+
+def wait_for_sections(driver, selectors, ceiling=3, interval=0.25, scroll=True, name="sections"):
+    start = time.time()
+    statuses = probe_sections(driver, selectors, scroll=scroll)
+    # only sections that may still render are waited for, absent ones cost nothing
+    while PENDING in statuses.values() and time.time() - start < ceiling:
+        time.sleep(interval)
+        statuses = probe_sections(driver, selectors, scroll=scroll)
+    return statuses, WaitResult(name, time.time() - start, PENDING not in statuses.values())
+
+def scroll_until_stable(driver, list_class, ceiling=10, interval=0.25, stable_rounds=2, name="scroll"):
+    start = time.time()
+    last = None
+    stable = 0
+    while time.time() - start < ceiling:
+        count, height, at_bottom = driver.execute_script(_SCROLL_STEP, list_class)
+        if at_bottom and (count, height) == last:
+            stable += 1
+            if stable >= stable_rounds:
+                return WaitResult(name, time.time() - start, True)
+        else:
+            stable = 0
+        last = (count, height)
+        time.sleep(interval)
+    return WaitResult(name, time.time() - start, False)
+
+# the webdriver default, for drivers that cannot report their own script timeout
+_SCRIPT_TIMEOUT = 30
+
+def _script_timeout(driver):
+    try:
+        return driver.timeouts.script
+    except (AttributeError, WebDriverException):
+        return _SCRIPT_TIMEOUT
+
+def wait_for_quiescence(driver, quiet=0.5, ceiling=10, name="quiescence"):
+    start = time.time()
+    # the timeout is the driver's own setting, so it is put back for whoever uses the driver next
+    previous = _script_timeout(driver)
+    driver.set_script_timeout(ceiling + 5)
+    try:
+        settled = driver.execute_async_script(_QUIESCENCE, int(quiet * 1000), int(ceiling * 1000))
+    except WebDriverException:
+        # TimeoutException is a WebDriverException too
+        settled = False
+    finally:
+        driver.set_script_timeout(previous)
+    return WaitResult(name, time.time() - start, bool(settled))
@@ -0,0 +1,86 @@
+import asyncio
+import time
+import pytest
+from linkedin_scraper import actions, aio, browser
+from linkedin_scraper.aio import AsyncScraper, TokenBucket
+from linkedin_scraper.pool import DriverPool
+from linkedin_scraper.sessions import AccountPool
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+CASE = fixtures.CASES["small"]
+BASE_URL = "http://fixtures.local"
+
+class CountingBucket(object):
+    def __init__(self):
+        self.taken = 0
+
+    async def acquire(self, tokens=1):
+        self.taken += tokens
+
+def _pool(**kwargs):
+    return DriverPool(size=2, factory=lambda: FakeDriver(fixtures.site(CASE)), **kwargs)
+
+def test_token_bucket_paces_to_its_rate():
+    async def take(bucket, count):
+        for _ in range(count):
+            await bucket.acquire()
+    bucket = TokenBucket(rate=20)
+    started = time.monotonic()
+    asyncio.run(take(bucket, 4))
+    # the first token is there from the start, the other three come 50ms apart
+    assert 0.14 < time.monotonic() - started < 1
+
+def test_every_page_load_takes_a_token():
+    async def run(scraper):
+        person = await scraper.scrape_person(BASE_URL + "/in/small/")
+        company = await scraper.scrape_company(BASE_URL + "/company/small/", get_employees=False)
+        return person, company
+    pool = _pool()
+    scraper = AsyncScraper(pool=pool, session_rate=1000)
+    scraper.rate = CountingBucket()
+    person, company = asyncio.run(run(scraper))
+    assert person.name == "Person small" and company.name == "Company small"
+    # the pool counts the scraped pages and not its own resets, and so does the pacing
+    assert scraper.rate.taken == sum(pool._pages.values()) > 2
+    driver = pool.acquire()
+    assert driver.session_bucket.rate == 1000
+    # the scrape's pacing is taken off once the browser is back in the pool
+    driver.get("/in/small/")
+    assert scraper.rate.taken == sum(pool._pages.values()) - 1
+
+def test_stream_yields_results_and_errors():
+    async def run(scraper):
+        return [result async for result in scraper.scrape_stream([BASE_URL + "/in/small/", BASE_URL + "/authwall/1"])]
+    results = dict((result.url, result) for result in asyncio.run(run(AsyncScraper(pool=_pool()))))
+    assert results[BASE_URL + "/in/small/"].record["name"] == "Person small"
+    assert results[BASE_URL + "/authwall/1"].error is not None
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        asyncio.run(AsyncScraper(pool=_pool()).scrape(BASE_URL + "/in/small/", kind="school"))
+
+def test_browsers_carry_their_account(monkeypatch):
+    logins = []
+    monkeypatch.setattr(browser, "new_driver", lambda headless=True: FakeDriver(fixtures.site(CASE)))
+    monkeypatch.setattr(actions, "login", lambda driver, email, password, session_file=None: logins.append(email))
+    accounts = AccountPool([("a@example.com", "pw"), ("b@example.com", "pw")], session_dir="sessions")
+
+    async def run(scraper):
+        urls = [BASE_URL + "/in/small/"] * 4
+        results = await asyncio.gather(*[scraper.scrape_person(url) for url in urls])
+        await scraper.close()
+        return results
+    # a browser is recycled after every scrape, so new browsers keep signing in
+    scraper = AsyncScraper(size=2, account_rate=1000, accounts=accounts)
+    scraper.pool.max_pages = 1
+    results = asyncio.run(run(scraper))
+    assert [person.name for person in results] == ["Person small"] * 4
+    assert logins[:2] == ["a@example.com", "b@example.com"] and len(logins) == 4
+    assert scraper.pool.recycled == 4
+    assert sorted(scraper._account_buckets) == ["a@example.com", "b@example.com"]
+
+def test_module_functions_share_a_default_scraper(monkeypatch):
+    monkeypatch.setattr(aio, "_default", AsyncScraper(pool=_pool()))
+    person = asyncio.run(aio.scrape_person(BASE_URL + "/in/small/"))
+    assert person.name == "Person small" and aio._scraper() is aio._default
@@ -0,0 +1,53 @@
+import pytest
+from linkedin_scraper import batch, browser, retry
+from linkedin_scraper.batch import scrape_many
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+CASE = fixtures.CASES["small"]
+BASE_URL = "http://fixtures.local"
+
+@pytest.fixture(autouse=True)
+def fake_browser(monkeypatch):
+    # worker processes are forked from the test, so they start fake browsers too
+    monkeypatch.setattr(browser, "new_driver", lambda headless=False: FakeDriver(fixtures.site(CASE)))
+
+def _scrape_many(urls, **kwargs):
+    kwargs.setdefault("backoff", retry.Backoff(base=0.01, ceiling=0.01))
+    kwargs.setdefault("breaker", retry.CircuitBreaker(threshold=100, cooldown=0.01))
+    return dict((result.url, result) for result in scrape_many(urls, workers=2, **kwargs))
+
+def test_records_and_errors_come_back_per_url():
+    person = BASE_URL + "/in/small/"
+    results = _scrape_many([person, person])
+    assert results[person].error is None
+    assert results[person].record["name"] == "Person small"
+
+    missing = BASE_URL + "/company/missing/"
+    results = _scrape_many([BASE_URL + "/company/small/", missing], kind="company")
+    assert results[BASE_URL + "/company/small/"].record["name"] == "Company small"
+    assert results[missing].record is None
+    assert "LayoutError" in results[missing].error
+
+def test_blocked_urls_are_requeued_until_retries_run_out():
+    blocked = BASE_URL + "/authwall/1"
+    results = list(scrape_many([blocked], workers=1, retries=2, backoff=retry.Backoff(base=0.01, ceiling=0.01),
+                               breaker=retry.CircuitBreaker(threshold=100, cooldown=0.01)))
+    assert len(results) == 1
+    assert "authwall" in results[0].error
+
+def test_blocked_urls_count_against_the_breaker():
+    breaker = retry.CircuitBreaker(threshold=100, cooldown=0.01)
+    _scrape_many([BASE_URL + "/authwall/1"], retries=1, breaker=breaker)
+    assert breaker._hosts["fixtures.local"]["failures"] == 2
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        next(scrape_many([], kind="school"))
+
+def test_scrape_reports_block_separately(monkeypatch):
+    monkeypatch.setattr(batch, "_driver", FakeDriver(fixtures.site(CASE)))
+    result, blocked = batch._scrape(BASE_URL + "/authwall/1", "person", False)
+    assert blocked and result.record is None
+    result, blocked = batch._scrape(BASE_URL + "/in/small/", "person", False)
+    assert not blocked and result.error is None
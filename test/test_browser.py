@@ -0,0 +1,54 @@
+import pytest
+from linkedin_scraper import browser
+from linkedin_scraper.objects import Scraper
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+class _Chrome(object):
+
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.options = kwargs["options"]
+        self.cdp = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+
+@pytest.fixture
+def chrome(monkeypatch):
+    monkeypatch.setattr(browser.webdriver, "Chrome", _Chrome)
+    monkeypatch.setenv("CHROMEDRIVER", "/opt/chromedriver")
+
+def test_lean_options():
+    options = browser.new_options(headless=True)
+    assert "--headless" in options.arguments
+    assert "--blink-settings=imagesEnabled=false" in options.arguments
+    assert options.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+    assert options.to_capabilities()["pageLoadStrategy"] == "eager"
+
+def test_stock_options():
+    options = browser.new_options(lean=False)
+    assert options.arguments == []
+    assert "prefs" not in options.experimental_options
+    assert options.to_capabilities().get("pageLoadStrategy") != "eager"
+
+def test_new_driver_blocks_heavy_resources(chrome):
+    driver = browser.new_driver(headless=True)
+    assert driver.args == ("/opt/chromedriver",)
+    assert driver.cdp == [("Network.enable", {}), ("Network.setBlockedURLs", {"urls": browser.BLOCKED_URLS})]
+
+def test_new_driver_blocks_given_urls_only_when_lean(chrome):
+    assert browser.new_driver(blocked_urls=["*.css"]).cdp[-1][1] == {"urls": ["*.css"]}
+    assert browser.new_driver(lean=False).cdp == []
+
+def test_block_urls_without_devtools():
+    assert not browser.block_urls(object())
+
+def test_is_signed_in_waits_for_the_nav_or_a_complete_page():
+    case = fixtures.CASES["small"]
+    scraper = Scraper()
+    scraper.driver = FakeDriver(fixtures.site(case))
+    scraper.driver.get("/in/small/")
+    assert scraper.is_signed_in()
+    scraper.driver.get("/signed-out/")
+    assert scraper.is_signed_in() is False
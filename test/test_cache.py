@@ -0,0 +1,43 @@
+import time
+from linkedin_scraper.cache import ProfileCache, cache_key
+
+def _cache(tmp_path, **kwargs):
+    return ProfileCache(str(tmp_path / "cache.sqlite"), **kwargs)
+
+def test_key_is_the_canonical_url():
+    assert cache_key("https://ca.linkedin.com/in/Jane/?trk=x") == cache_key("https://www.linkedin.com/in/jane")
+
+def test_put_and_get(tmp_path):
+    cache = _cache(tmp_path)
+    assert cache.get("https://www.linkedin.com/in/jane/") is None
+    cache.put("https://www.linkedin.com/in/jane/", {"name": "Jane"}, kind="person")
+    assert cache.get("https://uk.linkedin.com/in/jane") == {"name": "Jane"}
+    assert "https://www.linkedin.com/in/jane/" in cache
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "entries": 1}
+    cache.invalidate("https://www.linkedin.com/in/jane/")
+    assert len(cache) == 0
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = _cache(tmp_path, ttl=0)
+    cache.put("https://www.linkedin.com/in/jane/", {"name": "Jane"})
+    assert "https://www.linkedin.com/in/jane/" not in cache
+    assert cache.get("https://www.linkedin.com/in/jane/") is None
+    assert len(cache) == 0
+
+def test_least_recently_used_is_evicted(tmp_path):
+    cache = _cache(tmp_path, max_entries=2)
+    cache.put("https://www.linkedin.com/in/a/", {})
+    time.sleep(0.01)
+    cache.put("https://www.linkedin.com/in/b/", {})
+    time.sleep(0.01)
+    cache.get("https://www.linkedin.com/in/a/")
+    cache.put("https://www.linkedin.com/in/c/", {})
+    assert "https://www.linkedin.com/in/a/" in cache
+    assert "https://www.linkedin.com/in/b/" not in cache
+    assert cache.evictions == 1
+
+def test_entries_survive_reopening(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("https://www.linkedin.com/in/jane/", {"name": "Jane"})
+    cache.close()
+    assert _cache(tmp_path).get("https://www.linkedin.com/in/jane/") == {"name": "Jane"}
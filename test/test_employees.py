@@ -0,0 +1,67 @@
+from functools import partial
+import pytest
+from linkedin_scraper import Company, parser, waits
+from linkedin_scraper.company import EmployeeCursor
+from linkedin_scraper.pool import DriverPool, PoolTimeout
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+CASE = fixtures.Case("paged", 0, 0, 0, 0, 3, 4)
+
+@pytest.fixture(autouse=True)
+def fast_scroll(monkeypatch):
+    monkeypatch.setattr(waits, "scroll_until_stable", partial(waits.scroll_until_stable, interval=0))
+
+def _company():
+    driver = FakeDriver(fixtures.site(CASE))
+    return Company(driver.base_url + "/company/paged/", driver=driver, scrape=False)
+
+def _urls(people):
+    return [person.linkedin_url for person in people]
+
+def test_iter_employees_walks_every_page():
+    company = _company()
+    urls = _urls(company.iter_employees())
+    assert len(urls) == CASE.employee_pages * CASE.employees_per_page
+    assert urls[0] == "https://www.linkedin.com/in/paged-1-0/"
+    assert company.employee_cursor == EmployeeCursor(3, "https://www.linkedin.com/in/paged-3-3/")
+
+def test_iter_employees_resumes_after_the_cursor():
+    expected = _urls(_company().iter_employees())
+    company = _company()
+    employees = company.iter_employees()
+    # stop part way through the second page, as a crashed or paused run would
+    first = _urls([next(employees) for _ in range(6)])
+    cursor = company.employee_cursor
+    assert cursor.page == 2
+
+    resumed = _urls(_company().iter_employees(cursor=cursor))
+    assert first + resumed == expected
+
+def _pool(size):
+    return DriverPool(size=size, factory=lambda: FakeDriver(fixtures.site(CASE)))
+
+def test_parallel_employees_match_the_serial_walk():
+    expected = _urls(_company().iter_employees())
+    company = _company()
+    assert _urls(company.get_employees(pool=_pool(2))) == expected
+    # one timing per page, in page order
+    assert len(company.wait_timings) == CASE.employee_pages
+
+def test_parallel_employees_share_the_companys_own_slot():
+    pool = _pool(1)
+    company = Company("http://fixtures.local/company/paged/", driver=pool, scrape=False)
+    assert len(company.get_employees(pool=pool, acquire_timeout=1)) == CASE.employee_pages * CASE.employees_per_page
+    company.close_driver()
+    pool.acquire(timeout=0.5)
+
+def test_parallel_employees_raise_when_the_pool_stays_busy():
+    pool = _pool(1)
+    pool.acquire()
+    with pytest.raises(PoolTimeout):
+        _company().get_employees(pool=pool, acquire_timeout=0.05)
+
+def test_page_count():
+    assert parser.parse_page_count(fixtures.employee_page(CASE, 2)) == CASE.employee_pages
+    assert parser.parse_page_count('<ul><li class="artdeco-pagination__indicator"><button>…</button></li></ul>') == 1
+    assert parser.parse_page_count("<html><body></body></html>") == 1
@@ -0,0 +1,34 @@
+from linkedin_scraper.entities import InternTable, EntityIndex
+
+def _person(url, *positions):
+    return {"linkedin_url": url, "experiences": [{"institution_name": name, "institution_url": company_url}
+                                                 for name, company_url in positions], "educations": []}
+
+def test_intern_table():
+    table = InternTable()
+    assert table.id("Acme") == table.id(b"Acme") == 0
+    assert table.id("Other") == 1
+    assert table.value(0) == "Acme" and table.value(None) is None
+    assert "Acme" in table and "Missing" not in table
+    assert len(table) == 2
+
+def test_positions_are_joined_to_companies():
+    index = EntityIndex()
+    index.add_person(_person("https://www.linkedin.com/in/a/", ("Acme", "https://www.linkedin.com/company/acme/")))
+    # a position without a link is joined through the name seen with a link before
+    index.add_person(_person("https://www.linkedin.com/in/b/", ("Acme", None)))
+    index.add_person(_person("https://www.linkedin.com/in/c/", ("Other", None)))
+    assert index.employees_of("https://ca.linkedin.com/company/Acme") == ["https://www.linkedin.com/in/a/", "https://www.linkedin.com/in/b/"]
+    assert index.employees_of("Other") == ["https://www.linkedin.com/in/c/"]
+    assert index.unscraped_companies() == ["https://www.linkedin.com/company/acme/"]
+
+def test_company_fields_fill_in_institutions():
+    index = EntityIndex()
+    person = _person("https://www.linkedin.com/in/a/", ("Acme", "https://www.linkedin.com/company/acme/"))
+    index.add_person(person)
+    index.add_company({"linkedin_url": "https://www.linkedin.com/company/acme/", "name": "Acme Inc", "industry": "Internet"})
+    institution = index.institution(person["experiences"][0])
+    assert institution.name == "Acme Inc"
+    assert institution.industry == "Internet"
+    assert institution.institution_name == "Acme"
+    assert index.unscraped_companies() == []
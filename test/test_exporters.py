@@ -0,0 +1,46 @@
+import io
+import json
+import pytest
+from linkedin_scraper import Person
+from linkedin_scraper.exporters import NDJSONWriter, ParquetWriter
+from benchmarks import fixtures
+
+def _person():
+    return Person.from_html(fixtures.person_logged_in(fixtures.CASES["small"]), linkedin_url="https://www.linkedin.com/in/small/")
+
+COMPANY = {"linkedin_url": "https://www.linkedin.com/company/acme/", "name": "Acme", "showcase_pages": [],
+           "affiliated_companies": [{"linkedin_url": "https://www.linkedin.com/company/sub/", "name": "Sub", "followers": "5"}],
+           "employees": [{"linkedin_url": "https://www.linkedin.com/in/a/", "name": "A"}]}
+
+def test_ndjson_buffers_until_batch_size():
+    out = io.StringIO()
+    writer = NDJSONWriter(out, batch_size=2)
+    writer.write(COMPANY)
+    assert out.getvalue() == ""
+    writer.write(_person())
+    assert writer.rows == 2
+    writer.close()
+    lines = out.getvalue().splitlines()
+    assert json.loads(lines[0]) == COMPANY
+    assert json.loads(lines[1])["name"] == "Person small"
+
+def test_ndjson_appends_to_a_path(tmp_path):
+    path = str(tmp_path / "out.ndjson")
+    for _ in range(2):
+        with NDJSONWriter(path) as writer:
+            writer.write_all([COMPANY])
+    assert len(open(path, encoding="utf-8").read().splitlines()) == 2
+
+def test_parquet_tables(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    person = _person()
+    with ParquetWriter(str(tmp_path), batch_size=1) as writer:
+        writer.write_all([person, COMPANY])
+    assert writer.rows == {"people": 1, "experiences": 2, "educations": 1, "companies": 1, "employees": 1}
+    experiences = pq.read_table(str(tmp_path / "experiences.parquet")).to_pylist()
+    assert [row["position"] for row in experiences] == [0, 1]
+    assert experiences[0]["linkedin_url"] == "https://www.linkedin.com/in/small/"
+    people = pq.read_table(str(tmp_path / "people.parquet")).to_pylist()
+    assert people[0]["interests"] == []
+    employees = pq.read_table(str(tmp_path / "employees.parquet")).to_pylist()
+    assert employees == [{"company_url": "https://www.linkedin.com/company/acme/", "linkedin_url": "https://www.linkedin.com/in/a/", "name": "A"}]
@@ -0,0 +1,88 @@
+import os
+import shutil
+import pytest
+from lxml import html
+from linkedin_scraper import Person, Company, extractor, parser, selectors
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+PAGES = [
+    (fixtures.person_logged_in, "person", True),
+    (fixtures.person_not_logged_in, "person_public", False),
+    (fixtures.company_about, "company", True),
+    (fixtures.company_not_logged_in, "company_public", False),
+]
+
+def _records(fields):
+    return dict((key, [item.to_dict() for item in value] if isinstance(value, list) and value and hasattr(value[0], "to_dict") else value)
+                for key, value in fields.items())
+
+def _extract(tree, layout, logged_in):
+    if layout.kind.startswith("person"):
+        return extractor.person_fields(extractor.run_plan(tree, extractor.person_plan(layout)), logged_in=logged_in)
+    return extractor.company_fields(extractor.run_plan(tree, extractor.company_plan(layout)), logged_in=logged_in)
+
+def _parse(page_source, layout, logged_in):
+    if layout.kind.startswith("person"):
+        return parser.parse_person(page_source, logged_in=logged_in, layout=layout)
+    return parser.parse_company(page_source, logged_in=logged_in, layout=layout)
+
+@pytest.mark.parametrize("case", sorted(fixtures.CASES))
+@pytest.mark.parametrize("page, kind, logged_in", PAGES)
+def test_plan_matches_parser(case, page, kind, logged_in):
+    page_source = page(fixtures.CASES[case])
+    tree = html.document_fromstring(page_source)
+    layout = selectors.detect(kind, tree)
+    assert _records(_extract(tree, layout, logged_in)) == _records(_parse(page_source, layout, logged_in))
+
+def test_plan_uses_layout_selectors():
+    layout = selectors.latest("company")
+    plan = extractor.company_plan(layout)
+    about = [step for step in plan if step[0] == "about"][0]
+    assert about[1] == layout.xpath("about")
+    assert [child[1] for child in about[3]] == [layout.xpath("about_text"), layout.xpath("about_values")]
+
+def test_person_use_js_runs_one_extract_script():
+    case = fixtures.CASES["typical"]
+    driver = FakeDriver(fixtures.site(case))
+    person = Person(driver.base_url + "/in/{}/".format(case.name), driver=driver, close_on_complete=False, use_js=True)
+    expected = parser.parse_person(fixtures.person_logged_in(case))
+    assert [experience.position_title for experience in person.experiences] == [experience.position_title for experience in expected["experiences"]]
+    assert len(person.educations) == case.educations
+    assert len(person.interests) == case.interests
+    assert len(person.accomplishments) == case.accomplishments
+    assert person.also_viewed_urls[0] == driver.base_url + "/in/typical-viewed-0/"
+
+def test_company_use_js():
+    case = fixtures.CASES["small"]
+    driver = FakeDriver(fixtures.site(case))
+    company = Company(driver.base_url + "/company/{}/".format(case.name), driver=driver, close_on_complete=False,
+                      get_employees=False, use_js=True)
+    assert company.name == "Company small"
+    assert company.website == "https://example.com/small"
+    assert company.headquarters == "Mountain View, CA"
+    assert [page.name for page in company.showcase_pages] == ["Related 0", "Related 1", "Related 2"]
+
+def _chrome():
+    if shutil.which("chromedriver") is None:
+        pytest.skip("headless chrome is not installed")
+    from linkedin_scraper import browser
+    from selenium import webdriver
+    return webdriver.Chrome(options=browser.new_options(headless=True))
+
+@pytest.mark.parametrize("page, kind, logged_in", PAGES)
+def test_extract_script_in_chrome(tmp_path, page, kind, logged_in):
+    # the in-page script and its python twin give the same results on the same file
+    page_source = page(fixtures.CASES["typical"])
+    path = tmp_path / "page.html"
+    path.write_text(page_source, encoding="utf-8")
+    url = "file://" + os.path.abspath(str(path))
+    tree = html.document_fromstring(page_source)
+    layout = selectors.detect(kind, tree)
+    plan = extractor.person_plan(layout) if kind.startswith("person") else extractor.company_plan(layout)
+    driver = _chrome()
+    try:
+        driver.get(url)
+        assert driver.execute_script(extractor.EXTRACT_SCRIPT, plan) == extractor.run_plan(tree, plan, url)
+    finally:
+        driver.quit()
@@ -0,0 +1,69 @@
+from linkedin_scraper.frontier import BloomFilter, Frontier
+
+def _frontier(tmp_path, **kwargs):
+    return Frontier(str(tmp_path / "frontier.sqlite"), capacity=1000, **kwargs)
+
+def test_bloom_filter(tmp_path):
+    bloom = BloomFilter(capacity=1000)
+    bloom.add("www.linkedin.com/in/jane")
+    assert "www.linkedin.com/in/jane" in bloom
+    assert "www.linkedin.com/in/john" not in bloom
+    path = str(tmp_path / "bloom")
+    bloom.save(path)
+    loaded = BloomFilter(capacity=1000)
+    assert loaded.load(path) and "www.linkedin.com/in/jane" in loaded
+    assert not BloomFilter(capacity=10).load(path)
+
+def test_push_dedups_and_pops_shallow_first(tmp_path):
+    with _frontier(tmp_path) as frontier:
+        assert frontier.push("https://www.linkedin.com/in/deep/", depth=2)
+        assert frontier.push("https://www.linkedin.com/in/shallow/", depth=0)
+        assert not frontier.push("https://ca.linkedin.com/in/Shallow?trk=x")
+        assert frontier.duplicates == 1
+        assert len(frontier) == 2
+        assert [item.url for item in frontier.pop(2)] == ["https://www.linkedin.com/in/shallow/", "https://www.linkedin.com/in/deep/"]
+        assert frontier.pop() == []
+
+def test_failed_urls_are_retried_up_to_max_attempts(tmp_path):
+    with _frontier(tmp_path, max_attempts=2) as frontier:
+        url = "https://www.linkedin.com/in/jane/"
+        frontier.push(url)
+        frontier.pop()
+        frontier.failed(url)
+        assert frontier.pop()[0].url == url
+        frontier.failed(url)
+        assert frontier.pop() == []
+        assert frontier.stats()["failed"] == 1
+
+def test_leased_urls_are_requeued_after_a_crash(tmp_path):
+    frontier = _frontier(tmp_path)
+    frontier.seed(["https://www.linkedin.com/in/a/", "https://www.linkedin.com/in/b/"])
+    frontier.pop()
+    frontier.checkpoint()
+    frontier._db.close()
+    with _frontier(tmp_path) as frontier:
+        assert frontier.stats()["queued"] == 2
+        assert "https://www.linkedin.com/in/a/" in frontier
+
+def test_expand_queues_also_viewed_and_employees(tmp_path):
+    with _frontier(tmp_path) as frontier:
+        record = {"also_viewed_urls": ["https://www.linkedin.com/in/a/"],
+                  "employees": [{"linkedin_url": "https://www.linkedin.com/in/b/"}, {"linkedin_url": None}]}
+        assert frontier.expand(record, depth=0) == 2
+        assert set(item.depth for item in frontier.pop(10)) == set([1])
+
+def test_outcomes_survive_a_crash_without_a_checkpoint(tmp_path):
+    frontier = _frontier(tmp_path)
+    frontier.seed(["https://www.linkedin.com/in/a/", "https://www.linkedin.com/in/b/"])
+    frontier.checkpoint()
+    frontier.pop(2)
+    frontier.push("https://www.linkedin.com/in/c/", depth=1)
+    frontier.done("https://www.linkedin.com/in/a/")
+    frontier.failed("https://www.linkedin.com/in/b/")
+    frontier._db.close()
+    with _frontier(tmp_path) as frontier:
+        stats = frontier.stats()
+        assert (stats["done"], stats["queued"]) == (1, 2)
+        assert [item.url for item in frontier.pop(10)] == ["https://www.linkedin.com/in/b/", "https://www.linkedin.com/in/c/"]
+        # the url committed with the outcome is known even though the saved filter predates it
+        assert not frontier.push("https://www.linkedin.com/in/c/")
@@ -0,0 +1,59 @@
+from linkedin_scraper import Person
+from linkedin_scraper.objects import ProfileDiff
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+CASE = fixtures.CASES["small"]
+URL = "http://fixtures.local/in/small/"
+
+def _scrape(previous=None, pages=None):
+    driver = FakeDriver(pages or fixtures.site(CASE))
+    person = Person(URL, driver=driver, previous=previous, close_on_complete=False)
+    return person, driver
+
+def test_an_unchanged_profile_is_not_parsed_again():
+    previous = _scrape()[0].to_dict()
+    # a record stored under another url, and a name only the previous record has
+    previous.update(linkedin_url="https://www.linkedin.com/in/old/", name="Stored name")
+    person, driver = _scrape(previous)
+    assert driver.commands["page_source"] == 0
+    assert not person.diff and person.diff.linkedin_url == URL
+    assert person.linkedin_url == URL and person.name == "Stored name"
+    record = person.to_dict()
+    for key in ("location", "experiences", "educations", "interests", "accomplishments", "also_viewed_urls", "fingerprints"):
+        assert record[key] == previous[key]
+
+def test_only_changed_sections_are_parsed_again():
+    previous = _scrape()[0].to_dict()
+    previous["name"] = "Stored name"
+    pages = fixtures.site(CASE)
+    pages["/in/small/"] = pages["/in/small/"].replace("<h3>Position 0</h3>", "<h3>Manager</h3>")
+    person, driver = _scrape(previous, pages)
+    assert driver.commands["page_source"] == 1
+    # the top card did not move, so its fields come from the previous record
+    assert person.name == "Stored name"
+    assert person.diff.changed_sections == ["experience"]
+    assert person.diff.title_changes == [{"institution_name": "Company 0", "from_date": "Jan 1990",
+                                          "old": "Position 0", "new": "Manager"}]
+    assert person.educations[0].institution_name == "School 0"
+
+def test_a_changed_top_card_is_parsed_again():
+    previous = _scrape()[0].to_dict()
+    pages = fixtures.site(CASE)
+    pages["/in/small/"] = pages["/in/small/"].replace("<li>Toronto</li>", "<li>Montreal</li>")
+    person = _scrape(previous, pages)[0]
+    assert person.diff.changed_sections == ["top_card"]
+    assert person.diff.changed_fields == {"location": ["Toronto", "Montreal"]}
+    assert person.experiences[0].position_title == "Position 0"
+
+def test_profile_diff_between():
+    old = {"name": "Jane", "experiences": [{"institution_name": "Acme", "from_date": "2015", "position_title": "Engineer"}]}
+    new = {"linkedin_url": "https://www.linkedin.com/in/jane/", "name": "Jane Doe", "experiences": [
+        {"institution_name": "Acme", "from_date": "2015", "position_title": "Manager"},
+        {"institution_name": "Other", "from_date": "2020", "position_title": "Director"},
+    ]}
+    diff = ProfileDiff.between(old, new, ["top_card", "experience"])
+    assert diff.changed_fields == {"name": ["Jane", "Jane Doe"]}
+    assert [entry["institution_name"] for entry in diff.added_positions] == ["Other"]
+    assert diff.title_changes == [{"institution_name": "Acme", "from_date": "2015", "old": "Engineer", "new": "Manager"}]
+    assert diff.removed_positions == []
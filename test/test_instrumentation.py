@@ -0,0 +1,79 @@
+import logging
+from linkedin_scraper import Person
+from linkedin_scraper.instrumentation import ScrapeMetrics, LoggingSink, PrometheusSink, attach, detach
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+CASE = fixtures.CASES["small"]
+
+class _Sink(object):
+
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, metrics):
+        self.emitted.append((metrics.kind, metrics.url, dict((phase, dict(stats)) for phase, stats in metrics.phases.items())))
+
+def test_commands_are_counted_per_phase():
+    driver = FakeDriver({})
+    metrics = ScrapeMetrics("person", "https://www.linkedin.com/in/jane/", _Sink())
+    attach(driver, metrics)
+    with metrics.phase("page_load"):
+        driver.get("/in/jane/")
+        metrics.timeout()
+    driver.execute_script("return 1;")
+    assert metrics.phases["page_load"]["commands"] == 1
+    assert metrics.phases["page_load"]["timeouts"] == 1
+    assert metrics.phases["other"]["commands"] == 1
+
+def test_detach_restores_the_driver():
+    driver = FakeDriver({})
+    execute = driver.execute
+    first = ScrapeMetrics("person", None, _Sink())
+    attach(driver, first)
+    second = ScrapeMetrics("person", None, _Sink())
+    # a later scrape on the same driver takes over the one wrapper
+    attach(driver, second)
+    detach(driver, first)
+    driver.execute_script("return 1;")
+    assert second.phases["other"]["commands"] == 1
+    detach(driver, second)
+    assert driver.execute == execute and "execute" not in vars(driver)
+    driver.execute_script("return 1;")
+    assert second.phases["other"]["commands"] == 1
+
+def test_scrapes_emit_and_leave_pooled_drivers_clean():
+    sink = _Sink()
+    driver = FakeDriver(fixtures.site(CASE))
+    for _ in range(2):
+        Person(driver.base_url + "/in/small/", driver=driver, close_on_complete=False, metrics=sink)
+    assert len(sink.emitted) == 2
+    kind, url, phases = sink.emitted[1]
+    assert kind == "person" and url == driver.base_url + "/in/small/"
+    assert set(["page_load", "top_card", "sections", "parse"]) <= set(phases)
+    assert phases["page_load"]["commands"] >= 1
+    assert "execute" not in vars(driver)
+
+def test_logging_sink(caplog):
+    metrics = ScrapeMetrics("company", "https://www.linkedin.com/company/acme/", LoggingSink())
+    with metrics.phase("parse"):
+        metrics.command("getPageSource")
+    with caplog.at_level(logging.INFO, logger="linkedin_scraper"):
+        metrics.emit()
+    assert "scraped company https://www.linkedin.com/company/acme/: parse" in caplog.text
+    assert "1 commands 0 timeouts" in caplog.text
+    assert metrics.phases == {}
+
+def test_prometheus_sink(tmp_path):
+    sink = PrometheusSink()
+    for _ in range(2):
+        metrics = ScrapeMetrics("person", None, sink)
+        with metrics.phase("parse"):
+            metrics.command("getPageSource")
+        metrics.emit()
+    text = sink.render()
+    assert 'linkedin_scraper_scrapes_total{kind="person"} 2' in text
+    assert 'linkedin_scraper_phase_commands_total{kind="person",phase="parse"} 2' in text
+    path = str(tmp_path / "scraper.prom")
+    sink.write(path)
+    assert open(path).read() == text
@@ -0,0 +1,47 @@
+import datetime
+import pytest
+from linkedin_scraper import normalize
+from linkedin_scraper.normalize import MISSING, PRESENT
+
+np = pytest.importorskip("numpy")
+
+def test_split_range():
+    assert normalize.split_range("Jan 2015 – Mar 2018") == ("Jan 2015", "Mar 2018")
+    assert normalize.split_range("2010 - 2014") == ("2010", "2014")
+    assert normalize.split_range("Jan 2015") == ("Jan 2015", None)
+    assert normalize.split_range(None) == (None, None)
+
+def test_month_offset():
+    assert normalize.month_offset("Mar 2018") == 2018 * 12 + 2
+    assert normalize.month_offset("2010") == 2010 * 12
+    assert normalize.month_offset("Present") == PRESENT
+    assert normalize.month_offset("sometime") == MISSING
+    assert normalize.month_offset(None) == MISSING
+
+def test_duration_months():
+    assert normalize.duration_months("2 yrs 3 mos") == 27
+    assert normalize.duration_months("1 yr") == 12
+    assert normalize.duration_months("less than a year") == 0
+    assert normalize.duration_months("") == MISSING
+
+def test_columns_parse_each_value():
+    values = ["Jan 2015", None, "Jan 2015", "Present"]
+    assert normalize.month_offsets(values).tolist() == [2015 * 12, MISSING, 2015 * 12, PRESENT]
+    assert normalize.month_offsets(np.array(values[:1] * 2)).tolist() == [2015 * 12] * 2
+    assert normalize.month_offsets(["Present"], present=7).tolist() == [7]
+
+def test_tenure_is_inclusive_and_falls_back_to_duration():
+    months = normalize.tenure([2015 * 12, MISSING], [2015 * 12 + 2, 2016 * 12], fallback=[0, 5])
+    assert months.tolist() == [3, 5]
+
+def test_normalize_experiences():
+    today = datetime.date(2020, 6, 1)
+    scraped = [{"linkedin_url": "a", "experiences": [
+        {"from_date": "Jan 2019", "to_date": "Present", "duration": "1 yr 6 mos"},
+        {"from_date": None, "to_date": None, "duration": "2 yrs"},
+    ]}]
+    columns = normalize.normalize_experiences(scraped, today=today)
+    assert columns["position"].tolist() == [0, 1]
+    assert columns["current"].tolist() == [True, False]
+    assert columns["to_month"][0] == normalize.this_month(today)
+    assert columns["tenure"].tolist() == [18, 24]
@@ -0,0 +1,26 @@
+import pytest
+from linkedin_scraper.objects import Experience, Education, Institution, CompanySummary, ProfileDiff
+
+def test_records_round_trip_through_dicts():
+    experience = Experience(position_title="Engineer", from_date="Jan 2015", to_date="Present", duration="5 yrs", location="Toronto")
+    experience.institution_name = "Acme"
+    assert Experience.from_dict(experience.to_dict()) == experience
+    institution = Institution(name="Acme Inc", institution_name="Acme")
+    assert Institution.from_dict(institution.to_dict()).institution_name == "Acme"
+
+def test_records_are_compared_and_hashed_by_value():
+    first = CompanySummary(linkedin_url="https://www.linkedin.com/company/acme/", name="Acme")
+    second = CompanySummary(linkedin_url="https://www.linkedin.com/company/acme/", name="Acme")
+    assert first == second and not first != second
+    assert len(set([first, second])) == 1
+    assert Education(degree="BSc") != Education(degree="MSc")
+
+def test_records_have_no_instance_dict():
+    with pytest.raises(AttributeError):
+        Experience().extra = 1
+
+def test_profile_diff_is_not_hashable():
+    diff = ProfileDiff("https://www.linkedin.com/in/jane/", ["experience"])
+    assert diff == ProfileDiff("https://www.linkedin.com/in/jane/", ["experience"])
+    with pytest.raises(TypeError):
+        hash(diff)
@@ -0,0 +1,86 @@
+import pytest
+from linkedin_scraper import Person, Company, parser, selectors
+from linkedin_scraper.selectors import LayoutError
+from benchmarks import fixtures
+
+@pytest.mark.parametrize("case", sorted(fixtures.CASES))
+def test_person_logged_in(case):
+    case = fixtures.CASES[case]
+    fields = parser.parse_person(fixtures.person_logged_in(case))
+    assert fields["name"] == "Person {}".format(case.name)
+    assert fields["location"] == "Toronto"
+    assert len(fields["experiences"]) == case.positions
+    assert len(fields["educations"]) == case.educations
+    assert len(fields["interests"]) == case.interests
+    assert len(fields["accomplishments"]) == case.accomplishments
+    assert len(fields["also_viewed_urls"]) == 5
+
+def test_person_logged_in_experience():
+    experience = parser.parse_person(fixtures.person_logged_in(fixtures.CASES["small"]))["experiences"][0]
+    assert experience.position_title == "Position 0"
+    assert experience.institution_name == "Company 0"
+    assert experience.institution_url == "https://www.linkedin.com/company/company-0/"
+    assert experience.from_date is not None and experience.to_date is not None
+
+@pytest.mark.parametrize("case", sorted(fixtures.CASES))
+def test_person_not_logged_in(case):
+    case = fixtures.CASES[case]
+    fields = parser.parse_person(fixtures.person_not_logged_in(case), logged_in=False)
+    assert len(fields["experiences"]) == case.positions
+    assert len(fields["educations"]) == case.educations
+    # tracking parameters are dropped from company links
+    assert fields["experiences"][0].institution_url == "https://www.linkedin.com/company/company-0/"
+
+def test_company_logged_in():
+    fields = parser.parse_company(fixtures.company_about(fixtures.CASES["small"]))
+    assert fields["name"] == "Company small"
+    assert fields["website"] == "https://example.com/small"
+    assert fields["industry"] == "Internet"
+    assert fields["company_size"] == "10,001+ employees"
+    assert fields["headquarters"] == "Mountain View, CA"
+    assert fields["specialties"] == "search\nads\ncloud"
+    assert [page.name for page in fields["showcase_pages"]] == ["Related 0", "Related 1", "Related 2"]
+    assert len(fields["affiliated_companies"]) == 3
+
+def test_company_not_logged_in():
+    fields = parser.parse_company(fixtures.company_not_logged_in(fixtures.CASES["small"]), logged_in=False)
+    assert fields["about_us"] == "About company small"
+    assert fields["specialties"] == "search\nads"
+    assert fields["company_type"] == "Public Company"
+    assert fields["founded"] == "1998"
+    assert [page.followers for page in fields["showcase_pages"]] == ["0 followers", "1 followers", "2 followers"]
+    assert [page.name for page in fields["affiliated_companies"]] == ["Affiliate 0", "Affiliate 1"]
+
+def test_employees_and_page_count():
+    case = fixtures.CASES["typical"]
+    page = fixtures.employee_page(case, 1)
+    employees = parser.parse_employees(page)
+    assert len(employees) == case.employees_per_page
+    assert employees[0] == ("https://www.linkedin.com/in/typical-1-0/", "Employee 1-0")
+    assert parser.parse_page_count(page) == case.employee_pages
+
+def test_employees_skip_results_without_a_link():
+    page = '<ul class="search-results"><li><a class="search-result__result-link"></a><a class="search-result__result-link">Private</a></li></ul>'
+    assert parser.parse_employees(page) == []
+
+def test_unknown_layout_fails_fast():
+    with pytest.raises(LayoutError):
+        parser.parse_person("<html><body><p>nothing here</p></body></html>")
+
+def test_sections_reparse_only_what_is_asked():
+    page = fixtures.person_logged_in(fixtures.CASES["typical"])
+    fields = parser.parse_person_sections(page, ["education"])
+    assert list(fields) == ["educations"]
+
+def test_section_fingerprints_follow_the_text():
+    case = fixtures.CASES["small"]
+    page = fixtures.person_logged_in(case)
+    before = parser.section_fingerprints(page, selectors.latest("person").sections)
+    after = parser.section_fingerprints(page.replace("Position 0", "Position zero"), selectors.latest("person").sections)
+    assert [name for name in before if before[name] != after[name]] == ["experience"]
+
+def test_from_html_round_trips_through_dict():
+    person = Person.from_html(fixtures.person_logged_in(fixtures.CASES["small"]), linkedin_url="https://www.linkedin.com/in/small/")
+    assert Person.from_dict(person.to_dict()).to_dict() == person.to_dict()
+    company = Company.from_html(fixtures.company_about(fixtures.CASES["small"]), linkedin_url="https://www.linkedin.com/company/small/")
+    assert Company.from_dict(company.to_dict()).to_dict() == company.to_dict()
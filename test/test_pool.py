@@ -0,0 +1,108 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+from linkedin_scraper import Person, Company
+from linkedin_scraper.pool import DriverPool, PoolTimeout
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+CASE = fixtures.CASES["small"]
+
+class _Driver(FakeDriver):
+    healthy = True
+    heap = 0
+
+    def __init__(self):
+        super(_Driver, self).__init__(fixtures.site(CASE))
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+        super(_Driver, self).get(url)
+
+    def execute_script(self, script, *args):
+        if script == "return 1;" and not self.healthy:
+            raise TimeoutException("browser is gone")
+        if "usedJSHeapSize" in script:
+            return self.heap
+        return super(_Driver, self).execute_script(script, *args)
+
+def _pool(**kwargs):
+    started = []
+
+    def factory():
+        started.append(_Driver())
+        return started[-1]
+
+    return DriverPool(factory=factory, **kwargs), started
+
+def test_acquire_is_bounded_by_size():
+    pool, started = _pool(size=1)
+    driver = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire(timeout=0.05)
+    pool.release(driver)
+    assert pool.acquire(timeout=0.05) is driver
+    assert len(started) == 1
+
+def test_release_resets_without_counting_the_reset():
+    pool, started = _pool(size=1, max_pages=2)
+    with pool.session() as driver:
+        driver.get(driver.base_url + "/in/small/")
+    assert driver.visited[-1] == "about:blank"
+    with pool.session() as same:
+        same.get(same.base_url + "/in/small/")
+    assert same is driver
+    # the second page load reaches max_pages, so the driver is quit rather than reused
+    assert pool.recycled == 1
+    assert driver.commands["quit"] == 1
+    assert pool.acquire() is not driver
+
+def test_unhealthy_driver_is_replaced():
+    pool, started = _pool(size=1)
+    with pool.session() as driver:
+        pass
+    driver.healthy = False
+    assert pool.acquire() is not driver
+    assert driver.commands["quit"] == 1
+    assert len(pool) == 1
+
+def test_driver_over_memory_is_recycled():
+    pool, started = _pool(size=1, max_memory=100)
+    with pool.session() as driver:
+        driver.heap = 200
+    assert pool.recycled == 1
+    # memory is read before the reset to a blank page
+    assert driver.visited == []
+
+def test_closed_pool_quits_idle_drivers():
+    pool, started = _pool(size=2)
+    with pool.session():
+        pass
+    pool.close()
+    assert started[0].commands["quit"] == 1
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+class _Failing(_Driver):
+
+    def get(self, url):
+        if url != "about:blank":
+            raise TimeoutException("page load timed out")
+        super(_Failing, self).get(url)
+
+@pytest.mark.parametrize("cls", [Person, Company])
+def test_failed_scrape_returns_its_driver(cls):
+    pool = DriverPool(size=1, factory=_Failing)
+    with pytest.raises(TimeoutException):
+        cls("http://fixtures.local/in/small/", driver=pool)
+    driver = pool.acquire(timeout=0.5)
+    pool.release(driver)
+
+def test_completed_scrape_releases_once():
+    pool, started = _pool(size=1)
+    person = Person("http://fixtures.local/in/small/", driver=pool)
+    assert len(person.experiences) == CASE.positions
+    person.close_driver()
+    assert pool.acquire(timeout=0.5) is started[0]
+    with pytest.raises(PoolTimeout):
+        pool.acquire(timeout=0.05)
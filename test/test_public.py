@@ -0,0 +1,67 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import pytest
+from linkedin_scraper import public
+from linkedin_scraper.cache import ProfileCache
+from benchmarks import fixtures
+from benchmarks.run import serve
+
+@pytest.fixture(scope="module")
+def site():
+    case = fixtures.CASES["small"]
+    server, base_url = serve(fixtures.site(case))
+    yield base_url, case
+    server.shutdown()
+
+def test_fetch_person(site):
+    base_url, case = site
+    person = public.fetch_person(base_url + "/public/in/{}/".format(case.name), session=public.new_session(retries=0))
+    assert person.name == "Person {}".format(case.name)
+    assert len(person.experiences) == case.positions
+
+def test_fetch_company(site):
+    base_url, case = site
+    company = public.fetch_company(base_url + "/public/company/{}/".format(case.name), session=public.new_session(retries=0))
+    assert company.name == "Company {}".format(case.name)
+    assert len(company.affiliated_companies) == 2
+
+def test_fetch_uses_the_cache(site, tmp_path):
+    base_url, case = site
+    cache = ProfileCache(str(tmp_path / "cache.sqlite"))
+    url = base_url + "/public/in/{}/".format(case.name)
+    public.fetch_person(url, session=public.new_session(retries=0), cache=cache)
+    assert public.fetch_person(url, session=public.new_session(retries=0), cache=cache).name == "Person {}".format(case.name)
+    assert cache.hits == 1
+
+def test_fetch_many_reports_errors_per_url(site):
+    base_url, case = site
+    urls = [base_url + "/public/in/{}/".format(case.name), base_url + "/missing/"]
+    results = dict((result.url, result) for result in public.fetch_many(urls, workers=2, session=public.new_session(retries=0)))
+    assert results[urls[0]].error is None
+    assert "404" in results[urls[1]].error
+
+class _AuthWall(BaseHTTPRequestHandler):
+    # sends every profile to the authwall, like a throttled session
+
+    def do_GET(self):
+        if self.path.startswith("/authwall"):
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_response(302)
+            self.send_header("Location", "/authwall?trk=x")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+def test_fetch_raises_on_the_authwall():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _AuthWall)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with pytest.raises(public.AuthWallError):
+            public.fetch("http://127.0.0.1:{}/in/jane/".format(server.server_address[1]), session=public.new_session(retries=0))
+    finally:
+        server.shutdown()
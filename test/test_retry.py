@@ -0,0 +1,62 @@
+import pytest
+from linkedin_scraper import retry
+from linkedin_scraper.objects import Scraper
+from linkedin_scraper.retry import Backoff, CircuitBreaker, CircuitOpen, Blocked
+
+def test_blocked_reason():
+    assert retry.blocked_reason("https://www.linkedin.com/authwall?trk=x") == "authwall"
+    assert retry.blocked_reason("https://www.linkedin.com/checkpoint/challenge/123") == "captcha"
+    assert retry.blocked_reason("https://www.linkedin.com/in/jane/") is None
+    assert retry.blocked_reason(None) is None
+
+def test_backoff_grows_to_the_ceiling():
+    backoff = Backoff(base=1.0, factor=2.0, ceiling=5.0, jitter=False)
+    assert [backoff.delay(attempt) for attempt in range(4)] == [1.0, 2.0, 4.0, 5.0]
+    jittered = Backoff(base=1.0, ceiling=5.0)
+    assert all(0 <= jittered.delay(3) <= 5.0 for _ in range(100))
+
+def test_breaker_opens_after_threshold(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(retry.time, "time", lambda: now[0])
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    url = "https://www.linkedin.com/in/jane/"
+    breaker.failure(url)
+    assert breaker.allow(url)
+    breaker.failure(url)
+    assert breaker.is_open(url) and not breaker.allow("https://www.linkedin.com/in/other/")
+    assert breaker.retry_at(url) == 1060.0
+    # other hosts are not affected
+    assert breaker.allow("https://example.com/")
+
+def test_breaker_half_open_lets_one_trial_through(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(retry.time, "time", lambda: now[0])
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    url = "https://www.linkedin.com/in/jane/"
+    breaker.failure(url)
+    now[0] += 61
+    assert breaker.allow(url)
+    assert not breaker.allow(url)
+    # a failed trial opens it again straight away
+    breaker.failure(url)
+    assert not breaker.allow(url)
+    now[0] += 61
+    assert breaker.allow(url)
+    breaker.success(url)
+    assert not breaker.is_open(url) and breaker.allow(url)
+
+class _Driver(object):
+    current_url = None
+
+    def get(self, url):
+        self.current_url = url
+
+def test_load_page_respects_the_breaker_and_detects_blocks():
+    scraper = Scraper()
+    scraper.driver = _Driver()
+    scraper.breaker = CircuitBreaker(threshold=1, cooldown=60)
+    with pytest.raises(Blocked) as blocked:
+        scraper.load_page("https://www.linkedin.com/authwall?trk=x")
+    assert blocked.value.reason == "authwall"
+    with pytest.raises(CircuitOpen):
+        scraper.load_page("https://www.linkedin.com/in/jane/")
@@ -0,0 +1,48 @@
+import pytest
+from linkedin_scraper import selectors
+from linkedin_scraper.selectors import LayoutError, detect_in_page
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+CASE = fixtures.CASES["small"]
+
+class RenderingDriver(FakeDriver):
+    # the profile only renders after the first poll
+    def execute_script(self, script, *args):
+        found = FakeDriver.execute_script(self, script, *args)
+        if script == selectors.DETECT_SCRIPT and self.current_url.endswith("/loading/"):
+            self.navigate("/in/small/")
+        return found
+
+def _driver(path, cls=FakeDriver):
+    pages = fixtures.site(CASE)
+    pages["/loading/"] = "<html><body></body></html>"
+    driver = cls(pages)
+    driver.get(path)
+    return driver
+
+@pytest.mark.parametrize("path, kind", [
+    ("/in/small/", "person"),
+    ("/public/in/small/", "person_public"),
+    ("/company/small/about/", "company"),
+    ("/public/company/small/", "company_public"),
+])
+def test_every_kind_is_detected_in_one_script(path, kind):
+    driver = _driver(path)
+    layout = detect_in_page(driver, kind)
+    assert layout.kind == kind
+    assert layout is selectors.detect(kind, driver.tree)
+    assert driver.commands["execute_script"] == 1
+
+def test_an_unknown_page_fails_after_one_poll():
+    driver = _driver("/loading/")
+    with pytest.raises(LayoutError) as error:
+        detect_in_page(driver, "person")
+    assert error.value.url == "http://fixtures.local/loading/"
+    assert error.value.tried == [layout.name for layout in selectors.LAYOUTS["person"]]
+    assert driver.commands["execute_script"] == 1
+
+def test_a_layout_that_renders_late_is_polled_for():
+    driver = _driver("/loading/", RenderingDriver)
+    assert detect_in_page(driver, "person", wait_time=5, interval=0.01).kind == "person"
+    assert driver.commands["execute_script"] == 2
@@ -0,0 +1,147 @@
+import json
+import time
+import pytest
+from linkedin_scraper import actions, batch, browser, retry, sessions
+from linkedin_scraper.batch import scrape_many
+from linkedin_scraper.pool import PoolTimeout
+from linkedin_scraper.sessions import Account, AccountPool
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+CASE = fixtures.CASES["small"]
+BASE_URL = "http://fixtures.local"
+FEED = sessions.ORIGIN + "feed/"
+SIGNED_IN = '<html><body><div id="profile-nav-item"></div></body></html>'
+
+class SessionDriver(FakeDriver):
+    # keeps cookies and local storage like a browser would, for one origin
+    def __init__(self, pages):
+        FakeDriver.__init__(self, pages)
+        self.cookies = []
+        self.storage = {}
+
+    def get_cookies(self):
+        return [dict(cookie) for cookie in self.cookies]
+
+    def add_cookie(self, cookie):
+        self.cookies.append(dict(cookie))
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def execute_script(self, script, *args):
+        if script == sessions._LOCAL_STORAGE:
+            return dict(self.storage)
+        if script == sessions._SET_LOCAL_STORAGE:
+            self.storage.update(args[0])
+        elif script == sessions._CLEAR_STORAGE:
+            self.storage = {}
+        return FakeDriver.execute_script(self, script, *args)
+
+def _pool(budget=2, window=60, count=2):
+    return AccountPool([("{}@example.com".format(c), "pw") for c in "abc"[:count]], budget=budget, window=window, session_dir="sessions")
+
+def test_accounts_are_handed_out_in_turn_within_their_budget():
+    accounts = _pool(budget=2)
+    a, b = accounts.accounts
+    assert a.session_file.endswith("a@example.com.session.json")
+    assert [accounts.acquire() for _ in range(4)] == [a, b, a, b]
+    assert accounts.remaining(a) == accounts.remaining(b) == 0
+    with pytest.raises(PoolTimeout):
+        accounts.acquire(timeout=0.05)
+
+def test_spent_accounts_are_skipped():
+    accounts = _pool(budget=2)
+    a, b = accounts.accounts
+    assert accounts.charge(a) and accounts.charge(a)
+    assert not accounts.charge(a)
+    assert accounts.remaining(a) == 0 and accounts.remaining(b) == 2
+    assert accounts.acquire() == b
+    assert accounts.acquire() == b
+
+def test_acquire_blocks_until_a_use_leaves_its_window():
+    accounts = _pool(budget=1, window=0.2, count=1)
+    accounts.acquire()
+    started = time.time()
+    assert accounts.acquire(timeout=5) == accounts.accounts[0]
+    assert 0.1 < time.time() - started < 5
+
+def test_bad_pools():
+    with pytest.raises(ValueError):
+        AccountPool([], budget=1)
+    with pytest.raises(ValueError):
+        AccountPool([("a@example.com", "pw")], budget=0)
+
+def test_sessions_survive_a_save_and_restore(tmp_path):
+    path = str(tmp_path / "me.session.json")
+    driver = SessionDriver({FEED: SIGNED_IN})
+    driver.cookies = [
+        {"name": "li_at", "value": "token", "sameSite": "no_restriction"},
+        {"name": "old", "value": "gone", "expiry": time.time() - 60},
+    ]
+    driver.storage = {"voyager": "1"}
+    sessions.save_session(driver, path)
+    with open(path) as f:
+        assert json.load(f)["local_storage"] == {"voyager": "1"}
+
+    fresh = SessionDriver({FEED: SIGNED_IN})
+    fresh.cookies = [{"name": "someone_else", "value": "x"}]
+    fresh.storage = {"stale": "1"}
+    assert sessions.restore_session(fresh, path)
+    # the other account's state is cleared, expired cookies are dropped and an unknown sameSite is left out
+    assert fresh.cookies == [{"name": "li_at", "value": "token"}]
+    assert fresh.storage == {"voyager": "1"}
+    assert fresh.current_url == FEED
+
+def test_restoring_a_missing_or_expired_session(tmp_path):
+    path = str(tmp_path / "me.session.json")
+    assert not sessions.restore_session(SessionDriver({}), path)
+    sessions.save_session(SessionDriver({}), path)
+    # the feed never shows a signed-in page
+    assert not sessions.restore_session(SessionDriver({}), path, wait_time=0)
+
+@pytest.fixture
+def logins(monkeypatch, tmp_path):
+    # worker processes are forked from the test, so they log in through the stub and start fake browsers
+    log = tmp_path / "logins"
+    log.write_text("")
+    def login(driver, email, password, session_file=None):
+        with open(str(log), "a") as f:
+            f.write(email + "\n")
+    monkeypatch.setattr(browser, "new_driver", lambda headless=False: FakeDriver(fixtures.site(CASE)))
+    monkeypatch.setattr(actions, "login", login)
+    return lambda: log.read_text().split()
+
+def _scrape_many(urls, **kwargs):
+    return list(scrape_many(urls, backoff=retry.Backoff(base=0.01, ceiling=0.01),
+                            breaker=retry.CircuitBreaker(threshold=100, cooldown=0.01), **kwargs))
+
+def test_a_worker_keeps_its_account_until_the_budget_runs_out(logins):
+    accounts = _pool(budget=2)
+    results = _scrape_many([BASE_URL + "/in/small/"] * 4, workers=1, accounts=accounts)
+    assert [result.error for result in results] == [None] * 4
+    assert logins() == ["a@example.com", "b@example.com"]
+    # the worker charged the caller's pool
+    assert accounts.remaining(accounts.accounts[0]) == accounts.remaining(accounts.accounts[1]) == 0
+
+def test_workers_are_bound_to_their_own_accounts(logins):
+    accounts = _pool(budget=100)
+    results = _scrape_many([BASE_URL + "/in/small/"] * 8, workers=2, accounts=accounts)
+    assert [result.error for result in results] == [None] * 8
+    assert len(logins()) <= 2
+    assert len(set(logins())) == len(logins())
+    assert sum(accounts.remaining(account) for account in accounts.accounts) == 200 - 8
+
+def test_a_failed_switch_leaves_the_worker_unbound(monkeypatch):
+    accounts = _pool(budget=5)
+    monkeypatch.setattr(batch, "_accounts", accounts)
+    monkeypatch.setattr(batch, "_account", None)
+    def login(driver, email, password, session_file=None):
+        raise RuntimeError("login failed")
+    monkeypatch.setattr(actions, "login", login)
+    with pytest.raises(RuntimeError):
+        batch._charge_account()
+    assert batch._account is None
+    monkeypatch.setattr(actions, "login", lambda driver, email, password, session_file=None: None)
+    batch._charge_account()
+    assert batch._account == Account("b@example.com", "pw", accounts.accounts[1].session_file)
@@ -0,0 +1,40 @@
+import os
+from linkedin_scraper import Person
+from linkedin_scraper.snapshots import SnapshotStore, replay
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+CASE = fixtures.CASES["small"]
+
+def test_identical_pages_are_stored_once(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    page = fixtures.person_logged_in(CASE)
+    first = store.save("https://www.linkedin.com/in/small/", page, "person")
+    second = store.save("https://www.linkedin.com/in/small/", page, "person")
+    assert first == second
+    assert store.read(first) == page
+    assert len(list(store)) == 2
+    assert len(os.listdir(os.path.join(str(tmp_path), "objects", first[:2]))) == 1
+
+def test_replay_parses_every_kind(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save("https://www.linkedin.com/in/small/", fixtures.person_logged_in(CASE), "person")
+    store.save("https://www.linkedin.com/public/in/small/", fixtures.person_not_logged_in(CASE), "person", logged_in=False)
+    store.save("https://www.linkedin.com/company/small/", fixtures.company_about(CASE), "company")
+    store.save(None, fixtures.employee_page(CASE, 1), "employees")
+    replayed = list(replay(store))
+    assert [snapshot.kind for snapshot, _ in replayed] == ["person", "person", "company", "employees"]
+    assert replayed[0][1].name == "Person small"
+    assert len(replayed[1][1].experiences) == CASE.positions
+    assert replayed[2][1].website == "https://example.com/small"
+    assert len(replayed[3][1]) == CASE.employees_per_page
+    assert replayed[3][0].url is None
+    assert [snapshot.kind for snapshot, _ in replay(store, kinds=("company",))] == ["company"]
+
+def test_scrapes_save_what_they_parsed(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    driver = FakeDriver(fixtures.site(CASE))
+    person = Person(driver.base_url + "/in/small/", driver=driver, close_on_complete=False, snapshots=store)
+    (snapshot, replayed), = replay(store)
+    assert snapshot.url == person.linkedin_url
+    assert replayed.to_dict()["experiences"] == person.to_dict()["experiences"]
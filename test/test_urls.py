@@ -0,0 +1,44 @@
+from linkedin_scraper import Person, Company
+from linkedin_scraper.urls import canonical_url, public_id, url_kind, DedupIndex
+from benchmarks.fake_driver import FakeDriver
+
+def test_canonical_url_folds_hosts_case_and_sub_pages():
+    expected = "https://www.linkedin.com/in/jane-doe/"
+    assert canonical_url("https://ca.linkedin.com/in/Jane-Doe?trk=pub-pbmap") == expected
+    assert canonical_url("http://www.linkedin.com/in/jane-doe/detail/recent-activity/") == expected
+    assert canonical_url("linkedin.com/in/jane-doe") == expected
+
+def test_canonical_url_drops_only_tracking_parameters():
+    url = canonical_url("https://www.linkedin.com/search/results/people/?keywords=x&utm_source=y&trk=z")
+    assert url == "https://www.linkedin.com/search/results/people/?keywords=x"
+
+def test_canonical_url_keeps_other_hosts():
+    assert canonical_url("https://Example.com/company/acme") == "https://example.com/company/acme/"
+
+def test_public_id_and_kind():
+    assert public_id("https://www.linkedin.com/company/Acme/about/") == "acme"
+    assert url_kind("https://www.linkedin.com/company/acme/") == "company"
+    assert url_kind("https://www.linkedin.com/in/jane/") == "person"
+    assert public_id("https://www.linkedin.com/feed/") is None
+
+def test_dedup_index():
+    index = DedupIndex(["https://www.linkedin.com/in/jane/"])
+    assert not index.add("https://uk.linkedin.com/in/Jane?trk=x")
+    assert index.add("https://www.linkedin.com/in/john/")
+    assert "https://www.linkedin.com/in/john" in index
+    assert len(index) == 2
+    index.discard("https://www.linkedin.com/in/john/")
+    assert "https://www.linkedin.com/in/john/" not in index
+
+def test_records_without_a_url_are_never_duplicates():
+    index = DedupIndex()
+    driver = FakeDriver({})
+    people = [Person(None, name="Jane", driver=driver, scrape=False, dedup=index) for _ in range(2)]
+    companies = [Company(None, name="Acme", driver=driver, scrape=False, dedup=index) for _ in range(2)]
+    assert not any(record.duplicate for record in people + companies)
+    assert len(index) == 0
+
+def test_employees_without_a_url_keep_none():
+    company = Company("https://www.linkedin.com/company/acme/", driver=FakeDriver({}), scrape=False)
+    assert company.__parse_employee__(None, "Jane").linkedin_url is None
+    assert company.__parse_employee__("https://uk.linkedin.com/in/Jane?trk=x", "Jane").linkedin_url == "https://www.linkedin.com/in/jane/"
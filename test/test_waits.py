@@ -0,0 +1,86 @@
+from collections import namedtuple
+from selenium.common.exceptions import TimeoutException
+from linkedin_scraper import Person, waits
+from benchmarks import fixtures
+from benchmarks.fake_driver import FakeDriver
+
+Timeouts = namedtuple("Timeouts", ["script"])
+
+class _Driver(FakeDriver):
+
+    def __init__(self, settled=True, timeouts=None):
+        super(_Driver, self).__init__({})
+        self.settled = settled
+        self.script_timeouts = []
+        if timeouts is not None:
+            self.timeouts = timeouts
+
+    def set_script_timeout(self, timeout):
+        self.script_timeouts.append(timeout)
+
+    def execute_async_script(self, script, *args):
+        if isinstance(self.settled, Exception):
+            raise self.settled
+        return self.settled
+
+def test_quiescence_restores_the_drivers_script_timeout():
+    driver = _Driver(timeouts=Timeouts(script=7))
+    result = waits.wait_for_quiescence(driver, ceiling=3, name="about")
+    assert result.settled and result.name == "about"
+    assert driver.script_timeouts == [8, 7]
+
+def test_quiescence_restores_the_timeout_when_the_script_times_out():
+    driver = _Driver(settled=TimeoutException("too slow"), timeouts=Timeouts(script=7))
+    assert not waits.wait_for_quiescence(driver, ceiling=3).settled
+    assert driver.script_timeouts == [8, 7]
+
+def test_quiescence_falls_back_to_the_webdriver_default():
+    driver = _Driver(settled=False)
+    assert not waits.wait_for_quiescence(driver, ceiling=10).settled
+    assert driver.script_timeouts == [15, waits._SCRIPT_TIMEOUT]
+
+def test_scroll_until_stable_settles_once_the_list_stops_growing():
+    case = fixtures.CASES["small"]
+    driver = FakeDriver(fixtures.site(case))
+    driver.get(driver.base_url + "/search/results/people/?company=small")
+    result = waits.scroll_until_stable(driver, "search-results", ceiling=1, interval=0.01)
+    assert result.settled
+    assert driver.commands["execute_script"] == 3
+
+class _Probed(FakeDriver):
+    # answers the section probe with a fixed page state
+
+    def __init__(self, found, settled):
+        super(_Probed, self).__init__({})
+        self.probe = {"found": found, "settled": settled}
+
+    def execute_script(self, script, *args):
+        self.count("execute_script")
+        return self.probe
+
+def test_probe_sections_states():
+    driver = _Probed({"experience": True, "education": False}, settled=False)
+    assert waits.probe_sections(driver, {}) == {"experience": waits.PRESENT, "education": waits.PENDING}
+    driver.probe["settled"] = True
+    assert waits.probe_sections(driver, {}) == {"experience": waits.PRESENT, "education": waits.ABSENT}
+
+def test_absent_sections_are_not_waited_for():
+    driver = _Probed({"experience": True, "education": False}, settled=True)
+    statuses, timing = waits.wait_for_sections(driver, {}, ceiling=3)
+    assert timing.settled and timing.elapsed < 1
+    assert driver.commands["execute_script"] == 1
+
+def test_pending_sections_are_waited_for_up_to_the_ceiling():
+    driver = _Probed({"education": False}, settled=False)
+    statuses, timing = waits.wait_for_sections(driver, {}, ceiling=0.1, interval=0.02)
+    assert statuses == {"education": waits.PENDING}
+    assert not timing.settled
+    assert driver.commands["execute_script"] > 1
+
+def test_person_records_section_states():
+    case = fixtures.CASES["small"]
+    driver = FakeDriver(fixtures.site(case))
+    person = Person(driver.base_url + "/in/small/", driver=driver, close_on_complete=False)
+    # the small case has no interests or accomplishments sections at all
+    assert person.sections == {"experience": waits.PRESENT, "education": waits.PRESENT,
+                               "interests": waits.ABSENT, "accomplishments": waits.ABSENT}